@@ -14,6 +14,11 @@ DEBUG = ENVIRONMENT == "development"
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY", "")
 OPENAI_VISION_MODEL = os.getenv("OPENAI_VISION_MODEL", "gpt-5.1-codex")
+# Seconds to wait on the preferred AI provider before also starting the fallback.
+# 0 (default) disables hedging: the fallback only runs after a failure. Each
+# hedged scan pays for two vision-LLM calls, so set this near the preferred
+# provider's measured p95 latency (several seconds), not below typical latency.
+AI_HEDGE_DELAY_SECONDS = float(os.getenv("AI_HEDGE_DELAY_SECONDS", "0"))
 
 # Nutrition APIs
 USDA_API_KEY = os.getenv("USDA_API_KEY", "")
@@ -21,6 +26,13 @@ EDAMAM_APP_ID = os.getenv("EDAMAM_APP_ID", "")
 EDAMAM_APP_KEY = os.getenv("EDAMAM_APP_KEY", "")
 NUTRITIONIX_APP_ID = os.getenv("NUTRITIONIX_APP_ID", "")
 NUTRITIONIX_API_KEY = os.getenv("NUTRITIONIX_API_KEY", "")
+# Seconds to wait on a nutrition source before also querying the next one.
+# 0 (default) disables hedging: the next source only runs after an empty
+# answer or a failure. Each hedge spends another upstream call (Edamam,
+# Nutritionix and USDA are metered), so set this near the p95 latency.
+NUTRITION_HEDGE_DELAY_SECONDS = float(os.getenv("NUTRITION_HEDGE_DELAY_SECONDS", "0"))
+# Open connections to upstream APIs in the background when a client is created
+WARM_HTTP_POOLS = os.getenv("WARM_HTTP_POOLS", "true").lower() == "true"
 DEFAULT_REGION = os.getenv("DEFAULT_REGION", "global").lower()
 DEFAULT_PREFERRED_SOURCES = [
     src.strip() for src in os.getenv(
@@ -26,6 +26,10 @@ import networkx as nx
 from app_config.settings import (
     DATABASE_PATH, VECTOR_DB_PATH, GRAPH_DB_PATH, CACHE_ENABLED, CACHE_TTL_SECONDS
 )
+from utils.helpers import extract_food_category
+
+# Keys per IN (...) query; below SQLite's historical 999 bound-parameter limit
+_SQL_IN_CHUNK = 500
 
 
 class DBManager:
@@ -118,6 +122,24 @@ class DBManager:
         self._add_column_if_missing(cursor, "food_analysis", "data_source", "TEXT")
         self._add_column_if_missing(cursor, "food_analysis", "nutrients", "TEXT")
         self._add_column_if_missing(cursor, "food_analysis", "barcode", "TEXT")
+        self._add_column_if_missing(cursor, "food_analysis", "category", "TEXT")
+        
+        # Categorize rows saved before the category column existed
+        cursor.execute("SELECT id, product FROM food_analysis WHERE category IS NULL")
+        cursor.executemany(
+            "UPDATE food_analysis SET category = ? WHERE id = ?",
+            [(extract_food_category(product or "").lower(), row_id) for row_id, product in cursor.fetchall()],
+        )
+        
+        # Healthier-alternative lookups filter by category and sort by score
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_food_analysis_category_score
+            ON food_analysis(category, health_score DESC)
+        """)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_food_analysis_score
+            ON food_analysis(health_score DESC)
+        """)
         
         # Medical Files
         cursor.execute("""
@@ -398,13 +420,14 @@ class DBManager:
             if isinstance(nova_score, str):
                 nova_score = int(nova_score) if nova_score.isdigit() else 0
             
+            product = analysis_data.get('product', 'Unknown')  # Changed from 'name' to 'product'
             cursor.execute("""
                 INSERT INTO food_analysis 
-                (user_id, product, health_score, nova_score, verdict, raw_data, data_source, nutrients, barcode, created_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                (user_id, product, health_score, nova_score, verdict, raw_data, data_source, nutrients, barcode, category, created_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             """, (
                 user_id,
-                analysis_data.get('product', 'Unknown'),  # Changed from 'name' to 'product'
+                product,
                 int(health_score),  # Ensure INTEGER type
                 int(nova_score),    # Ensure INTEGER type
                 analysis_data.get('verdict', 'UNKNOWN'),
@@ -412,6 +435,7 @@ class DBManager:
                 analysis_data.get('data_source') or analysis_data.get('source'),
                 json.dumps(analysis_data.get('nutrients', {})),
                 analysis_data.get('barcode'),
+                extract_food_category(product or "").lower(),
                 datetime.utcnow().isoformat(),
             ))
             
@@ -479,6 +503,62 @@ class DBManager:
         except Exception as exc:
             print(f"⚠️ Cache write failed: {exc}")
     
+    def get_cached_nutrition_batch(self, cache_keys: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Return cached nutrition payloads within TTL for many keys, keyed by cache key."""
+        found: Dict[str, Dict[str, Any]] = {}
+        if not cache_keys:
+            return found
+        try:
+            conn = sqlite3.connect(self.db_path)
+            cursor = conn.cursor()
+            now = datetime.utcnow()
+            # Chunked to stay under SQLite's bound-parameter limit
+            for start in range(0, len(cache_keys), _SQL_IN_CHUNK):
+                chunk = cache_keys[start:start + _SQL_IN_CHUNK]
+                cursor.execute(
+                    "SELECT cache_key, payload, created_at FROM nutrition_cache "
+                    f"WHERE cache_key IN ({','.join('?' * len(chunk))})",
+                    chunk,
+                )
+                for cache_key, payload, created_at in cursor.fetchall():
+                    age_seconds = (now - datetime.fromisoformat(created_at)).total_seconds()
+                    if age_seconds <= CACHE_TTL_SECONDS:
+                        found[cache_key] = json.loads(payload)
+            conn.close()
+        except Exception as exc:
+            print(f"⚠️ Cache batch read failed: {exc}")
+        return found
+
+    def save_nutrition_cache_batch(self, entries: List[tuple]) -> None:
+        """Persist many (cache_key, payload) pairs in one transaction."""
+        if not entries:
+            return
+        try:
+            now = datetime.utcnow().isoformat()
+            conn = sqlite3.connect(self.db_path)
+            conn.executemany(
+                """
+                INSERT OR REPLACE INTO nutrition_cache
+                (cache_key, payload, source, source_url, confidence, created_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                [
+                    (
+                        cache_key,
+                        json.dumps(payload),
+                        payload.get("source"),
+                        payload.get("source_url"),
+                        payload.get("confidence"),
+                        now,
+                    )
+                    for cache_key, payload in entries
+                ],
+            )
+            conn.commit()
+            conn.close()
+        except Exception as exc:
+            print(f"⚠️ Cache batch write failed: {exc}")
+    
     def _add_to_vector_db(self, analysis_data: Dict[str, Any]):
         """
         Add food analysis to ChromaDB vector database for semantic search.
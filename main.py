@@ -149,13 +149,11 @@ def init_session_state() -> None:
 def _register_plugins() -> None:
     """Register available plugins with the plugin registry."""
     try:
-        from services.plugins_registry import register_plugin
-        from plugins.salons.plugin import SalonsPlugin
+        from services.plugins_registry import discover_and_register
         
-        # Register salons plugin
-        salons = SalonsPlugin()
-        register_plugin(salons)
-        logger.info("Plugins registered successfully")
+        # Built-in plugins (salons, ...), imported lazily on warm starts
+        names = discover_and_register()
+        logger.info(f"Plugins registered successfully: {names}")
     except Exception as e:
         logger.error(f"Failed to register plugins: {e}")
 
@@ -5,11 +5,28 @@ Provides single source of truth for database path.
 """
 
 import os
+import sqlite3
+import threading
 from pathlib import Path
+from typing import Optional
 
 # Default database path
 _DEFAULT_DB_PATH = os.path.join("database", "socialops.db")
 
+# Applied to every connection (journal_mode persists in the file, the rest
+# are per-connection): readers don't block the writer, one fsync per commit
+CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA busy_timeout=5000",
+    "PRAGMA cache_size=-64000",
+    "PRAGMA temp_store=MEMORY",
+)
+
+# Per-thread connection cache: db path -> connection (sqlite3 connections
+# may only be used by the thread that opened them)
+_local = threading.local()
+
 
 def get_db_path() -> str:
     """
@@ -27,3 +44,31 @@ def get_db_path() -> str:
     Path(db_path).parent.mkdir(parents=True, exist_ok=True)
     
     return db_path
+
+
+def get_connection(db_path: Optional[str] = None) -> sqlite3.Connection:
+    """
+    Get this thread's cached connection to the database.
+    
+    The connection stays open across calls so its page cache is reused.
+    Rows come back as sqlite3.Row. Do not close it; wrap writes in
+    ``with conn:`` so they commit or roll back.
+    
+    Args:
+        db_path: Path to SQLite database file (uses shared default if None)
+    
+    Returns:
+        Open connection with CONNECTION_PRAGMAS applied
+    """
+    db_path = db_path or get_db_path()
+    connections = getattr(_local, "connections", None)
+    if connections is None:
+        connections = _local.connections = {}
+    conn = connections.get(db_path)
+    if conn is None:
+        conn = sqlite3.connect(db_path)
+        conn.row_factory = sqlite3.Row
+        for pragma in CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+        connections[db_path] = conn
+    return conn
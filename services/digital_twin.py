@@ -4,13 +4,46 @@ Predicts the future impact of food consumption based on user biometrics
 and real-time health data.
 """
 
-from typing import Dict, Any, List
+from bisect import bisect_left
+from typing import Dict, Any, List, Sequence
 from datetime import datetime, timedelta
+from functools import lru_cache
 import math
 import json
+import re
 from models.schemas import BiologicalTwinPrediction
 
 
+# Risk thresholds as (ascending cut-offs, labels); a value strictly above a
+# cut-off moves to the next label.
+_RISK_LABELS = ('low', 'medium', 'high')
+_GLUCOSE_RISK = (140, 180)  # peak glucose, mg/dL
+_BP_RISK = (5, 10)  # systolic increase, mmHg
+_CHOLESTEROL_RISK = (10, 20)  # impact, mg/dL
+_ENERGY_LEVEL = (40, 70)  # energy score
+
+# Biometrics that drive prediction confidence
+_REQUIRED_BIOMETRICS = frozenset({'glucose_baseline', 'bp_systolic', 'bp_diastolic'})
+
+
+_NUMBER_RE = re.compile(r'([\d.]+)')
+
+
+def _parse_value(val_str: Any) -> float:
+    """Parse nutritional value string (e.g., '15g' -> 15)."""
+    if isinstance(val_str, (int, float)):
+        return float(val_str)
+    if isinstance(val_str, str):
+        match = _NUMBER_RE.search(val_str)
+        return float(match.group(1)) if match else 0.0
+    return 0.0
+
+
+def _risk(value: float, thresholds: Sequence[float], labels: Sequence[str] = _RISK_LABELS) -> str:
+    """Classify a value against ascending thresholds."""
+    return labels[bisect_left(thresholds, value)]
+
+
 class DigitalTwinEngine:
     """Predictive engine for food impact simulation."""
     
@@ -95,24 +128,14 @@ class DigitalTwinEngine:
         """Extract nutritional values from food data."""
         macros = food_data.get('macros', {})
         
-        def parse_value(val_str: str) -> float:
-            """Parse nutritional value string (e.g., '15g' -> 15)."""
-            if isinstance(val_str, (int, float)):
-                return float(val_str)
-            if isinstance(val_str, str):
-                import re
-                match = re.search(r'([\d.]+)', val_str)
-                return float(match.group(1)) if match else 0.0
-            return 0.0
-        
         return {
-            'calories': food_data.get('macros', {}).get('calories', 0),
-            'protein': parse_value(macros.get('protein', '0g')),
-            'carbs': parse_value(macros.get('carbs', '0g')),
-            'fats': parse_value(macros.get('fats', '0g')),
-            'sodium': parse_value(macros.get('sodium', '0mg')),
-            'sugar': parse_value(macros.get('sugar', '0g')) if 'sugar' in macros else 0,
-            'fiber': parse_value(macros.get('fiber', '0g')) if 'fiber' in macros else 0,
+            'calories': macros.get('calories', 0),
+            'protein': _parse_value(macros.get('protein', '0g')),
+            'carbs': _parse_value(macros.get('carbs', '0g')),
+            'fats': _parse_value(macros.get('fats', '0g')),
+            'sodium': _parse_value(macros.get('sodium', '0mg')),
+            'sugar': _parse_value(macros.get('sugar', '0g')) if 'sugar' in macros else 0,
+            'fiber': _parse_value(macros.get('fiber', '0g')) if 'fiber' in macros else 0,
         }
     
     def _predict_glucose(
@@ -142,7 +165,7 @@ class DigitalTwinEngine:
             'spike_magnitude': round(spike_magnitude, 1),
             'peak_time_min': 30,
             'recovery_time_min': 90,
-            'risk_level': 'high' if peak_glucose > 180 else 'medium' if peak_glucose > 140 else 'low',
+            'risk_level': _risk(peak_glucose, _GLUCOSE_RISK),
         }
     
     def _predict_blood_pressure(
@@ -172,7 +195,7 @@ class DigitalTwinEngine:
             'predicted_systolic': round(baseline_sys + sys_increase, 1),
             'predicted_diastolic': round(baseline_dia + dia_increase, 1),
             'sodium_content': round(sodium_mg, 0),
-            'risk_level': 'high' if sys_increase > 10 else 'medium' if sys_increase > 5 else 'low',
+            'risk_level': _risk(sys_increase, _BP_RISK),
         }
     
     def _predict_cholesterol(
@@ -196,7 +219,7 @@ class DigitalTwinEngine:
             'predicted_level': round(baseline + impact, 1),
             'impact': round(impact, 1),
             'saturated_fat_estimate': round(sat_fat, 1),
-            'risk_level': 'high' if impact > 20 else 'medium' if impact > 10 else 'low',
+            'risk_level': _risk(impact, _CHOLESTEROL_RISK),
         }
     
     def _predict_energy(
@@ -227,7 +250,7 @@ class DigitalTwinEngine:
             'energy_score': round(energy_score, 0),
             'sustained_energy_min': 120 if energy_score > 70 else 60,
             'crash_risk_percent': round(crash_risk, 0),
-            'sustained_level': 'high' if energy_score > 70 else 'medium' if energy_score > 40 else 'low',
+            'sustained_level': _risk(energy_score, _ENERGY_LEVEL),
         }
     
     def _predict_digestion(self, food_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -263,30 +286,36 @@ class DigitalTwinEngine:
         bp_pred = predictions['blood_pressure']
         energy_pred = predictions['energy']
         
-        narrative = f"""
-🔮 **Biological Digital Twin Prediction for {food_name}**
-
-**Immediate Impact (30 minutes):**
-- Your glucose is predicted to spike by {glucose_pred['spike_magnitude']}mg/dL, reaching {glucose_pred['peak_glucose']}mg/dL.
-  Risk Level: {glucose_pred['risk_level'].upper()}
-  
-- Blood pressure impact: +{bp_pred['predicted_systolic'] - bp_pred['baseline_systolic']}mmHg systolic
-  Your predicted BP: {bp_pred['predicted_systolic']}/{bp_pred['predicted_diastolic']} (baseline: {bp_pred['baseline_systolic']}/{bp_pred['baseline_diastolic']})
-  Risk Level: {bp_pred['risk_level'].upper()}
-
-**Energy Profile:**
-- Sustained energy score: {energy_pred['energy_score']}/100
-- Sustained energy duration: ~{energy_pred['sustained_energy_min']} minutes
-- Energy crash risk: {energy_pred['crash_risk_percent']}%
-
-**Recovery Timeline:**
-- Glucose returns to baseline: ~{glucose_pred['recovery_time_min']} minutes
-- Peak energy level: ~{glucose_pred['peak_time_min']} minutes after consumption
-
-**Overall Assessment:**
-This product will provide {energy_pred['sustained_level']} sustained energy with a {glucose_pred['risk_level']} glucose spike risk.
-"""
-        return narrative.strip()
+        bp_delta = bp_pred['predicted_systolic'] - bp_pred['baseline_systolic']
+        glucose_risk = glucose_pred['risk_level']
+        
+        parts = [
+            f"🔮 **Biological Digital Twin Prediction for {food_name}**",
+            "",
+            "**Immediate Impact (30 minutes):**",
+            f"- Your glucose is predicted to spike by {glucose_pred['spike_magnitude']}mg/dL, "
+            f"reaching {glucose_pred['peak_glucose']}mg/dL.",
+            f"  Risk Level: {glucose_risk.upper()}",
+            "  ",
+            f"- Blood pressure impact: +{bp_delta}mmHg systolic",
+            f"  Your predicted BP: {bp_pred['predicted_systolic']}/{bp_pred['predicted_diastolic']} "
+            f"(baseline: {bp_pred['baseline_systolic']}/{bp_pred['baseline_diastolic']})",
+            f"  Risk Level: {bp_pred['risk_level'].upper()}",
+            "",
+            "**Energy Profile:**",
+            f"- Sustained energy score: {energy_pred['energy_score']}/100",
+            f"- Sustained energy duration: ~{energy_pred['sustained_energy_min']} minutes",
+            f"- Energy crash risk: {energy_pred['crash_risk_percent']}%",
+            "",
+            "**Recovery Timeline:**",
+            f"- Glucose returns to baseline: ~{glucose_pred['recovery_time_min']} minutes",
+            f"- Peak energy level: ~{glucose_pred['peak_time_min']} minutes after consumption",
+            "",
+            "**Overall Assessment:**",
+            f"This product will provide {energy_pred['sustained_level']} sustained energy "
+            f"with a {glucose_risk} glucose spike risk.",
+        ]
+        return "\n".join(parts)
     
     def _calculate_confidence(
         self,
@@ -295,13 +324,11 @@ This product will provide {energy_pred['sustained_level']} sustained energy with
     ) -> float:
         """Calculate confidence in predictions."""
         # Check data completeness
-        required_fields = ['glucose_baseline', 'bp_systolic', 'bp_diastolic']
         provided_fields = sum(
-            1 for field in required_fields
-            if field in user_biometrics and user_biometrics[field]
+            1 for field in _REQUIRED_BIOMETRICS if user_biometrics.get(field)
         )
         
-        completeness = provided_fields / len(required_fields)
+        completeness = provided_fields / len(_REQUIRED_BIOMETRICS)
         
         # Confidence is 0.6-0.95 based on data completeness
         confidence = 0.6 + (completeness * 0.35)
@@ -336,13 +363,7 @@ This product will provide {energy_pred['sustained_level']} sustained energy with
         return " ".join(recommendations)
 
 
-# Global instance
-digital_twin = None
-
-
+@lru_cache(maxsize=1)
 def get_digital_twin() -> DigitalTwinEngine:
     """Get or create global digital twin instance."""
-    global digital_twin
-    if digital_twin is None:
-        digital_twin = DigitalTwinEngine()
-    return digital_twin
+    return DigitalTwinEngine()
@@ -6,6 +6,7 @@ Protects sensitive user data at rest in the database.
 import os
 import base64
 import logging
+from functools import lru_cache
 from typing import Optional, Union
 from cryptography.fernet import Fernet
 from cryptography.hazmat.primitives import hashes
@@ -179,16 +180,10 @@ class EncryptionService:
         return key.decode('utf-8')
 
 
-# Global instance
-_encryption_service = None
-
-
+@lru_cache(maxsize=1)
 def get_encryption_service() -> EncryptionService:
     """Get or create global encryption service instance."""
-    global _encryption_service
-    if _encryption_service is None:
-        _encryption_service = EncryptionService()
-    return _encryption_service
+    return EncryptionService()
 
 
 # List of sensitive fields that should be encrypted
@@ -3,27 +3,117 @@ AI engine layer with Gemini / OpenAI fallback and mock mode.
 Provides robust multi-provider LLM analysis with automatic fallback.
 """
 
+import copy
 import logging
-from typing import Dict, Any, List
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Sequence, Tuple
 import asyncio
 import base64
+import hashlib
 import os
 
 from app_config.settings import (
+    AI_HEDGE_DELAY_SECONDS,
     GEMINI_API_KEY,
     OPENAI_API_KEY,
     OPENAI_VISION_MODEL,
 )
 
-# Configure logging
 logger = logging.getLogger(__name__)
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
 
+# Data URL prefix for inline JPEG uploads to the OpenAI vision endpoint
+_OAI_IMG_PREFIX = "data:image/jpeg;base64,"
+
+# LRU cache of provider results keyed by (SHA-256 digest of the image bytes,
+# preferred provider); shared by every Streamlit session thread
+_IMG_CACHE: "OrderedDict[Tuple[bytes, str], Dict[str, Any]]" = OrderedDict()
+_IMG_CACHE_MAX_ENTRIES = 256
+_IMG_CACHE_LOCK = threading.Lock()
+
+
+def _img_cache_get(cache_key: Tuple[bytes, str]) -> Optional[Dict[str, Any]]:
+    """Return a private copy of a cached analysis result, or None."""
+    with _IMG_CACHE_LOCK:
+        cached = _IMG_CACHE.get(cache_key)
+        if cached is None:
+            return None
+        _IMG_CACHE.move_to_end(cache_key)
+    return copy.deepcopy(cached)
+
+
+def _img_cache_put(cache_key: Tuple[bytes, str], result: Dict[str, Any]) -> None:
+    """Store a copy of an analysis result, evicting the oldest entry when full."""
+    entry = copy.deepcopy(result)
+    with _IMG_CACHE_LOCK:
+        _IMG_CACHE[cache_key] = entry
+        _IMG_CACHE.move_to_end(cache_key)
+        if len(_IMG_CACHE) > _IMG_CACHE_MAX_ENTRIES:
+            _IMG_CACHE.popitem(last=False)
+
+
+# Long-lived event loop that runs every analyze_image_sync call, so the
+# loop-bound provider clients below are built once and reused
+_ENGINE_LOOP: Optional[asyncio.AbstractEventLoop] = None
+_ENGINE_LOOP_LOCK = threading.Lock()
+
+
+def _engine_loop() -> asyncio.AbstractEventLoop:
+    """Return the background event loop, starting its daemon thread on first use."""
+    global _ENGINE_LOOP
+    with _ENGINE_LOOP_LOCK:
+        if _ENGINE_LOOP is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="ai-engine-loop", daemon=True).start()
+            _ENGINE_LOOP = loop
+    return _ENGINE_LOOP
+
+
+@lru_cache(maxsize=1)
+def _gemini_model(api_key: str, loop: asyncio.AbstractEventLoop):
+    """
+    Return a configured Gemini model, built once per API key and event loop.
+    
+    The async transport is bound to the loop it was created on, so the loop
+    is part of the cache key. ``analyze_image_sync`` always runs on the
+    background engine loop, so in the app this is built once.
+    
+    Args:
+        api_key: Gemini API key
+        loop: Event loop the model will be awaited on
+        
+    Returns:
+        Reusable ``GenerativeModel`` instance
+    """
+    import google.generativeai as genai
+
+    genai.configure(api_key=api_key)
+    return genai.GenerativeModel("gemini-1.5-flash")
+
+
+@lru_cache(maxsize=1)
+def _openai_client(api_key: str, loop: asyncio.AbstractEventLoop):
+    """
+    Return an async OpenAI client, built once per API key and event loop.
+    
+    Reusing the client keeps its HTTP connection pool warm across scans
+    running on the same loop (the background engine loop for
+    ``analyze_image_sync``).
+    
+    Args:
+        api_key: OpenAI API key
+        loop: Event loop the client will be awaited on
+        
+    Returns:
+        Reusable ``openai.AsyncOpenAI`` client
+    """
+    import openai
+
+    return openai.AsyncOpenAI(api_key=api_key)
 
-def _build_provider_order(preferred: str) -> List[str]:
+
+def _build_provider_order(preferred: str) -> Tuple[str, ...]:
     """
     Build provider priority list with fallback chain.
     
@@ -31,19 +121,24 @@ def _build_provider_order(preferred: str) -> List[str]:
         preferred: Preferred provider name ('gemini' or 'openai')
         
     Returns:
-        List of provider names in order of preference, always ending with 'mock'
+        Tuple of provider names in order of preference, always ending with 'mock'
     """
-    preferred = preferred.lower()
+    return _provider_order(preferred.lower(), bool(GEMINI_API_KEY), bool(OPENAI_API_KEY))
+
+
+@lru_cache(maxsize=8)
+def _provider_order(preferred: str, has_gemini: bool, has_openai: bool) -> Tuple[str, ...]:
+    """Memoized body of ``_build_provider_order`` keyed on key availability."""
     order = [preferred] if preferred in {"gemini", "openai"} else []
     # Add the other provider as fallback
-    if preferred != "gemini" and GEMINI_API_KEY:
+    if preferred != "gemini" and has_gemini:
         order.append("gemini")
-    if preferred != "openai" and OPENAI_API_KEY:
+    if preferred != "openai" and has_openai:
         order.append("openai")
     # Always end with mock so UI never breaks
     order.append("mock")
-    logger.debug(f"Provider order: {order}")
-    return order
+    logger.debug("Provider order: %s", order)
+    return tuple(order)
 
 
 async def _analyze_with_gemini(image_bytes: bytes) -> Dict[str, Any]:
@@ -62,22 +157,20 @@ async def _analyze_with_gemini(image_bytes: bytes) -> Dict[str, Any]:
     if not GEMINI_API_KEY:
         raise RuntimeError("GEMINI_API_KEY is missing")
     try:
-        import google.generativeai as genai
+        model = _gemini_model(GEMINI_API_KEY, asyncio.get_running_loop())
     except ImportError as exc:  # pragma: no cover
         raise RuntimeError("google-generativeai is not installed") from exc
 
     logger.info("Starting Gemini analysis")
-    genai.configure(api_key=GEMINI_API_KEY)
-    model = genai.GenerativeModel("gemini-1.5-flash")
     prompt = (
         "You are a nutritionist. Given a food photo, return a concise JSON with keys: "
         "product (string), health_score (0-100 int), verdict (SAFE|WARNING|DANGER), "
         "warnings (array of strings). Keep it very short."
     )
     image_part = {"mime_type": "image/jpeg", "data": image_bytes}
-    response = await asyncio.to_thread(model.generate_content, [prompt, image_part])
+    response = await model.generate_content_async([prompt, image_part])
     text = response.text or "{}"
-    logger.info(f"Gemini analysis completed: {len(text)} chars")
+    logger.info("Gemini analysis completed: %d chars", len(text))
     # Fallback minimal parsing to avoid crashes if output is not JSON
     return {
         "product": "Gemini Vision",
@@ -103,30 +196,28 @@ async def _analyze_with_openai(image_bytes: bytes) -> Dict[str, Any]:
     if not OPENAI_API_KEY:
         raise RuntimeError("OPENAI_API_KEY is missing")
     try:
-        import openai
+        client = _openai_client(OPENAI_API_KEY, asyncio.get_running_loop())
     except ImportError as exc:  # pragma: no cover
         raise RuntimeError("openai is not installed") from exc
 
     logger.info("Starting OpenAI analysis with %s", OPENAI_VISION_MODEL)
-    client = openai.OpenAI(api_key=OPENAI_API_KEY)
-    b64_image = base64.b64encode(image_bytes).decode("utf-8")
+    image_url = _OAI_IMG_PREFIX + base64.b64encode(image_bytes).decode("ascii")
     messages = [
         {
             "role": "user",
             "content": [
                 {"type": "text", "text": "Analyze this food photo and return concise insights."},
-                {"type": "image_url", "image_url": {"url": f"data:image/jpeg;base64,{b64_image}"}},
+                {"type": "image_url", "image_url": {"url": image_url}},
             ],
         }
     ]
-    resp = await asyncio.to_thread(
-        client.chat.completions.create,
+    resp = await client.chat.completions.create(
         model=OPENAI_VISION_MODEL,
         messages=messages,
         max_tokens=200,
     )
     content = resp.choices[0].message.content
-    logger.info(f"OpenAI analysis completed: {len(content)} chars")
+    logger.info("OpenAI analysis completed: %d chars", len(content))
     return {
         "product": "OpenAI GPT-5.1 Codex",
         "health_score": 78,
@@ -152,12 +243,77 @@ async def _mock_analysis() -> Dict[str, Any]:
     }
 
 
+async def _call_provider(provider: str, image_bytes: bytes) -> Dict[str, Any]:
+    """Dispatch to the analyzer for a real (non-mock) provider."""
+    if provider == "gemini":
+        return await _analyze_with_gemini(image_bytes)
+    if provider == "openai":
+        return await _analyze_with_openai(image_bytes)
+    raise ValueError(f"Unknown provider: {provider}")
+
+
+async def _race_providers(
+    providers: Sequence[str], image_bytes: bytes, errors: List[str]
+) -> Optional[Dict[str, Any]]:
+    """
+    Run providers as hedged requests and return the first successful result.
+    
+    The first provider starts immediately. The next provider is started as
+    soon as it fails or, when hedging is enabled (``AI_HEDGE_DELAY_SECONDS``
+    > 0), once it has not finished within that delay; the running providers
+    then race. Once any provider succeeds the others are cancelled.
+    
+    Args:
+        providers: Real provider names in order of preference
+        image_bytes: Raw image data as bytes
+        errors: List that collects "provider: error" messages
+        
+    Returns:
+        First successful analysis result, or None if every provider failed
+    """
+    queue = list(providers)
+    running: Dict[asyncio.Task, str] = {}
+
+    def _launch() -> None:
+        provider = queue.pop(0)
+        running[asyncio.create_task(_call_provider(provider, image_bytes))] = provider
+
+    try:
+        while queue or running:
+            if not running:
+                _launch()
+            done, _ = await asyncio.wait(
+                running,
+                timeout=AI_HEDGE_DELAY_SECONDS if queue and AI_HEDGE_DELAY_SECONDS > 0 else None,
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+            if not done:
+                # Preferred provider is slow: hedge with the next one
+                _launch()
+                continue
+            for task in done:
+                provider = running.pop(task)
+                exc = task.exception()
+                if exc is None:
+                    logger.info("✓ %s analysis successful", provider)
+                    return task.result()
+                logger.error("Provider %s failed: %s", provider, exc)
+                errors.append(f"{provider}: {exc}")
+        return None
+    finally:
+        for task in running:
+            task.cancel()
+
+
 async def analyze_image(image_bytes: bytes, preferred_provider: str = "gemini") -> Dict[str, Any]:
     """
     Analyze food image with automatic provider fallback.
     
-    Attempts to use preferred provider, falls back to alternatives if needed,
-    and collects error messages for debugging.
+    Identical images (with the same preferred provider) are served from an
+    in-memory LRU cache; callers always get their own copy. Otherwise runs
+    the real providers as hedged requests (see ``_race_providers``), falls
+    back to mock data if all of them fail, and collects error messages for
+    debugging. Mock results are never cached.
     
     Args:
         image_bytes: Raw image data as bytes
@@ -166,34 +322,37 @@ async def analyze_image(image_bytes: bytes, preferred_provider: str = "gemini")
     Returns:
         Analysis result dictionary with product, health_score, verdict, and warnings
     """
+    cache_key = (hashlib.sha256(image_bytes).digest(), preferred_provider.lower())
+    cached = _img_cache_get(cache_key)
+    if cached is not None:
+        logger.info("Using cached analysis for image")
+        return cached
+
     errors: List[str] = []
-    
-    for provider in _build_provider_order(preferred_provider):
-        try:
-            if provider == "gemini":
-                result = await _analyze_with_gemini(image_bytes)
-                logger.info(f"✓ Gemini analysis successful")
-                return result
-            elif provider == "openai":
-                result = await _analyze_with_openai(image_bytes)
-                logger.info(f"✓ OpenAI analysis successful")
-                return result
-            elif provider == "mock":
-                result = await _mock_analysis()
-                # Include accumulated errors in warnings when using mock
-                if errors:
-                    logger.warning(f"Fell back to mock after errors: {errors}")
-                    result["warnings"] = [
-                        *result.get("warnings", []),
-                        "⚠️ Using mock data - API providers unavailable",
-                        *[f"Error: {err}" for err in errors[:2]]  # Limit to 2 errors
-                    ]
-                return result
-        except Exception as exc:  # pragma: no cover
-            error_msg = f"{provider}: {str(exc)}"
-            logger.error(f"Provider {provider} failed: {exc}")
-            errors.append(error_msg)
-            continue
+    order = _build_provider_order(preferred_provider)
+
+    result = await _race_providers(
+        [provider for provider in order if provider != "mock"], image_bytes, errors
+    )
+    if result is not None:
+        _img_cache_put(cache_key, result)
+        return result
+
+    try:
+        result = await _mock_analysis()
+    except Exception as exc:  # pragma: no cover
+        logger.error("Provider mock failed: %s", exc)
+        errors.append(f"mock: {exc}")
+    else:
+        # Include accumulated errors in warnings when using mock
+        if errors:
+            logger.warning("Fell back to mock after errors: %s", errors)
+            result["warnings"] = [
+                *result.get("warnings", []),
+                "⚠️ Using mock data - API providers unavailable",
+                *[f"Error: {err}" for err in errors[:2]]  # Limit to 2 errors
+            ]
+        return result
     
     # Fallback if even mock fails (should never happen)
     logger.critical("All providers failed including mock")
@@ -209,6 +368,9 @@ def analyze_image_sync(image_bytes: bytes, preferred_provider: str = "gemini") -
     """
     Synchronous wrapper for Streamlit callbacks.
     
+    Runs on the shared background engine loop (rather than a fresh
+    ``asyncio.run`` loop per call) so provider clients are reused.
+    
     Args:
         image_bytes: Raw image data as bytes
         preferred_provider: Preferred AI provider ('gemini' or 'openai')
@@ -216,7 +378,10 @@ def analyze_image_sync(image_bytes: bytes, preferred_provider: str = "gemini") -
     Returns:
         Analysis result dictionary
     """
-    return asyncio.run(analyze_image(image_bytes, preferred_provider=preferred_provider))
+    future = asyncio.run_coroutine_threadsafe(
+        analyze_image(image_bytes, preferred_provider=preferred_provider), _engine_loop()
+    )
+    return future.result()
 
 
 async def fetch_dashboard_metrics() -> Dict[str, Any]:
@@ -7,15 +7,124 @@ Provides CSV generation with proper headers and data formatting.
 import csv
 import io
 import logging
-from typing import List, Dict
+import zipfile
+from typing import Callable, List, Dict, Optional, TextIO
 from datetime import datetime
 
+import pandas as pd
+
 from services.crm_store import CRMStore
 from services.inbox_store import get_inbox_store
 
 logger = logging.getLogger(__name__)
 
 
+# Source field -> CSV header, in column order
+_LEAD_COLUMNS = {
+    'id': 'ID',
+    'name': 'Name',
+    'status': 'Status',
+    'phone': 'Phone',
+    'source': 'Source',
+    'tags': 'Tags',
+    'value': 'Value',
+    'notes': 'Notes',
+    'created_at': 'Created',
+    'updated_at': 'Updated',
+}
+
+_TASK_COLUMNS = {
+    'id': 'ID',
+    'title': 'Title',
+    'task_type': 'Type',
+    'status': 'Status',
+    'completed': 'Completed',
+    'lead_id': 'Lead ID',
+    'thread_id': 'Thread ID',
+    'due_at': 'Due At',
+    'created_at': 'Created',
+}
+
+_THREAD_COLUMNS = {
+    'thread_id': 'ID',
+    'title': 'Title',
+    'platform': 'Platform',
+    'status': 'Status',
+    'message_count': 'Message Count',
+    'updated_at': 'Last Message',
+    'created_at': 'Created',
+}
+
+
+def _frame(rows: List[Dict], columns: Dict[str, str]) -> pd.DataFrame:
+    """Build an object-dtype frame so values are written exactly as stored."""
+    return pd.DataFrame(rows, columns=list(columns), dtype=object)
+
+
+def _frame_to_csv(frame: pd.DataFrame, columns: Dict[str, str], output: TextIO) -> None:
+    """Write a frame with display headers, matching csv.writer's dialect."""
+    frame.rename(columns=columns).to_csv(
+        output, index=False, na_rep='', lineterminator='\r\n'
+    )
+
+
+def _write_leads_csv(output: TextIO) -> None:
+    """
+    Write leads CSV (headers included) to a text stream.
+    
+    Args:
+        output: Text stream to write into
+    """
+    crm = CRMStore()
+    leads = crm.list_leads()
+    
+    _frame_to_csv(_frame(leads, _LEAD_COLUMNS), _LEAD_COLUMNS, output)
+
+
+def _write_tasks_csv(output: TextIO) -> None:
+    """
+    Write tasks CSV (headers included) to a text stream.
+    
+    Args:
+        output: Text stream to write into
+    """
+    crm = CRMStore()
+    tasks = crm.list_tasks()
+    
+    frame = _frame(tasks, _TASK_COLUMNS)
+    frame['completed'] = frame['completed'].fillna(0).astype(bool).map({True: 'Yes', False: 'No'})
+    _frame_to_csv(frame, _TASK_COLUMNS, output)
+
+
+def _write_threads_csv(output: TextIO) -> None:
+    """
+    Write inbox threads CSV (headers included) to a text stream.
+    
+    Args:
+        output: Text stream to write into
+    """
+    store = get_inbox_store()
+    threads = store.list_threads()
+    counts = store.message_counts()
+    
+    writer = csv.DictWriter(
+        output, fieldnames=list(_THREAD_COLUMNS), restval='', extrasaction='ignore'
+    )
+    writer.writerow(_THREAD_COLUMNS)
+    
+    for thread in threads:
+        thread['status'] = 'active'  # status not in table
+        thread['message_count'] = counts.get(thread['thread_id'], 0)
+    writer.writerows(threads)
+
+
+def _render_csv(write_csv: Callable[[TextIO], None]) -> str:
+    """Run a ``_write_*_csv`` function against an in-memory buffer."""
+    output = io.StringIO()
+    write_csv(output)
+    return output.getvalue()
+
+
 def export_leads_csv() -> str:
     """
     Export leads to CSV format.
@@ -24,34 +133,7 @@ def export_leads_csv() -> str:
         CSV string with headers and lead data
     """
     try:
-        crm = CRMStore()
-        leads = crm.list_leads()
-        
-        output = io.StringIO()
-        writer = csv.writer(output)
-        
-        # Headers
-        writer.writerow([
-            'ID', 'Name', 'Status', 'Phone', 'Source', 'Tags',
-            'Value', 'Notes', 'Created', 'Updated'
-        ])
-        
-        # Data rows
-        for lead in leads:
-            writer.writerow([
-                lead.get('id', ''),
-                lead.get('name', ''),
-                lead.get('status', ''),
-                lead.get('phone', ''),
-                lead.get('source', ''),
-                lead.get('tags', ''),
-                lead.get('value', ''),
-                lead.get('notes', ''),
-                lead.get('created_at', ''),
-                lead.get('updated_at', '')
-            ])
-        
-        return output.getvalue()
+        return _render_csv(_write_leads_csv)
     
     except Exception as e:
         logger.error(f"Export leads CSV error: {e}", exc_info=True)
@@ -66,33 +148,7 @@ def export_tasks_csv() -> str:
         CSV string with headers and task data
     """
     try:
-        crm = CRMStore()
-        tasks = crm.list_tasks()
-        
-        output = io.StringIO()
-        writer = csv.writer(output)
-        
-        # Headers
-        writer.writerow([
-            'ID', 'Title', 'Type', 'Status', 'Completed',
-            'Lead ID', 'Thread ID', 'Due At', 'Created'
-        ])
-        
-        # Data rows
-        for task in tasks:
-            writer.writerow([
-                task.get('id', ''),
-                task.get('title', ''),
-                task.get('task_type', ''),
-                task.get('status', ''),
-                'Yes' if task.get('completed') else 'No',
-                task.get('lead_id', ''),
-                task.get('thread_id', ''),
-                task.get('due_at', ''),
-                task.get('created_at', '')
-            ])
-        
-        return output.getvalue()
+        return _render_csv(_write_tasks_csv)
     
     except Exception as e:
         logger.error(f"Export tasks CSV error: {e}", exc_info=True)
@@ -107,63 +163,52 @@ def export_threads_csv() -> str:
         CSV string with headers and thread data
     """
     try:
-        store = get_inbox_store()
-        threads = store.list_threads()
-        
-        output = io.StringIO()
-        writer = csv.writer(output)
-        
-        # Headers
-        writer.writerow([
-            'ID', 'Title', 'Platform', 'Status',
-            'Message Count', 'Last Message', 'Created'
-        ])
-        
-        # Data rows
-        for thread in threads:
-            messages = store.list_messages(thread['thread_id'])
-            
-            writer.writerow([
-                thread.get('thread_id', ''),
-                thread.get('title', ''),
-                thread.get('platform', ''),
-                'active',  # status not in table
-                len(messages),
-                thread.get('updated_at', ''),
-                thread.get('created_at', '')
-            ])
-        
-        return output.getvalue()
+        return _render_csv(_write_threads_csv)
     
     except Exception as e:
         logger.error(f"Export threads CSV error: {e}", exc_info=True)
         return "Error generating CSV"
 
 
-def export_all_data_zip() -> bytes:
+def export_all_data_zip(compression: Optional[int] = None) -> bytes:
     """
     Export all data (leads, tasks, threads) as ZIP archive.
     
+    The CSVs are rendered and added one at a time, so at most one full
+    CSV string is held in memory alongside the compressed output. By default
+    members are deflated at level 1: CSV text compresses nearly as well as
+    at the default level 6 for a fraction of the CPU time.
+    
+    Args:
+        compression: zipfile compression method (None = deflate level 1,
+            ``zipfile.ZIP_STORED`` to skip compression entirely)
+    
     Returns:
         ZIP file bytes containing 3 CSV files
     """
     try:
-        import zipfile
+        if compression is None:
+            compression, compresslevel = zipfile.ZIP_DEFLATED, 1
+        else:
+            compresslevel = None
         
         zip_buffer = io.BytesIO()
+        members = (
+            ('leads.csv', _write_leads_csv),
+            ('tasks.csv', _write_tasks_csv),
+            ('threads.csv', _write_threads_csv),
+        )
         
-        with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
-            # Add leads CSV
-            leads_csv = export_leads_csv()
-            zip_file.writestr('leads.csv', leads_csv)
-            
-            # Add tasks CSV
-            tasks_csv = export_tasks_csv()
-            zip_file.writestr('tasks.csv', tasks_csv)
-            
-            # Add threads CSV
-            threads_csv = export_threads_csv()
-            zip_file.writestr('threads.csv', threads_csv)
+        with zipfile.ZipFile(zip_buffer, 'w', compression, compresslevel=compresslevel) as zip_file:
+            for name, write_csv in members:
+                # Render the whole member first: a failing export becomes the
+                # error marker alone, never a truncated CSV
+                try:
+                    content = _render_csv(write_csv)
+                except Exception as e:
+                    logger.error(f"Export {name} error: {e}", exc_info=True)
+                    content = "Error generating CSV"
+                zip_file.writestr(name, content)
         
         return zip_buffer.getvalue()
     
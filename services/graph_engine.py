@@ -4,11 +4,64 @@ Maps relationships between ingredients, health conditions, and medical profiles.
 Enables intelligent conflict detection beyond simple text matching.
 """
 
+import re
 import networkx as nx
+from functools import lru_cache
 from typing import List, Dict, Any, Set, Tuple
 from database.db_manager import get_db_manager
 from models.schemas import GraphConflict
 
+try:
+    from rapidfuzz.fuzz import ratio as _fuzz_ratio
+    RAPIDFUZZ_AVAILABLE = True
+except ImportError:
+    from difflib import SequenceMatcher
+    RAPIDFUZZ_AVAILABLE = False
+
+# Minimum edit-distance similarity (0-1) for a fuzzy graph match
+_SIMILARITY_THRESHOLD = 0.7
+
+
+# Allergen family -> ingredient substrings that indicate it
+_COMMON_ALLERGENS = {
+    'peanut': ['peanut', 'groundnut', 'arachis'],
+    'tree_nut': ['almond', 'walnut', 'cashew', 'pecan', 'macadamia'],
+    'milk': ['milk', 'dairy', 'lactose', 'whey', 'casein'],
+    'egg': ['egg', 'ovomucin'],
+    'fish': ['fish', 'anchovy', 'cod', 'salmon'],
+    'shellfish': ['shrimp', 'crab', 'lobster', 'clam', 'oyster'],
+    'soy': ['soy', 'soybean', 'tofu'],
+    'wheat': ['wheat', 'gluten', 'barley', 'rye'],
+}
+
+# Reverse index: variant -> allergen family
+_ALLERGEN_BY_VARIANT = {
+    variant: allergen_type
+    for allergen_type, variants in _COMMON_ALLERGENS.items()
+    for variant in variants
+}
+
+# Zero-width lookahead so overlapping variants are all found in one scan
+_ALLERGEN_VARIANT_RE = re.compile(
+    '(?=(' + '|'.join(
+        re.escape(v) for v in sorted(_ALLERGEN_BY_VARIANT, key=len, reverse=True)
+    ) + '))'
+)
+
+
+def _allergen_families(ingredient_lower: str) -> List[str]:
+    """Allergen families present in an ingredient, in ``_COMMON_ALLERGENS`` order."""
+    found = {_ALLERGEN_BY_VARIANT[m.group(1)] for m in _ALLERGEN_VARIANT_RE.finditer(ingredient_lower)}
+    if not found:
+        return []
+    return [allergen_type for allergen_type in _COMMON_ALLERGENS if allergen_type in found]
+
+
+@lru_cache(maxsize=4096)
+def _normalize(text: str) -> str:
+    """Normalize text for graph matching."""
+    return text.lower().strip().replace(' ', '_')
+
 
 class GraphEngine:
     """Knowledge Graph for health-ingredient relationships."""
@@ -28,190 +81,156 @@ class GraphEngine:
         """
         Advanced conflict detection using knowledge graph.
         Goes beyond simple pattern matching to find indirect relationships.
-        """
-        conflicts = []
-        
-        # Direct conflicts (ingredient -> medical condition)
-        direct_conflicts = self._find_direct_conflicts(ingredients, medical_conditions)
-        conflicts.extend(direct_conflicts)
         
-        # Indirect conflicts (ingredient -> related condition -> user's condition)
-        indirect_conflicts = self._find_indirect_conflicts(
-            ingredients, medical_conditions
-        )
-        conflicts.extend(indirect_conflicts)
+        All three checks run in a single pass over the ingredients. Conflicts
+        are keyed by (ingredient, condition); direct conflicts take precedence
+        over indirect ones, which take precedence over allergy matches.
+        Conditions and allergies are normalized once up front rather than
+        inside the per-ingredient loops.
+        """
+        conditions_normalized = [
+            (condition, _normalize(condition)) for condition in medical_conditions
+        ]
+        allergies_normalized = [
+            (allergy, allergy.lower().strip(), _normalize(allergy)) for allergy in allergies
+        ]
+        direct: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        indirect: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        allergy: Dict[Tuple[str, str], Dict[str, Any]] = {}
         
-        # Allergy conflicts
-        allergy_conflicts = self._find_allergy_conflicts(ingredients, allergies)
-        conflicts.extend(allergy_conflicts)
+        for ingredient in ingredients:
+            ingredient_normalized = _normalize(ingredient)
+            
+            if ingredient_normalized in self.graph:
+                # Direct conflicts (ingredient -> medical condition)
+                for conflict in self._direct_conflicts(
+                    ingredient, ingredient_normalized, conditions_normalized
+                ):
+                    direct.setdefault((ingredient, conflict['health_condition']), conflict)
+                
+                # Indirect conflicts (ingredient -> related condition -> user's condition)
+                for conflict in self._indirect_conflicts(
+                    ingredient, ingredient_normalized, conditions_normalized
+                ):
+                    indirect.setdefault((ingredient, conflict['health_condition']), conflict)
+            
+            # Allergy conflicts
+            for conflict in self._allergy_conflicts(ingredient, allergies_normalized):
+                allergy.setdefault((ingredient, conflict['health_condition']), conflict)
         
-        # Dedup by (ingredient, condition) pair
-        seen = set()
-        unique_conflicts = []
-        for conflict in conflicts:
-            key = (conflict['ingredient'], conflict['health_condition'])
-            if key not in seen:
-                seen.add(key)
-                unique_conflicts.append(conflict)
+        unique_conflicts = direct
+        for bucket in (indirect, allergy):
+            for key, conflict in bucket.items():
+                unique_conflicts.setdefault(key, conflict)
         
-        return unique_conflicts
+        return list(unique_conflicts.values())
     
-    def _find_direct_conflicts(
+    def _direct_conflicts(
         self,
-        ingredients: List[str],
-        medical_conditions: List[str]
+        ingredient: str,
+        ingredient_normalized: str,
+        conditions_normalized: List[Tuple[str, str]]
     ) -> List[Dict[str, Any]]:
-        """Find direct ingredient -> health condition conflicts."""
+        """Find direct ingredient -> health condition conflicts for one ingredient."""
         conflicts = []
         
-        for ingredient in ingredients:
-            ingredient_normalized = self._normalize(ingredient)
-            
-            if ingredient_normalized not in self.graph:
-                continue
-            
-            # Get all direct successors of this ingredient
-            successors = list(self.graph.successors(ingredient_normalized))
-            
-            for successor in successors:
-                # Check if this successor matches any user condition
-                for condition in medical_conditions:
-                    if self._similarity_match(successor, condition):
-                        edge_data = self.graph.edges.get(
-                            (ingredient_normalized, successor), {}
-                        )
-                        conflicts.append({
-                            'ingredient': ingredient,
-                            'health_condition': condition,
-                            'relationship': edge_data.get('relationship', 'affects'),
-                            'severity': edge_data.get('severity', 'medium'),
-                            'direct': True,
-                        })
-                        break
+        # Get all direct successors of this ingredient
+        for successor in self.graph.successors(ingredient_normalized):
+            successor_normalized = _normalize(successor)
+            # Check if this successor matches any user condition
+            for condition, condition_normalized in conditions_normalized:
+                if self._similarity_match_norm(successor_normalized, condition_normalized):
+                    edge_data = self.graph.edges.get(
+                        (ingredient_normalized, successor), {}
+                    )
+                    conflicts.append({
+                        'ingredient': ingredient,
+                        'health_condition': condition,
+                        'relationship': edge_data.get('relationship', 'affects'),
+                        'severity': edge_data.get('severity', 'medium'),
+                        'direct': True,
+                    })
+                    break
         
         return conflicts
     
-    def _find_indirect_conflicts(
+    def _indirect_conflicts(
         self,
-        ingredients: List[str],
-        medical_conditions: List[str]
+        ingredient: str,
+        ingredient_normalized: str,
+        conditions_normalized: List[Tuple[str, str]],
+        max_depth: int = 3
     ) -> List[Dict[str, Any]]:
-        """Find indirect conflicts using paths in the graph."""
+        """
+        Find indirect conflicts for one ingredient using paths in the graph.
+        
+        One truncated BFS yields the shortest path to every reachable node;
+        each (condition, normalized condition) pair is then a dictionary
+        lookup. ``max_depth`` counts nodes on the path, including both ends.
+        """
         conflicts = []
+        shortest_paths = nx.single_source_shortest_path(
+            self.graph, ingredient_normalized, cutoff=max_depth - 1
+        )
         
-        for ingredient in ingredients:
-            ingredient_normalized = self._normalize(ingredient)
+        for condition, condition_normalized in conditions_normalized:
+            path = shortest_paths.get(condition_normalized)
             
-            if ingredient_normalized not in self.graph:
-                continue
-            
-            for condition in medical_conditions:
-                condition_normalized = self._normalize(condition)
-                
-                # Find all paths from ingredient to related health nodes
-                try:
-                    # Use BFS to find shortest paths (max 3 hops)
-                    paths = self._find_paths_bfs(
-                        ingredient_normalized, condition_normalized, max_depth=3
-                    )
-                    
-                    for path in paths:
-                        if len(path) > 2:  # Only count indirect (length > 2)
-                            severity = self._calculate_path_severity(path)
-                            conflicts.append({
-                                'ingredient': ingredient,
-                                'health_condition': condition,
-                                'relationship': f"indirect ({' -> '.join(path[1:-1])})",
-                                'severity': severity,
-                                'direct': False,
-                                'path': path,
-                            })
-                except:
-                    pass
+            if path and len(path) > 2:  # Only count indirect (length > 2)
+                severity = self._calculate_path_severity(path)
+                conflicts.append({
+                    'ingredient': ingredient,
+                    'health_condition': condition,
+                    'relationship': f"indirect ({' -> '.join(path[1:-1])})",
+                    'severity': severity,
+                    'direct': False,
+                    'path': path,
+                })
         
         return conflicts
     
-    def _find_allergy_conflicts(
+    def _allergy_conflicts(
         self,
-        ingredients: List[str],
-        allergies: List[str]
+        ingredient: str,
+        allergies_normalized: List[Tuple[str, str, str]]
     ) -> List[Dict[str, Any]]:
-        """Check if ingredients match known allergens."""
-        conflicts = []
+        """
+        Check if one ingredient matches known allergens.
         
-        common_allergens = {
-            'peanut': ['peanut', 'groundnut', 'arachis'],
-            'tree_nut': ['almond', 'walnut', 'cashew', 'pecan', 'macadamia'],
-            'milk': ['milk', 'dairy', 'lactose', 'whey', 'casein'],
-            'egg': ['egg', 'ovomucin'],
-            'fish': ['fish', 'anchovy', 'cod', 'salmon'],
-            'shellfish': ['shrimp', 'crab', 'lobster', 'clam', 'oyster'],
-            'soy': ['soy', 'soybean', 'tofu'],
-            'wheat': ['wheat', 'gluten', 'barley', 'rye'],
-        }
+        ``allergies_normalized`` holds (allergy, lowercased, normalized) triples.
+        """
+        conflicts = []
+        ingredient_lower = ingredient.lower().strip()
+        families = None
         
-        for ingredient in ingredients:
-            ingredient_lower = ingredient.lower().strip()
+        for allergy, allergy_lower, allergy_normalized in allergies_normalized:
+            # Check direct match
+            if allergy_lower in ingredient_lower:
+                conflicts.append({
+                    'ingredient': ingredient,
+                    'health_condition': f"Allergy: {allergy}",
+                    'relationship': 'allergen_present',
+                    'severity': 'high',
+                    'direct': True,
+                })
+                continue
             
-            for allergy in allergies:
-                allergy_lower = allergy.lower().strip()
-                
-                # Check direct match
-                if allergy_lower in ingredient_lower:
+            # Check allergen family (scan the ingredient once, on demand)
+            if families is None:
+                families = _allergen_families(ingredient_lower)
+            for allergen_type in families:
+                if self._similarity_match_norm(allergen_type, allergy_normalized):
                     conflicts.append({
                         'ingredient': ingredient,
                         'health_condition': f"Allergy: {allergy}",
-                        'relationship': 'allergen_present',
+                        'relationship': f'allergen_family ({allergen_type})',
                         'severity': 'high',
                         'direct': True,
                     })
-                    continue
-                
-                # Check allergen family
-                for allergen_type, variants in common_allergens.items():
-                    if any(variant in ingredient_lower for variant in variants):
-                        if self._similarity_match(allergen_type, allergy_lower):
-                            conflicts.append({
-                                'ingredient': ingredient,
-                                'health_condition': f"Allergy: {allergy}",
-                                'relationship': f'allergen_family ({allergen_type})',
-                                'severity': 'high',
-                                'direct': True,
-                            })
-                            break
+                    break
         
         return conflicts
     
-    def _find_paths_bfs(
-        self,
-        source: str,
-        target: str,
-        max_depth: int = 3
-    ) -> List[List[str]]:
-        """Find paths between nodes using BFS."""
-        if source not in self.graph or target not in self.graph:
-            return []
-        
-        paths = []
-        queue = [(source, [source])]
-        visited = {source}
-        
-        while queue:
-            current, path = queue.pop(0)
-            
-            if len(path) > max_depth:
-                continue
-            
-            if current == target:
-                paths.append(path)
-                continue
-            
-            for neighbor in self.graph.successors(current):
-                if neighbor not in visited or len(path) < max_depth:
-                    queue.append((neighbor, path + [neighbor]))
-        
-        return paths
-    
     def _calculate_path_severity(self, path: List[str]) -> str:
         """Calculate severity based on path edges."""
         if len(path) < 2:
@@ -229,15 +248,8 @@ class GraphEngine:
             return 'medium'
         return 'low'
     
-    def _normalize(self, text: str) -> str:
-        """Normalize text for graph matching."""
-        return text.lower().strip().replace(' ', '_')
-    
-    def _similarity_match(self, text1: str, text2: str) -> bool:
-        """Simple similarity matching."""
-        norm1 = self._normalize(text1)
-        norm2 = self._normalize(text2)
-        
+    def _similarity_match_norm(self, norm1: str, norm2: str) -> bool:
+        """Similarity matching for already normalized text."""
         # Exact match
         if norm1 == norm2:
             return True
@@ -246,17 +258,17 @@ class GraphEngine:
         if norm1 in norm2 or norm2 in norm1:
             return True
         
-        # Levenshtein-like simple check
-        return self._string_similarity(norm1, norm2) > 0.7
+        # Edit-distance check for near spellings
+        return self._string_similarity(norm1, norm2) > _SIMILARITY_THRESHOLD
     
     def _string_similarity(self, s1: str, s2: str) -> float:
-        """Simple similarity score (0-1)."""
+        """Normalized edit-distance similarity score (0-1)."""
         if not s1 or not s2:
             return 0.0
         
-        # Count common characters
-        common = sum(1 for c in s1 if c in s2)
-        return common / max(len(s1), len(s2))
+        if RAPIDFUZZ_AVAILABLE:
+            return _fuzz_ratio(s1, s2) / 100.0
+        return SequenceMatcher(None, s1, s2).ratio()
     
     def add_relationship(
         self,
@@ -267,8 +279,8 @@ class GraphEngine:
     ) -> bool:
         """Add new relationship to the knowledge graph."""
         try:
-            source_norm = self._normalize(source)
-            target_norm = self._normalize(target)
+            source_norm = _normalize(source)
+            target_norm = _normalize(target)
             
             self.graph.add_edge(
                 source_norm, target_norm,
@@ -285,23 +297,34 @@ class GraphEngine:
     
     def get_related_conditions(self, ingredient: str) -> List[str]:
         """Get all health conditions related to an ingredient."""
-        ingredient_norm = self._normalize(ingredient)
+        ingredient_norm = _normalize(ingredient)
+        
+        cache_key = ('related_conditions', ingredient_norm)
+        if cache_key in self.cache:
+            return list(self.cache[cache_key])
         
         if ingredient_norm not in self.graph:
             return []
         
         # Get all successors
         successors = list(self.graph.successors(ingredient_norm))
-        return [s.replace('_', ' ') for s in successors]
+        related = [s.replace('_', ' ') for s in successors]
+        self.cache[cache_key] = related
+        return list(related)
     
     def get_graph_metrics(self) -> Dict[str, Any]:
         """Get knowledge graph statistics."""
-        return {
+        if 'graph_metrics' in self.cache:
+            return dict(self.cache['graph_metrics'])
+        
+        metrics = {
             'total_nodes': self.graph.number_of_nodes(),
             'total_edges': self.graph.number_of_edges(),
             'density': nx.density(self.graph),
             'avg_degree': sum(dict(self.graph.degree()).values()) / max(1, self.graph.number_of_nodes()),
         }
+        self.cache['graph_metrics'] = metrics
+        return dict(metrics)
     
     def export_graph(self) -> Dict[str, Any]:
         """Export graph in JSON format for visualization."""
@@ -4,17 +4,24 @@ Currently logs payloads; replace with platform-specific APIs later.
 """
 
 import logging
-from typing import Dict, Any, Optional
+import threading
+from collections import deque
+from typing import Dict, Any, List, Optional
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
+# Oldest entries are dropped once the in-memory buffer is full
+_BUFFER_MAXLEN = 10_000
+
 
 class HealthSyncService:
     """Lightweight stub to enqueue nutrition entries for device health apps."""
 
     def __init__(self):
-        self.buffer = []  # Simple in-memory buffer; replace with durable queue if needed
+        # Bounded in-memory buffer; replace with durable queue if needed
+        self.buffer: deque = deque(maxlen=_BUFFER_MAXLEN)
+        self._lock = threading.Lock()
 
     def sync_nutrition_entry(
         self,
@@ -35,10 +42,17 @@ class HealthSyncService:
             "nutrients": nutrients,
             "timestamp": timestamp or datetime.utcnow().isoformat(),
         }
-        self.buffer.append(payload)
+        with self._lock:
+            self.buffer.append(payload)
         logger.info("Health sync queued", extra={"source": source, "product": product})
         return True
 
+    def drain_batch(self, max_items: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Remove and return up to ``max_items`` queued entries, oldest first."""
+        with self._lock:
+            count = len(self.buffer) if max_items is None else min(max_items, len(self.buffer))
+            return [self.buffer.popleft() for _ in range(count)]
+
 
 _health_sync_service: Optional[HealthSyncService] = None
 
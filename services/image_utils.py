@@ -1,8 +1,22 @@
 """Image utility functions for consistent handling across the app."""
+import logging
+from io import BytesIO
+
 from PIL import Image
 import numpy as np
 import cv2
 
+logger = logging.getLogger(__name__)
+
+try:
+    from turbojpeg import TurboJPEG, TJPF_RGB, TJSAMP_420
+    _TURBO_JPEG = TurboJPEG()
+    TURBOJPEG_AVAILABLE = True
+except Exception:  # ImportError, or libturbojpeg missing at load time
+    _TURBO_JPEG = None
+    TURBOJPEG_AVAILABLE = False
+    logger.info("PyTurboJPEG not available; using Pillow JPEG encoder")
+
 
 def ensure_rgb(img: Image.Image) -> Image.Image:
     """
@@ -32,6 +46,23 @@ def ensure_rgb(img: Image.Image) -> Image.Image:
     return img.convert('RGB')
 
 
+def _drop_alpha(frame: np.ndarray) -> np.ndarray:
+    """BGRA -> BGR: contiguous copy of the first 3 channels."""
+    return np.ascontiguousarray(frame[..., :3])
+
+
+def _gray_to_bgr(frame: np.ndarray) -> np.ndarray:
+    """Single-channel grayscale -> BGR."""
+    return cv2.cvtColor(frame, cv2.COLOR_GRAY2BGR)
+
+
+# Conversions keyed by channel count; 3-channel frames pass through
+_CHANNEL_DISPATCH = {
+    4: _drop_alpha,
+    1: _gray_to_bgr,
+}
+
+
 def ensure_rgb_from_array(frame: np.ndarray) -> np.ndarray:
     """
     Convert numpy array frame to RGB if it has alpha channel or other issues.
@@ -42,21 +73,11 @@ def ensure_rgb_from_array(frame: np.ndarray) -> np.ndarray:
     Returns:
         numpy array in BGR or RGB format suitable for PIL/OpenCV
     """
-    if len(frame.shape) != 3:
+    if frame.ndim != 3:
         return frame
     
-    channels = frame.shape[2]
-    
-    # If 4-channel (BGRA), convert to BGR
-    if channels == 4:
-        return cv2.cvtColor(frame, cv2.COLOR_BGRA2BGR)
-    
-    # If 1-channel (grayscale), convert to BGR
-    if channels == 1:
-        return cv2.cvtColor(frame, cv2.COLOR_GRAY2BGR)
-    
-    # Already 3-channel (BGR or RGB)
-    return frame
+    convert = _CHANNEL_DISPATCH.get(frame.shape[2])
+    return convert(frame) if convert else frame
 
 
 def image_to_jpeg_bytes(img: Image.Image) -> bytes:
@@ -72,9 +93,14 @@ def image_to_jpeg_bytes(img: Image.Image) -> bytes:
     # Ensure RGB before save
     img = ensure_rgb(img)
     
-    from io import BytesIO
+    # libjpeg-turbo SIMD encoder when available (4:2:0 like the Pillow path)
+    if TURBOJPEG_AVAILABLE:
+        return _TURBO_JPEG.encode(
+            np.asarray(img), quality=95, pixel_format=TJPF_RGB, jpeg_subsample=TJSAMP_420
+        )
+    
     buf = BytesIO()
-    img.save(buf, format="JPEG", quality=95)
+    img.save(buf, format="JPEG", quality=95, subsampling=2, optimize=False)
     buf.seek(0)
     return buf.getvalue()
 
@@ -92,7 +118,8 @@ def frame_to_jpeg_bytes(frame: np.ndarray) -> bytes:
     # Ensure proper format
     frame = ensure_rgb_from_array(frame)
     
-    # Convert to PIL Image (OpenCV uses BGR, PIL expects RGB)
-    img = Image.fromarray(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
-    
-    return image_to_jpeg_bytes(img)
+    # Encode straight from BGR; no RGB copy or PIL round-trip needed
+    ok, buf = cv2.imencode('.jpg', frame, [int(cv2.IMWRITE_JPEG_QUALITY), 95])
+    if not ok:
+        raise ValueError("Failed to encode frame as JPEG")
+    return buf.tobytes()
@@ -5,11 +5,69 @@ Provides utilities for processing imported messages and managing thread state.
 """
 
 import logging
-from typing import Dict, Any
+from functools import lru_cache
+from typing import Dict, Any, List, Optional
 from datetime import datetime
 
+import numpy as np
+import pandas as pd
+
 logger = logging.getLogger(__name__)
 
+# SLA thresholds in hours: above the first is 'warning', above the second 'urgent'
+_SLA_THRESHOLDS_HOURS = (4, 24)
+_SLA_LEVELS = (
+    ('ok', '#44ff44', '🟢'),
+    ('warning', '#ffaa00', '🟡'),
+    ('urgent', '#ff4444', '🔴'),
+)
+_SLA_UNKNOWN = {
+    'hours_since': 0,
+    'status': 'unknown',
+    'color': '#888888',
+    'emoji': '⚪'
+}
+
+
+# Fields read from imported messages
+_IMPORT_FIELDS = ['platform', 'sender_name', 'sender_id', 'thread_id', 'text']
+
+
+@lru_cache(maxsize=2048)
+def _canonical_iso(timestamp: str) -> str:
+    """Re-emit a timezone-less ISO timestamp in ``datetime.isoformat`` form."""
+    return datetime.fromisoformat(timestamp).isoformat()
+
+
+def _normalize_timestamp(timestamp: Any, now_iso: str) -> Any:
+    """Apply the import timestamp rules, falling back to ``now_iso``."""
+    if not timestamp:
+        return now_iso
+    if isinstance(timestamp, str) and not timestamp.endswith('Z') and '+' not in timestamp:
+        # Ensure ISO format
+        try:
+            return _canonical_iso(timestamp)
+        except ValueError:
+            return now_iso
+    return timestamp
+
+
+@lru_cache(maxsize=2048)
+def _parse_iso(iso: str) -> datetime:
+    """Parse an ISO timestamp (``Z`` suffix allowed) into a naive datetime."""
+    return datetime.fromisoformat(iso.replace('Z', '+00:00')).replace(tzinfo=None)
+
+
+def _sla_result(hours_since: float, level: int) -> Dict[str, Any]:
+    """Build an SLA status dict for a level index into ``_SLA_LEVELS``."""
+    status, color, emoji = _SLA_LEVELS[level]
+    return {
+        'hours_since': hours_since,
+        'status': status,
+        'color': color,
+        'emoji': emoji
+    }
+
 
 def normalize_imported_message(msg: Dict[str, Any]) -> Dict[str, Any]:
     """
@@ -36,16 +94,7 @@ def normalize_imported_message(msg: Dict[str, Any]) -> Dict[str, Any]:
     thread_id = msg.get('thread_id', f"{platform}_{sender_id}")
     
     # Parse or generate timestamp
-    timestamp = msg.get('timestamp')
-    if not timestamp:
-        timestamp = datetime.now().isoformat()
-    elif isinstance(timestamp, str) and not timestamp.endswith('Z') and '+' not in timestamp:
-        # Ensure ISO format
-        try:
-            dt = datetime.fromisoformat(timestamp)
-            timestamp = dt.isoformat()
-        except:
-            timestamp = datetime.now().isoformat()
+    timestamp = _normalize_timestamp(msg.get('timestamp'), datetime.now().isoformat())
     
     return {
         'platform': platform,
@@ -58,6 +107,54 @@ def normalize_imported_message(msg: Dict[str, Any]) -> Dict[str, Any]:
     }
 
 
+def normalize_imported_messages(msgs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Normalize a batch of imported messages.
+    
+    Column-wise equivalent of ``normalize_imported_message`` for bulk
+    imports: defaults and string transforms run as pandas column operations
+    and every generated timestamp shares one ``now``. Keys set to None are
+    treated as missing.
+    
+    Args:
+        msgs: Raw message dicts from JSON import
+        
+    Returns:
+        Normalized messages in input order (same keys as the single version)
+    """
+    if not msgs:
+        return []
+    
+    df = pd.DataFrame(msgs, columns=_IMPORT_FIELDS, dtype=object)
+    platform = df['platform'].fillna('unknown').str.lower()
+    sender_name = df['sender_name'].fillna('Unknown')
+    sender_id = df['sender_id'].fillna(
+        'user_' + sender_name.str.replace(' ', '_').str.lower()
+    )
+    thread_id = df['thread_id'].fillna(platform + '_' + sender_id.astype(str))
+    text = df['text'].fillna('')
+    
+    now_iso = datetime.now().isoformat()
+    timestamps = [_normalize_timestamp(msg.get('timestamp'), now_iso) for msg in msgs]
+    
+    return [
+        {
+            'platform': p,
+            'thread_id': t,
+            'sender_id': sid,
+            'sender_name': name,
+            'text': body,
+            'timestamp_iso': ts,
+            'raw': msg
+        }
+        for p, t, sid, name, body, ts, msg in zip(
+            platform.tolist(), thread_id.tolist(), sender_id.tolist(),
+            sender_name.tolist(), text.tolist(), timestamps, msgs,
+            strict=True
+        )
+    ]
+
+
 def compute_thread_title(thread_id: str, platform: str, messages: list) -> str:
     """
     Compute thread title from messages.
@@ -112,45 +209,61 @@ def compute_sla_status(last_message_time_iso: str) -> Dict[str, Any]:
         }
     """
     try:
-        last_time = datetime.fromisoformat(last_message_time_iso.replace('Z', '+00:00'))
-        now = datetime.now()
-        
-        # Remove timezone info for comparison
-        last_time = last_time.replace(tzinfo=None)
-        
-        delta = now - last_time
-        hours_since = delta.total_seconds() / 3600
+        last_time = _parse_iso(last_message_time_iso)
+        hours_since = (datetime.now() - last_time).total_seconds() / 3600
         
         # SLA thresholds
-        if hours_since > 24:
-            return {
-                'hours_since': hours_since,
-                'status': 'urgent',
-                'color': '#ff4444',
-                'emoji': '🔴'
-            }
-        elif hours_since > 4:
-            return {
-                'hours_since': hours_since,
-                'status': 'warning',
-                'color': '#ffaa00',
-                'emoji': '🟡'
-            }
-        else:
-            return {
-                'hours_since': hours_since,
-                'status': 'ok',
-                'color': '#44ff44',
-                'emoji': '🟢'
-            }
+        if hours_since > _SLA_THRESHOLDS_HOURS[1]:
+            return _sla_result(hours_since, 2)
+        elif hours_since > _SLA_THRESHOLDS_HOURS[0]:
+            return _sla_result(hours_since, 1)
+        return _sla_result(hours_since, 0)
     except Exception as e:
         logger.warning(f"SLA computation error: {e}")
-        return {
-            'hours_since': 0,
-            'status': 'unknown',
-            'color': '#888888',
-            'emoji': '⚪'
-        }
+        return dict(_SLA_UNKNOWN)
+
+
+def compute_sla_status_many(
+    last_message_times_iso: List[str],
+    now: Optional[datetime] = None
+) -> List[Dict[str, Any]]:
+    """
+    Compute SLA status for many threads at once.
+    
+    Timestamps are parsed through the shared cache, then the elapsed hours
+    and threshold levels are computed in one NumPy pass against a single
+    ``now``.
+    
+    Args:
+        last_message_times_iso: ISO timestamps of each thread's last message
+        now: Reference time (defaults to ``datetime.now()``)
+        
+    Returns:
+        List of SLA dicts in input order (see ``compute_sla_status``)
+    """
+    now = now or datetime.now()
+    parsed: List[Optional[datetime]] = []
+    for iso in last_message_times_iso:
+        try:
+            parsed.append(_parse_iso(iso))
+        except Exception as e:
+            logger.warning(f"SLA computation error: {e}")
+            parsed.append(None)
+    
+    valid = [dt for dt in parsed if dt is not None]
+    times = np.array(valid, dtype='datetime64[us]')
+    hours = (np.datetime64(now, 'us') - times) / np.timedelta64(1, 'h')
+    levels = np.searchsorted(_SLA_THRESHOLDS_HOURS, hours, side='left')
+    
+    results = []
+    computed = iter(zip(hours.tolist(), levels.tolist(), strict=True))
+    for dt in parsed:
+        if dt is None:
+            results.append(dict(_SLA_UNKNOWN))
+        else:
+            hours_since, level = next(computed)
+            results.append(_sla_result(hours_since, level))
+    return results
 
 
 def suggest_followup_time(last_message_time_iso: str, priority: str = 'normal') -> str:
@@ -167,8 +280,7 @@ def suggest_followup_time(last_message_time_iso: str, priority: str = 'normal')
     from datetime import timedelta
     
     try:
-        last_time = datetime.fromisoformat(last_message_time_iso.replace('Z', '+00:00'))
-        last_time = last_time.replace(tzinfo=None)
+        last_time = _parse_iso(last_message_time_iso)
     except:
         last_time = datetime.now()
     
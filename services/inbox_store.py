@@ -8,14 +8,91 @@ Provides JSON import for testing without real integrations.
 import sqlite3
 import json
 import logging
-from typing import List, Dict, Any, Optional
+import queue
+import re
+import threading
+from contextlib import contextmanager
+from typing import Iterator, List, Dict, Any, Optional, Tuple, Union
 from datetime import datetime
 from pathlib import Path
 
-from services.db import get_db_path
+from services.db import CONNECTION_PRAGMAS, get_db_path
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
+# Idle read connections kept open per store
+_READ_POOL_SIZE = 8
+
+_UPSERT_THREAD_SQL = """
+    INSERT INTO threads (thread_id, platform, title, updated_at, created_at)
+    VALUES (?, ?, ?, ?, ?)
+    ON CONFLICT(thread_id) DO UPDATE SET
+        updated_at=excluded.updated_at,
+        title=COALESCE(excluded.title, title)
+"""
+
+_INSERT_MESSAGE_SQL = """
+    INSERT INTO messages 
+    (thread_id, platform, sender_id, sender_name, text, timestamp, raw_json)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+_JSON_DECODER = json.JSONDecoder()
+_JSON_WS = re.compile(r'[ \t\n\r]*')
+
+
+def split_json_array(text: str) -> Tuple[List[Any], List[str]]:
+    """
+    Parse a JSON array, returning its items and each item's source text.
+    
+    Lets imports store the original JSON of every message as raw_json
+    instead of re-serializing the parsed dict.
+    
+    Raises:
+        ValueError: If the text is not a JSON array (json.JSONDecodeError
+            for malformed JSON)
+    """
+    idx = _JSON_WS.match(text).end()
+    if not text.startswith('[', idx):
+        raise ValueError("JSON must be an array of messages")
+    idx = _JSON_WS.match(text, idx + 1).end()
+    
+    items: List[Any] = []
+    raws: List[str] = []
+    if text.startswith(']', idx):
+        end = idx + 1
+    else:
+        while True:
+            item, end = _JSON_DECODER.raw_decode(text, idx)
+            items.append(item)
+            raws.append(text[idx:end])
+            idx = _JSON_WS.match(text, end).end()
+            if text.startswith(',', idx):
+                idx = _JSON_WS.match(text, idx + 1).end()
+            elif text.startswith(']', idx):
+                end = idx + 1
+                break
+            else:
+                raise json.JSONDecodeError("Expecting ',' delimiter", text, idx)
+    
+    if _JSON_WS.match(text, end).end() != len(text):
+        raise json.JSONDecodeError("Extra data", text, end)
+    return items, raws
+
+
+def _encode_raw(msg: Dict[str, Any]) -> str:
+    """Serialize a message for the raw_json column (orjson when installed)."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(msg, option=orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(msg)
+
 
 class InboxStore:
     """
@@ -36,54 +113,106 @@ class InboxStore:
         self.db_path = db_path or get_db_path()
         # Ensure data directory exists
         Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        # Reads borrow from a pool; writes share one connection, serialized by a lock
+        self._pool: "queue.Queue[sqlite3.Connection]" = queue.Queue(maxsize=_READ_POOL_SIZE)
+        self._writer: Optional[sqlite3.Connection] = None
+        self._write_lock = threading.Lock()
         self.init_db()
         logger.info(f"InboxStore initialized with DB: {self.db_path}")
     
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection with the store's pragmas applied."""
+        # Streamlit runs callbacks on worker threads; the pool hands each
+        # connection to one thread at a time
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        for pragma in CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+        return conn
+    
+    @contextmanager
+    def _conn(self) -> Iterator[sqlite3.Connection]:
+        """Borrow a read connection from the pool, opening one if none is idle."""
+        try:
+            conn = self._pool.get_nowait()
+        except queue.Empty:
+            conn = self._connect()
+        try:
+            yield conn
+        finally:
+            try:
+                self._pool.put_nowait(conn)
+            except queue.Full:
+                conn.close()
+    
+    @contextmanager
+    def _write_conn(self) -> Iterator[sqlite3.Connection]:
+        """Hold the writer connection; commit on success, roll back on error."""
+        with self._write_lock:
+            if self._writer is None:
+                self._writer = self._connect()
+            try:
+                yield self._writer
+                self._writer.commit()
+            except BaseException:
+                self._writer.rollback()
+                raise
+    
+    def close(self) -> None:
+        """Close the writer and all pooled read connections."""
+        with self._write_lock:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                break
+    
     def init_db(self) -> None:
         """Initialize database tables if they don't exist."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Threads table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS threads (
-                thread_id TEXT PRIMARY KEY,
-                platform TEXT NOT NULL,
-                title TEXT,
-                updated_at TEXT NOT NULL,
-                created_at TEXT NOT NULL,
-                metadata TEXT
-            )
-        """)
-        
-        # Messages table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS messages (
-                message_id INTEGER PRIMARY KEY AUTOINCREMENT,
-                thread_id TEXT NOT NULL,
-                platform TEXT NOT NULL,
-                sender_id TEXT NOT NULL,
-                sender_name TEXT,
-                text TEXT NOT NULL,
-                timestamp TEXT NOT NULL,
-                raw_json TEXT,
-                FOREIGN KEY (thread_id) REFERENCES threads(thread_id)
-            )
-        """)
-        
-        # Indexes for performance
-        cursor.execute("""
-            CREATE INDEX IF NOT EXISTS idx_threads_platform_updated 
-            ON threads(platform, updated_at DESC)
-        """)
-        
-        cursor.execute("""
-            CREATE INDEX IF NOT EXISTS idx_messages_thread_timestamp 
-            ON messages(thread_id, timestamp)
-        """)
+        with self._write_conn() as conn:
+            cursor = conn.cursor()
+            
+            # Threads table
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS threads (
+                    thread_id TEXT PRIMARY KEY,
+                    platform TEXT NOT NULL,
+                    title TEXT,
+                    updated_at TEXT NOT NULL,
+                    created_at TEXT NOT NULL,
+                    metadata TEXT
+                )
+            """)
+            
+            # Messages table
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS messages (
+                    message_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    thread_id TEXT NOT NULL,
+                    platform TEXT NOT NULL,
+                    sender_id TEXT NOT NULL,
+                    sender_name TEXT,
+                    text TEXT NOT NULL,
+                    timestamp TEXT NOT NULL,
+                    raw_json TEXT,
+                    FOREIGN KEY (thread_id) REFERENCES threads(thread_id)
+                )
+            """)
+            
+            # Indexes for performance
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_threads_platform_updated 
+                ON threads(platform, updated_at DESC)
+            """)
+            
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_messages_thread_timestamp 
+                ON messages(thread_id, timestamp)
+            """)
         
-        conn.commit()
-        conn.close()
         logger.info("Database initialized")
     
     def upsert_thread(
@@ -102,19 +231,12 @@ class InboxStore:
             updated_at: ISO format timestamp of last update
             title: Thread title (derived from messages if None)
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            INSERT INTO threads (thread_id, platform, title, updated_at, created_at)
-            VALUES (?, ?, ?, ?, ?)
-            ON CONFLICT(thread_id) DO UPDATE SET
-                updated_at=excluded.updated_at,
-                title=COALESCE(excluded.title, title)
-        """, (thread_id, platform.lower(), title, updated_at, updated_at))
+        with self._write_conn() as conn:
+            conn.execute(
+                _UPSERT_THREAD_SQL,
+                (thread_id, platform.lower(), title, updated_at, updated_at)
+            )
         
-        conn.commit()
-        conn.close()
         logger.debug(f"Upserted thread: {thread_id}")
     
     def add_message(
@@ -139,17 +261,12 @@ class InboxStore:
             timestamp: ISO format timestamp
             raw_json: Raw message JSON for reference
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            INSERT INTO messages 
-            (thread_id, platform, sender_id, sender_name, text, timestamp, raw_json)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-        """, (thread_id, platform.lower(), sender_id, sender_name, text, timestamp, raw_json))
+        with self._write_conn() as conn:
+            conn.execute(
+                _INSERT_MESSAGE_SQL,
+                (thread_id, platform.lower(), sender_id, sender_name, text, timestamp, raw_json)
+            )
         
-        conn.commit()
-        conn.close()
         logger.debug(f"Added message to thread: {thread_id}")
     
     def list_threads(self, platform_filter: Optional[str] = None) -> List[Dict[str, Any]]:
@@ -162,35 +279,24 @@ class InboxStore:
         Returns:
             List of thread dictionaries sorted by updated_at DESC
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
         if platform_filter:
-            cursor.execute("""
+            sql = """
                 SELECT thread_id, platform, title, updated_at, created_at
                 FROM threads
                 WHERE platform = ?
                 ORDER BY updated_at DESC
-            """, (platform_filter.lower(),))
+            """
+            params = (platform_filter.lower(),)
         else:
-            cursor.execute("""
+            sql = """
                 SELECT thread_id, platform, title, updated_at, created_at
                 FROM threads
                 ORDER BY updated_at DESC
-            """)
+            """
+            params = ()
         
-        threads = []
-        for row in cursor.fetchall():
-            threads.append({
-                'thread_id': row[0],
-                'platform': row[1],
-                'title': row[2],
-                'updated_at': row[3],
-                'created_at': row[4]
-            })
-        
-        conn.close()
-        return threads
+        with self._conn() as conn:
+            return [dict(row) for row in conn.execute(sql, params)]
     
     def get_thread_messages(self, thread_id: str) -> List[Dict[str, Any]]:
         """
@@ -202,34 +308,39 @@ class InboxStore:
         Returns:
             List of message dictionaries sorted by timestamp ASC
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            SELECT message_id, thread_id, platform, sender_id, sender_name, 
-                   text, timestamp, raw_json
-            FROM messages
-            WHERE thread_id = ?
-            ORDER BY timestamp ASC
-        """, (thread_id,))
+        with self._conn() as conn:
+            return [dict(row) for row in conn.execute("""
+                SELECT message_id, thread_id, platform, sender_id, sender_name, 
+                       text, timestamp, raw_json
+                FROM messages
+                WHERE thread_id = ?
+                ORDER BY timestamp ASC
+            """, (thread_id,))]
+    
+    def message_counts(self) -> Dict[str, int]:
+        """
+        Count messages per thread in a single aggregate query.
         
-        messages = []
-        for row in cursor.fetchall():
-            messages.append({
-                'message_id': row[0],
-                'thread_id': row[1],
-                'platform': row[2],
-                'sender_id': row[3],
-                'sender_name': row[4],
-                'text': row[5],
-                'timestamp': row[6],
-                'raw_json': row[7]
-            })
+        Returns:
+            Mapping of thread_id to message count (threads without messages are absent)
+        """
+        with self._conn() as conn:
+            counts = {
+                row[0]: row[1]
+                for row in conn.execute("""
+                    SELECT thread_id, COUNT(*)
+                    FROM messages
+                    GROUP BY thread_id
+                """)
+            }
         
-        conn.close()
-        return messages
+        return counts
     
-    def import_from_json(self, messages: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def import_from_json(
+        self,
+        messages: List[Dict[str, Any]],
+        raw_payloads: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
         """
         Import messages from JSON format for testing.
         
@@ -248,6 +359,8 @@ class InboxStore:
         
         Args:
             messages: List of message dictionaries
+            raw_payloads: Original JSON text of each message, stored as raw_json
+                instead of re-encoding (see ``split_json_array``)
             
         Returns:
             {
@@ -256,10 +369,15 @@ class InboxStore:
                 "errors": [error_messages]
             }
         """
-        imported = 0
-        threads_created = set()
+        if raw_payloads is not None and len(raw_payloads) != len(messages):
+            raise ValueError("raw_payloads must match messages one-to-one")
+        
+        # thread_id -> [thread_id, platform, title, updated_at, created_at]
+        thread_rows: Dict[str, List[Any]] = {}
+        message_rows = []
         errors = []
         
+        # Validate and build rows first so the writes can run as one batch
         for idx, msg in enumerate(messages):
             try:
                 # Validate required fields
@@ -278,41 +396,71 @@ class InboxStore:
                 # Use current timestamp if missing
                 timestamp = msg.get('timestamp') or datetime.now().isoformat()
                 
-                # Ensure thread exists
-                if thread_id not in threads_created:
-                    self.upsert_thread(
-                        thread_id=thread_id,
-                        platform=platform,
-                        updated_at=timestamp,
-                        title=msg['sender_name']
-                    )
-                    threads_created.add(thread_id)
-                
-                # Add message
-                self.add_message(
-                    thread_id=thread_id,
-                    platform=platform,
-                    sender_id=msg.get('sender_id', thread_id),
-                    sender_name=msg['sender_name'],
-                    text=msg['text'],
-                    timestamp=timestamp,
-                    raw_json=json.dumps(msg)
+                message_row = (
+                    thread_id,
+                    platform,
+                    msg.get('sender_id', thread_id),
+                    msg['sender_name'],
+                    msg['text'],
+                    timestamp,
+                    raw_payloads[idx] if raw_payloads is not None else _encode_raw(msg)
                 )
                 
-                imported += 1
+                # One upsert row per thread: first sender as title, spanning
+                # the earliest and latest message in this batch
+                thread_row = thread_rows.get(thread_id)
+                if thread_row is None:
+                    thread_rows[thread_id] = [thread_id, platform, msg['sender_name'], timestamp, timestamp]
+                else:
+                    thread_row[3] = max(thread_row[3], timestamp)
+                    thread_row[4] = min(thread_row[4], timestamp)
+                
+                message_rows.append(message_row)
                 
             except Exception as e:
                 errors.append(f"Message {idx}: {str(e)}")
                 logger.error(f"Import error for message {idx}: {e}")
         
-        logger.info(f"Imported {imported} messages into {len(threads_created)} threads")
+        imported = len(message_rows)
+        threads_created = len(thread_rows)
+        if message_rows:
+            # One transaction (and one fsync) for the whole import
+            try:
+                with self._write_conn() as conn:
+                    conn.execute("BEGIN IMMEDIATE")
+                    conn.executemany(_UPSERT_THREAD_SQL, thread_rows.values())
+                    conn.executemany(_INSERT_MESSAGE_SQL, message_rows)
+            except sqlite3.Error as e:
+                errors.append(f"Database error: {str(e)}")
+                logger.error(f"Import transaction failed: {e}")
+                imported = 0
+                threads_created = 0
+        
+        logger.info(f"Imported {imported} messages into {threads_created} threads")
         
         return {
             'imported': imported,
-            'threads_created': len(threads_created),
+            'threads_created': threads_created,
             'errors': errors
         }
 
+    
+    def import_from_json_bytes(self, data: Union[bytes, str]) -> Dict[str, Any]:
+        """
+        Import a JSON array of messages straight from file contents.
+        
+        Parses once and keeps each message's original JSON as raw_json.
+        
+        Args:
+            data: UTF-8 JSON bytes (or text) holding an array of messages
+            
+        Returns:
+            Same summary as ``import_from_json``
+        """
+        text = data.decode('utf-8') if isinstance(data, bytes) else data
+        messages, raw_payloads = split_json_array(text)
+        return self.import_from_json(messages, raw_payloads=raw_payloads)
+
 
 # Global singleton
 _inbox_store = None
@@ -3,8 +3,12 @@ Lead management system with in-memory storage and DB stub.
 Tracks potential customers and their interaction history.
 """
 
-from pydantic import BaseModel, Field
-from typing import Optional, List, Dict, Any
+from pydantic import BaseModel, ConfigDict, Field
+import heapq
+import itertools
+from bisect import insort
+from dataclasses import dataclass, field, fields
+from typing import Optional, List, Dict, Any, Hashable
 from datetime import datetime
 from enum import Enum
 import logging
@@ -30,8 +34,41 @@ class LeadSource(str, Enum):
     OTHER = "other"
 
 
-class Lead(BaseModel):
-    """Lead/contact model."""
+@dataclass(slots=True)
+class Lead:
+    """
+    Lead/contact record.
+    
+    Plain slotted dataclass for the in-memory store (no per-instance dict or
+    validation on create/update); use ``LeadDTO`` at serialization boundaries.
+    """
+    id: str
+    source: LeadSource
+    name: Optional[str] = None
+    phone: Optional[str] = None
+    email: Optional[str] = None
+    status: LeadStatus = LeadStatus.NEW
+    tags: List[str] = field(default_factory=list)
+    notes: str = ""
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    created_at: datetime = field(default_factory=datetime.now)
+    updated_at: datetime = field(default_factory=datetime.now)
+    last_interaction: Optional[datetime] = None
+    
+    def __post_init__(self):
+        # Accept raw strings for the enum fields, as the Pydantic model did
+        self.source = LeadSource(self.source)
+        self.status = LeadStatus(self.status)
+
+
+# Names accepted by LeadsManager.update_lead
+_LEAD_FIELDS = frozenset(f.name for f in fields(Lead))
+
+
+class LeadDTO(BaseModel):
+    """Validated lead model for API serialization (``LeadDTO.model_validate(lead)``)."""
+    model_config = ConfigDict(from_attributes=True)
+    
     id: str
     name: Optional[str] = None
     phone: Optional[str] = None
@@ -65,6 +102,21 @@ class LeadsManager:
         """
         self.leads: Dict[str, Lead] = {}
         self.db = db_manager
+        
+        # Lead IDs: per-manager counter plus the start time (taken once)
+        self._id_counter = itertools.count(1)
+        self._id_epoch = int(datetime.now().timestamp())
+        
+        # Lookup indexes: field value -> lead IDs in creation order
+        self._position: Dict[str, int] = {}
+        self._by_phone: Dict[str, List[str]] = {}
+        self._by_email: Dict[str, List[str]] = {}
+        self._by_source: Dict[LeadSource, List[str]] = {}
+        self._indexes = {
+            'phone': self._by_phone,
+            'email': self._by_email,
+            'source': self._by_source,
+        }
         logger.info("LeadsManager initialized (in-memory mode)")
     
     def create_lead(
@@ -89,7 +141,7 @@ class LeadsManager:
             Created lead
         """
         # Generate ID (simple for now, can use UUID)
-        lead_id = f"lead_{len(self.leads) + 1}_{int(datetime.now().timestamp())}"
+        lead_id = f"lead_{next(self._id_counter)}_{self._id_epoch}"
         
         lead = Lead(
             id=lead_id,
@@ -101,6 +153,9 @@ class LeadsManager:
         )
         
         self.leads[lead_id] = lead
+        self._position[lead_id] = len(self._position)
+        for field_name, index in self._indexes.items():
+            self._index_add(index, getattr(lead, field_name), lead_id)
         logger.info(f"Created lead: {lead_id}")
         
         # TODO: Persist to DB
@@ -109,6 +164,21 @@ class LeadsManager:
         
         return lead
     
+    def _index_add(self, index: Dict[Any, List[str]], value: Hashable, lead_id: str) -> None:
+        """Add a lead under ``value``, keeping creation order (empty values are not indexed)."""
+        if not value:
+            return
+        insort(index.setdefault(value, []), lead_id, key=self._position.__getitem__)
+    
+    def _index_remove(self, index: Dict[Any, List[str]], value: Hashable, lead_id: str) -> None:
+        """Remove a lead from under ``value``."""
+        lead_ids = index.get(value) if value else None
+        if not lead_ids:
+            return
+        lead_ids.remove(lead_id)
+        if not lead_ids:
+            del index[value]
+    
     def get_lead(self, lead_id: str) -> Optional[Lead]:
         """Get lead by ID."""
         return self.leads.get(lead_id)
@@ -131,7 +201,11 @@ class LeadsManager:
         
         # Update fields
         for key, value in updates.items():
-            if hasattr(lead, key):
+            if key in _LEAD_FIELDS:
+                index = self._indexes.get(key)
+                if index is not None:
+                    self._index_remove(index, getattr(lead, key), lead_id)
+                    self._index_add(index, value, lead_id)
                 setattr(lead, key, value)
         
         lead.updated_at = datetime.now()
@@ -161,18 +235,17 @@ class LeadsManager:
         Returns:
             List of leads sorted by creation date (newest first)
         """
-        leads = list(self.leads.values())
-        
-        # Apply filters
-        if status:
-            leads = [l for l in leads if l.status == status]
+        # Source filter via index (creation order, like self.leads)
         if source:
-            leads = [l for l in leads if l.source == source]
+            leads = (self.leads[lead_id] for lead_id in self._by_source.get(source, ()))
+        else:
+            leads = iter(self.leads.values())
         
-        # Sort by created_at, newest first
-        leads.sort(key=lambda l: l.created_at, reverse=True)
+        if status:
+            leads = (l for l in leads if l.status == status)
         
-        return leads[:limit]
+        # Newest first; top-k selection instead of sorting every match
+        return heapq.nlargest(limit, leads, key=lambda l: l.created_at)
     
     def update_interaction(self, lead_id: str) -> None:
         """Update last interaction timestamp."""
@@ -190,14 +263,17 @@ class LeadsManager:
             email: Email address
             
         Returns:
-            First matching lead or None
+            First matching lead (by creation order) or None
         """
-        for lead in self.leads.values():
-            if phone and lead.phone == phone:
-                return lead
-            if email and lead.email == email:
-                return lead
-        return None
+        candidates = []
+        if phone and phone in self._by_phone:
+            candidates.append(self._by_phone[phone][0])
+        if email and email in self._by_email:
+            candidates.append(self._by_email[email][0])
+        
+        if not candidates:
+            return None
+        return self.leads[min(candidates, key=self._position.__getitem__)]
 
 
 # Global singleton
@@ -3,22 +3,207 @@ Unified Nutrition API wrapper for multiple data sources.
 Provides consistent nutrient structure across providers with retry logic and pre-confidence.
 """
 
-import os
 import json
 import time
-from typing import Optional, Dict, Any, List, Tuple
+import asyncio
+import copy
+import threading
+import weakref
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from queue import Empty, SimpleQueue
+from typing import Callable, Optional, Dict, Any, List, Tuple
 from datetime import datetime
+from urllib.parse import urlsplit
+from functools import partial
 
 import requests
 from requests.adapters import HTTPAdapter
 from requests.packages.urllib3.util.retry import Retry
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+
 from database.db_manager import get_db_manager
-from app_config.settings import CACHE_ENABLED
+from app_config.settings import (
+    CACHE_ENABLED,
+    CACHE_TTL_SECONDS,
+    EDAMAM_APP_ID,
+    EDAMAM_APP_KEY,
+    NUTRITION_HEDGE_DELAY_SECONDS,
+    NUTRITIONIX_API_KEY,
+    NUTRITIONIX_APP_ID,
+    USDA_API_KEY,
+    WARM_HTTP_POOLS,
+)
 from utils.logging_setup import get_logger
 
 logger = get_logger(__name__)
 
+# (connect, read) timeouts: a dead upstream fails fast so the session retry kicks in
+_REQUEST_TIMEOUT = (2.0, 8.0)
+_VISION_REQUEST_TIMEOUT = (2.0, 13.0)  # image upload + recognition
+
+# Upper bound on waiting for any source (covers the slowest per-request timeout)
+_FETCH_TIMEOUT_SECONDS = 15
+
+# In-process LRU in front of the DB nutrition cache: cache_key -> (expires_at, payload)
+_MEM_CACHE: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+_MEM_CACHE_MAX_ENTRIES = 4096
+_MEM_CACHE_TTL_SECONDS = min(CACHE_TTL_SECONDS, 3600)
+_MEM_CACHE_LOCK = threading.Lock()
+
+# Normalized top-level field -> raw field
+_CORE_FIELDS = (
+    ("calories", "calories"),
+    ("carbs", "carbohydrates"),
+    ("fat", "fat"),
+    ("protein", "protein"),
+    ("sugar", "sugars"),
+)
+
+# Raw field -> provider nutrient key, per provider
+_OFF_KEYS = (
+    ("calories", "energy-kcal_100g"),
+    ("carbohydrates", "carbohydrates_100g"),
+    ("fat", "fat_100g"),
+    ("protein", "proteins_100g"),
+    ("sugars", "sugars_100g"),
+)
+_FOODDATA_KEYS = (
+    ("calories", "Energy"),
+    ("carbohydrates", "Carbohydrate, by difference"),
+    ("fat", "Total lipid (fat)"),
+    ("protein", "Protein"),
+    ("sugars", "Sugars, total"),
+)
+_FOODDATA_NAMES = frozenset(key for _, key in _FOODDATA_KEYS)
+_EDAMAM_KEYS = (
+    ("calories", "ENERC_KCAL"),
+    ("carbohydrates", "CHOCDF"),
+    ("fat", "FAT"),
+    ("protein", "PROCNT"),
+    ("sugars", "SUGAR"),
+)
+_NUTRITIONIX_KEYS = (
+    ("calories", "nf_calories"),
+    ("carbohydrates", "nf_total_carbohydrate"),
+    ("fat", "nf_total_fat"),
+    ("protein", "nf_protein"),
+    ("sugars", "nf_sugars"),
+)
+
+# Source name -> the lookup input it needs
+_SOURCE_INPUTS = {
+    "openfoodfacts": "barcode",
+    "fooddata": "query",
+    "edamam": "query",
+    "edamam_vision": "image",
+    "nutritionix": "query",
+}
+_DEFAULT_SOURCES = ["fooddata", "openfoodfacts", "edamam", "nutritionix"]
+
+# Shared pool for concurrent source lookups (single lookups and batches alike)
+_FETCH_EXECUTOR = ThreadPoolExecutor(max_workers=16, thread_name_prefix="nutrition-fetch")
+
+
+# One aiohttp session per event loop (connectors are loop-bound), with the
+# generator that closes it at loop shutdown; entries go away with their loop
+_AIOHTTP_SESSIONS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Tuple[Any, Any]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+async def _close_at_loop_shutdown(session: "aiohttp.ClientSession"):
+    """
+    Async generator parked on its loop until shutdown.
+    
+    ``asyncio.run`` (and ``loop.shutdown_asyncgens()``) closes every
+    suspended async generator, which runs the ``finally`` and closes the
+    session on its own loop.
+    """
+    try:
+        yield
+    finally:
+        # The entry's session references its loop, so drop it explicitly
+        _AIOHTTP_SESSIONS.pop(asyncio.get_running_loop(), None)
+        await session.close()
+
+
+async def _aiohttp_session() -> "aiohttp.ClientSession":
+    """
+    Return the shared aiohttp session for the running event loop.
+    
+    The session is created on first use in each loop and closed when that
+    loop shuts down its async generators, so no connector is leaked.
+    
+    Returns:
+        ``aiohttp.ClientSession`` with a pooled, DNS-caching connector
+    """
+    loop = asyncio.get_running_loop()
+    entry = _AIOHTTP_SESSIONS.get(loop)
+    if entry is None or entry[0].closed:
+        connector = aiohttp.TCPConnector(limit=100, ttl_dns_cache=300, keepalive_timeout=75)
+        session = aiohttp.ClientSession(connector=connector)
+        closer = _close_at_loop_shutdown(session)
+        await closer.__anext__()  # registers it with the loop's async generators
+        # Holding the generator keeps it from being finalized (and closing
+        # the session) before the loop shuts down
+        entry = _AIOHTTP_SESSIONS[loop] = (session, closer)
+    return entry[0]
+
+
+def _json_body(response: requests.Response) -> Any:
+    """Decode a JSON response body with orjson, falling back to ``response.json()``."""
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.loads(response.content)
+        except orjson.JSONDecodeError:
+            pass  # let requests raise its usual error (or cope with a non-UTF-8 body)
+    return response.json()
+
+
+def _mem_cache_get(cache_key: str) -> Optional[Dict[str, Any]]:
+    """Return a private copy of a live in-memory cache entry, or None."""
+    with _MEM_CACHE_LOCK:
+        entry = _MEM_CACHE.get(cache_key)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            del _MEM_CACHE[cache_key]
+            return None
+        _MEM_CACHE.move_to_end(cache_key)
+        payload = entry[1]
+    return copy.deepcopy(payload)
+
+
+def _mem_cache_put(cache_key: str, payload: Dict[str, Any]) -> None:
+    """Store a copy of a payload in the in-memory cache, evicting the oldest entry when full."""
+    entry = (time.monotonic() + _MEM_CACHE_TTL_SECONDS, copy.deepcopy(payload))
+    with _MEM_CACHE_LOCK:
+        _MEM_CACHE[cache_key] = entry
+        _MEM_CACHE.move_to_end(cache_key)
+        if len(_MEM_CACHE) > _MEM_CACHE_MAX_ENTRIES:
+            _MEM_CACHE.popitem(last=False)
+
+
+def _run_fetch(source: str, fetch: Callable[[], Optional[Dict[str, Any]]]) -> Optional[Dict[str, Any]]:
+    """Call one source fetcher, logging and swallowing its errors."""
+    try:
+        return fetch()
+    except Exception as e:
+        logger.error(f"Error fetching from {source}: {str(e)}")
+        return None
+
 
 def get_pre_confidence(input_type: str) -> float:
     """Get initial confidence score based on input type before API verification.
@@ -37,12 +222,19 @@ def get_pre_confidence(input_type: str) -> float:
     return confidence_map.get(input_type, 0.50)
 
 
-def create_retry_session(max_retries: int = 2, backoff_factor: float = 0.3) -> requests.Session:
+def create_retry_session(
+    max_retries: int = 2,
+    backoff_factor: float = 0.3,
+    pool_connections: int = 20,
+    pool_maxsize: int = 50,
+) -> requests.Session:
     """Create a requests session with retry logic.
     
     Args:
         max_retries: Maximum number of retry attempts
         backoff_factor: Backoff factor for exponential delay
+        pool_connections: Number of per-host connection pools to keep
+        pool_maxsize: Connections kept alive per host (should cover the fetch/batch workers)
     
     Returns:
         Configured requests session
@@ -54,7 +246,12 @@ def create_retry_session(max_retries: int = 2, backoff_factor: float = 0.3) -> r
         status_forcelist=[429, 500, 502, 503, 504],
         allowed_methods=["GET", "POST"]
     )
-    adapter = HTTPAdapter(max_retries=retry_strategy)
+    adapter = HTTPAdapter(
+        max_retries=retry_strategy,
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        pool_block=False,
+    )
     session.mount("http://", adapter)
     session.mount("https://", adapter)
     return session
@@ -68,17 +265,36 @@ class NutritionAPI:
     def __init__(self):
         self.openfoodfacts_url = "https://world.openfoodfacts.org/api/v2/product/{}.json"
         self.fooddata_url = "https://api.nal.usda.gov/fdc/v1/foods/search"
-        self.fooddata_key = os.getenv("USDA_API_KEY")
+        self.fooddata_key = USDA_API_KEY
         self.edamam_url = "https://api.edamam.com/api/food-database/v2/parser"
-        self.edamam_app_id = os.getenv("EDAMAM_APP_ID")
-        self.edamam_app_key = os.getenv("EDAMAM_APP_KEY")
+        self.edamam_app_id = EDAMAM_APP_ID
+        self.edamam_app_key = EDAMAM_APP_KEY
         self.edamam_vision_url = "https://api.edamam.com/api/food-database/v2/vision"
         self.nutritionix_url = "https://trackapi.nutritionix.com/v2/natural/nutrients"
-        self.nutritionix_app_id = os.getenv("NUTRITIONIX_APP_ID")
-        self.nutritionix_api_key = os.getenv("NUTRITIONIX_API_KEY")
+        self.nutritionix_app_id = NUTRITIONIX_APP_ID
+        self.nutritionix_api_key = NUTRITIONIX_API_KEY
         
-        # Create retry-enabled session
+        # Create retry-enabled session (shared by every source so connections are reused)
         self.session = create_retry_session()
+        
+        if WARM_HTTP_POOLS:
+            threading.Thread(target=self._warm_pool, daemon=True, name="nutrition-warmup").start()
+
+    def _warm_pool(self) -> None:
+        """Open a pooled connection (DNS + TLS) to each configured source host; errors are ignored."""
+        urls = [self.openfoodfacts_url]
+        if self.fooddata_key:
+            urls.append(self.fooddata_url)
+        if self.edamam_app_id and self.edamam_app_key:
+            urls.append(self.edamam_url)
+        if self.nutritionix_app_id and self.nutritionix_api_key:
+            urls.append(self.nutritionix_url)
+        for url in urls:
+            parts = urlsplit(url)
+            try:
+                self.session.head(f"{parts.scheme}://{parts.netloc}/", timeout=(2.0, 2.0))
+            except requests.exceptions.RequestException as e:
+                logger.debug(f"Connection warm-up to {parts.netloc} failed: {str(e)}")
 
     def _format_response(
         self,
@@ -86,22 +302,118 @@ class NutritionAPI:
         source: str,
         confidence: float = 0.7,
         source_url: Optional[str] = None,
-        is_cached: bool = False
+        is_cached: bool = False,
+        keymap: Optional[Tuple[Tuple[str, str], ...]] = None,
+        extra: Optional[Dict[str, Any]] = None,
+        timestamp: Optional[str] = None,
     ) -> Dict[str, Any]:
-        """Return a normalized structure for core nutrient values with trust metadata."""
-        return {
+        """
+        Return a normalized structure for core nutrient values with trust metadata.
+        
+        With ``keymap``, ``data`` is the provider's own nutrient dict and the
+        raw payload is read straight out of it, followed by ``extra`` fields.
+        Without it, ``data`` is already the raw payload. Pass ``timestamp``
+        to share one formatted time across many responses.
+        """
+        if keymap is not None:
+            raw = {out: data.get(key) for out, key in keymap}
+            if extra:
+                raw.update(extra)
+        else:
+            raw = data
+        response = {
             "source": source,
             "source_url": source_url,
             "confidence": confidence,
             "is_cached": is_cached,
-            "timestamp": datetime.utcnow().isoformat(),
-            "calories": data.get("calories"),
-            "carbs": data.get("carbohydrates"),
-            "fat": data.get("fat"),
-            "protein": data.get("protein"),
-            "sugar": data.get("sugars"),
-            "raw": data,
+            "timestamp": timestamp or datetime.utcnow().isoformat(),
         }
+        response.update({out: raw.get(field) for out, field in _CORE_FIELDS})
+        response["raw"] = raw
+        return response
+
+    def _parse_openfoodfacts(self, payload: Dict[str, Any], barcode: str) -> Optional[Dict[str, Any]]:
+        """Normalize an Open Food Facts product payload."""
+        product = payload.get("product")
+        if not product:
+            return None
+        nutr = product.get("nutriments", {})
+        url = product.get("url")
+        return self._format_response(
+            nutr,
+            source="openfoodfacts",
+            confidence=0.95,
+            source_url=url,
+            keymap=_OFF_KEYS,
+            extra={
+                "product_name": product.get("product_name"),
+                "brand": product.get("brands"),
+                "barcode": barcode,
+                "source_url": url,
+            },
+        )
+
+    def _parse_fooddata(self, payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Normalize a FoodData Central search payload."""
+        foods = payload.get("foods")
+        if not foods:
+            return None
+        # Only the mapped nutrients; scanned from the end so the last duplicate wins, as before
+        nutrients = {}
+        for n in reversed(foods[0].get("foodNutrients", [])):
+            name = n.get("name")
+            if name in _FOODDATA_NAMES and name not in nutrients:
+                nutrients[name] = n.get("amount")
+                if len(nutrients) == len(_FOODDATA_NAMES):
+                    break
+        return self._format_response(
+            nutrients,
+            source="fooddata",
+            confidence=0.75,
+            keymap=_FOODDATA_KEYS,
+            extra={"product_name": foods[0].get("description")},
+        )
+
+    def _parse_edamam(self, payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Normalize an Edamam food parser payload."""
+        hints = payload.get("hints", [])
+        if not hints:
+            return None
+        food = hints[0].get("food", {})
+        return self._format_response(
+            food.get("nutrients", {}),
+            source="edamam",
+            confidence=0.7,
+            keymap=_EDAMAM_KEYS,
+            extra={"product_name": food.get("label")},
+        )
+
+    def _parse_edamam_vision(self, payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Normalize an Edamam Vision payload."""
+        foods = payload.get("ingredients", [{}])[0].get("parsed", [])
+        if not foods:
+            return None
+        return self._format_response(
+            foods[0].get("nutrients", {}),
+            source="edamam_vision",
+            confidence=0.55,
+            keymap=_EDAMAM_KEYS,
+            extra={"product_name": foods[0].get("food")},
+        )
+
+    def _parse_nutritionix(self, payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Normalize a Nutritionix natural-language payload."""
+        items = payload.get("foods")
+        if not items:
+            return None
+        item = items[0]
+        return self._format_response(
+            item,
+            source="nutritionix",
+            confidence=0.7,
+            keymap=_NUTRITIONIX_KEYS,
+            extra={"product_name": item.get("food_name")},
+        )
 
     def fetch_from_openfoodfacts(self, barcode: str) -> Optional[Dict[str, Any]]:
         """Fetch product data from Open Food Facts by barcode with retry."""
@@ -109,34 +421,18 @@ class NutritionAPI:
         try:
             resp = self.session.get(
                 self.openfoodfacts_url.format(barcode),
-                timeout=10
+                timeout=_REQUEST_TIMEOUT
             )
             duration_ms = (time.time() - start_time) * 1000
             
             if resp.status_code == 200:
-                product = resp.json().get("product")
-                if product:
-                    nutr = product.get("nutriments", {})
+                result = self._parse_openfoodfacts(_json_body(resp), barcode)
+                if result:
                     logger.info(
                         f"OpenFoodFacts API success for barcode {barcode}",
                         extra={'duration_ms': duration_ms}
                     )
-                    return self._format_response(
-                        {
-                            "calories": nutr.get("energy-kcal_100g"),
-                            "carbohydrates": nutr.get("carbohydrates_100g"),
-                            "fat": nutr.get("fat_100g"),
-                            "protein": nutr.get("proteins_100g"),
-                            "sugars": nutr.get("sugars_100g"),
-                            "product_name": product.get("product_name"),
-                            "brand": product.get("brands"),
-                            "barcode": barcode,
-                            "source_url": product.get("url"),
-                        },
-                        source="openfoodfacts",
-                        confidence=0.95,
-                        source_url=product.get("url"),
-                    )
+                    return result
             
             logger.warning(f"OpenFoodFacts API returned status {resp.status_code} for barcode {barcode}")
             return None
@@ -161,29 +457,17 @@ class NutritionAPI:
         params = {"query": query, "api_key": self.fooddata_key, "pageSize": 1}
         
         try:
-            resp = self.session.get(self.fooddata_url, params=params, timeout=10)
+            resp = self.session.get(self.fooddata_url, params=params, timeout=_REQUEST_TIMEOUT)
             duration_ms = (time.time() - start_time) * 1000
             
             if resp.status_code == 200:
-                foods = resp.json().get("foods")
-                if foods:
-                    nutrients = {n.get("name"): n.get("amount") for n in foods[0].get("foodNutrients", [])}
+                result = self._parse_fooddata(_json_body(resp))
+                if result:
                     logger.info(
                         f"FoodData Central API success for query '{query}'",
                         extra={'duration_ms': duration_ms}
                     )
-                    return self._format_response(
-                        {
-                            "calories": nutrients.get("Energy"),
-                            "carbohydrates": nutrients.get("Carbohydrate, by difference"),
-                            "fat": nutrients.get("Total lipid (fat)"),
-                            "protein": nutrients.get("Protein"),
-                            "sugars": nutrients.get("Sugars, total"),
-                            "product_name": foods[0].get("description"),
-                        },
-                        source="fooddata",
-                        confidence=0.75,
-                    )
+                    return result
             
             logger.warning(f"FoodData Central API returned status {resp.status_code} for query '{query}'")
             return None
@@ -204,25 +488,11 @@ class NutritionAPI:
             return None
         params = {"app_id": self.edamam_app_id, "app_key": self.edamam_app_key, "ingr": ingredient}
         try:
-            resp = requests.get(self.edamam_url, params=params, timeout=10)
+            resp = self.session.get(self.edamam_url, params=params, timeout=_REQUEST_TIMEOUT)
         except Exception:
             return None
         if resp.status_code == 200:
-            hints = resp.json().get("hints", [])
-            if hints:
-                nutr = hints[0].get("food", {}).get("nutrients", {})
-                return self._format_response(
-                    {
-                        "calories": nutr.get("ENERC_KCAL"),
-                        "carbohydrates": nutr.get("CHOCDF"),
-                        "fat": nutr.get("FAT"),
-                        "protein": nutr.get("PROCNT"),
-                        "sugars": nutr.get("SUGAR"),
-                        "product_name": hints[0].get("food", {}).get("label"),
-                    },
-                    source="edamam",
-                    confidence=0.7,
-                )
+            return self._parse_edamam(_json_body(resp))
         return None
 
     def fetch_from_edamam_vision(self, image_bytes: bytes) -> Optional[Dict[str, Any]]:
@@ -232,26 +502,11 @@ class NutritionAPI:
         files = {"image": ("capture.jpg", image_bytes, "image/jpeg")}
         params = {"app_id": self.edamam_app_id, "app_key": self.edamam_app_key}
         try:
-            resp = requests.post(self.edamam_vision_url, params=params, files=files, timeout=15)
+            resp = self.session.post(self.edamam_vision_url, params=params, files=files, timeout=_VISION_REQUEST_TIMEOUT)
         except Exception:
             return None
         if resp.status_code == 200:
-            data = resp.json()
-            foods = data.get("ingredients", [{}])[0].get("parsed", [])
-            if foods:
-                nutr = foods[0].get("nutrients", {})
-                return self._format_response(
-                    {
-                        "calories": nutr.get("ENERC_KCAL"),
-                        "carbohydrates": nutr.get("CHOCDF"),
-                        "fat": nutr.get("FAT"),
-                        "protein": nutr.get("PROCNT"),
-                        "sugars": nutr.get("SUGAR"),
-                        "product_name": foods[0].get("food"),
-                    },
-                    source="edamam_vision",
-                    confidence=0.55,
-                )
+            return self._parse_edamam_vision(_json_body(resp))
         return None
 
     def fetch_from_nutritionix(self, query: str) -> Optional[Dict[str, Any]]:
@@ -265,27 +520,91 @@ class NutritionAPI:
         }
         data = {"query": query}
         try:
-            resp = requests.post(self.nutritionix_url, headers=headers, json=data, timeout=10)
+            resp = self.session.post(self.nutritionix_url, headers=headers, json=data, timeout=_REQUEST_TIMEOUT)
         except Exception:
             return None
         if resp.status_code == 200:
-            items = resp.json().get("foods")
-            if items:
-                item = items[0]
-                return self._format_response(
-                    {
-                        "calories": item.get("nf_calories"),
-                        "carbohydrates": item.get("nf_total_carbohydrate"),
-                        "fat": item.get("nf_total_fat"),
-                        "protein": item.get("nf_protein"),
-                        "sugars": item.get("nf_sugars"),
-                        "product_name": item.get("food_name"),
-                    },
-                    source="nutritionix",
-                    confidence=0.7,
-                )
+            return self._parse_nutritionix(_json_body(resp))
         return None
 
+    async def _get_json_async(
+        self,
+        session: "aiohttp.ClientSession",
+        method: str,
+        url: str,
+        timeout: Tuple[float, float] = _REQUEST_TIMEOUT,
+        **kwargs: Any,
+    ) -> Optional[Dict[str, Any]]:
+        """Issue one request on the shared aiohttp session; JSON body on HTTP 200, else None."""
+        async with session.request(
+            method,
+            url,
+            timeout=aiohttp.ClientTimeout(sock_connect=timeout[0], sock_read=timeout[1]),
+            **kwargs,
+        ) as resp:
+            if resp.status != 200:
+                logger.warning(f"{url} returned status {resp.status}")
+                return None
+            body = await resp.read()
+            return orjson.loads(body) if ORJSON_AVAILABLE else json.loads(body)
+
+    async def fetch_from_openfoodfacts_async(
+        self, session: "aiohttp.ClientSession", barcode: str
+    ) -> Optional[Dict[str, Any]]:
+        """Async mirror of ``fetch_from_openfoodfacts``."""
+        payload = await self._get_json_async(session, "GET", self.openfoodfacts_url.format(barcode))
+        return self._parse_openfoodfacts(payload, barcode) if payload else None
+
+    async def fetch_from_fooddata_async(
+        self, session: "aiohttp.ClientSession", query: str
+    ) -> Optional[Dict[str, Any]]:
+        """Async mirror of ``fetch_from_fooddata``."""
+        if not self.fooddata_key:
+            logger.warning("FoodData Central API key not configured")
+            return None
+        params = {"query": query, "api_key": self.fooddata_key, "pageSize": 1}
+        payload = await self._get_json_async(session, "GET", self.fooddata_url, params=params)
+        return self._parse_fooddata(payload) if payload else None
+
+    async def fetch_from_edamam_async(
+        self, session: "aiohttp.ClientSession", ingredient: str
+    ) -> Optional[Dict[str, Any]]:
+        """Async mirror of ``fetch_from_edamam``."""
+        if not (self.edamam_app_id and self.edamam_app_key):
+            return None
+        params = {"app_id": self.edamam_app_id, "app_key": self.edamam_app_key, "ingr": ingredient}
+        payload = await self._get_json_async(session, "GET", self.edamam_url, params=params)
+        return self._parse_edamam(payload) if payload else None
+
+    async def fetch_from_edamam_vision_async(
+        self, session: "aiohttp.ClientSession", image_bytes: bytes
+    ) -> Optional[Dict[str, Any]]:
+        """Async mirror of ``fetch_from_edamam_vision``."""
+        if not (self.edamam_app_id and self.edamam_app_key):
+            return None
+        form = aiohttp.FormData()
+        form.add_field("image", image_bytes, filename="capture.jpg", content_type="image/jpeg")
+        params = {"app_id": self.edamam_app_id, "app_key": self.edamam_app_key}
+        payload = await self._get_json_async(
+            session, "POST", self.edamam_vision_url, timeout=_VISION_REQUEST_TIMEOUT, params=params, data=form
+        )
+        return self._parse_edamam_vision(payload) if payload else None
+
+    async def fetch_from_nutritionix_async(
+        self, session: "aiohttp.ClientSession", query: str
+    ) -> Optional[Dict[str, Any]]:
+        """Async mirror of ``fetch_from_nutritionix``."""
+        if not (self.nutritionix_app_id and self.nutritionix_api_key):
+            return None
+        headers = {
+            "x-app-id": self.nutritionix_app_id,
+            "x-app-key": self.nutritionix_api_key,
+        }
+        payload = await self._get_json_async(
+            session, "POST", self.nutritionix_url, headers=headers, json={"query": query}
+        )
+        return self._parse_nutritionix(payload) if payload else None
+
     def _cache_key(self, barcode: Optional[str], query: Optional[str]) -> Optional[str]:
         if barcode:
             return f"barcode::{barcode}"
@@ -293,6 +612,143 @@ class NutritionAPI:
             return f"query::{query.strip().lower()}"
         return None
 
+    def _applicable_fetchers(
+        self,
+        sources: List[str],
+        barcode: Optional[str],
+        query: Optional[str],
+        image_bytes: Optional[bytes],
+    ) -> List[Tuple[str, Callable[[], Optional[Dict[str, Any]]]]]:
+        """(source, fetch) pairs for the sources that can serve these inputs, in priority order."""
+        return [
+            (source, partial(getattr(self, f"fetch_from_{source}"), arg))
+            for source, arg in self._applicable_sources(sources, barcode, query, image_bytes)
+        ]
+
+    def _applicable_sources(
+        self,
+        sources: List[str],
+        barcode: Optional[str],
+        query: Optional[str],
+        image_bytes: Optional[bytes],
+    ) -> List[Tuple[str, Any]]:
+        """(source, argument) pairs for the sources that can serve these inputs, in priority order."""
+        inputs = {"barcode": barcode, "query": query, "image": image_bytes}
+        return [
+            (source, inputs[_SOURCE_INPUTS[source]])
+            for source in sources
+            if source in _SOURCE_INPUTS and inputs[_SOURCE_INPUTS[source]]
+        ]
+
+    def _fetch_hedged(
+        self,
+        fetchers: List[Tuple[str, Callable[[], Optional[Dict[str, Any]]]]],
+    ) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """
+        Query sources in priority order as hedged requests and return (source, result).
+        
+        The top-ranked source is submitted first. The next one is submitted
+        only once the running sources have all come back empty or failed or,
+        when hedging is enabled (``NUTRITION_HEDGE_DELAY_SECONDS`` > 0), once
+        nothing has answered within that delay; the first result found wins.
+        """
+        if len(fetchers) == 1:
+            source, fetch = fetchers[0]
+            result = _run_fetch(source, fetch)
+            return (source, result) if result else None
+        return self._fetch_hedged_many([fetchers])[0]
+
+    def _fetch_hedged_many(
+        self,
+        lookups: List[List[Tuple[str, Callable[[], Optional[Dict[str, Any]]]]]],
+    ) -> List[Optional[Tuple[str, Dict[str, Any]]]]:
+        """
+        Run ``_fetch_hedged`` for many items at once on the shared fetch executor.
+        
+        Each item's hedge delay and ``_FETCH_TIMEOUT_SECONDS`` deadline count
+        from when its fetches start running, so time spent queued behind
+        other items' fetches never turns into a timeout.
+        
+        Args:
+            lookups: Per item, the (source, fetch) pairs in priority order
+            
+        Returns:
+            Per item, (source, result) for the first result found, or None
+        """
+        found: List[Optional[Tuple[str, Dict[str, Any]]]] = [None] * len(lookups)
+        queues = [list(fetchers) for fetchers in lookups]
+        running: Dict[int, Dict[int, Future]] = {i: {} for i in range(len(lookups))}
+        fetch_items: Dict[int, Tuple[int, str]] = {}
+        hedge_at: Dict[int, float] = {}
+        deadlines: Dict[int, float] = {}
+        events: "SimpleQueue[Tuple[int, float, bool, Optional[Dict[str, Any]]]]" = SimpleQueue()
+        hedging = NUTRITION_HEDGE_DELAY_SECONDS > 0
+        
+        def run(token: int, source: str, fetch: Callable[[], Optional[Dict[str, Any]]]) -> None:
+            events.put((token, time.monotonic(), False, None))
+            events.put((token, time.monotonic(), True, _run_fetch(source, fetch)))
+        
+        def launch(i: int) -> None:
+            source, fetch = queues[i].pop(0)
+            token = len(fetch_items)
+            fetch_items[token] = (i, source)
+            running[i][token] = _FETCH_EXECUTOR.submit(run, token, source, fetch)
+            hedge_at.pop(i, None)
+        
+        def finish(i: int) -> None:
+            for future in running.pop(i).values():
+                future.cancel()
+        
+        for i in list(running):
+            if queues[i]:
+                launch(i)
+            else:
+                finish(i)
+        
+        while running:
+            now = time.monotonic()
+            timers = []
+            for i in list(running):
+                if i in deadlines and now >= deadlines[i]:
+                    finish(i)
+                    continue
+                if hedging and queues[i] and i in hedge_at:
+                    if now >= hedge_at[i]:
+                        # Preferred source is slow: hedge with the next one
+                        launch(i)
+                    else:
+                        timers.append(hedge_at[i])
+                if i in deadlines:
+                    timers.append(deadlines[i])
+            if not running:
+                break
+            
+            try:
+                token, at, finished, result = events.get(
+                    timeout=max(min(timers) - now, 0) if timers else None
+                )
+            except Empty:
+                continue
+            i, source = fetch_items[token]
+            if i not in running:
+                continue
+            if not finished:
+                deadlines.setdefault(i, at + _FETCH_TIMEOUT_SECONDS)
+                if hedging and token == max(running[i]):
+                    hedge_at[i] = at + NUTRITION_HEDGE_DELAY_SECONDS
+                continue
+            
+            del running[i][token]
+            if result:
+                found[i] = (source, result)
+                finish(i)
+            elif not running[i]:
+                if queues[i]:
+                    launch(i)
+                else:
+                    finish(i)
+        return found
+
     def get_nutrition(
         self,
         barcode: Optional[str] = None,
@@ -301,55 +757,229 @@ class NutritionAPI:
         image_bytes: Optional[bytes] = None,
     ) -> Dict[str, Any]:
         """
-        Try sources in preferred order; returns first successful result or an empty payload.
+        Query sources in priority order (see ``_fetch_hedged``); returns the first result or an empty payload.
         Includes cache lookup and write-through with metadata.
         """
         cache_key = self._cache_key(barcode, query)
-        db = get_db_manager()
 
         # Check cache first
-        if CACHE_ENABLED and cache_key:
-            cached = db.get_cached_nutrition(cache_key)
-            if cached:
-                cached["is_cached"] = True
-                cached["cached"] = True  # Backward compatibility
-                logger.info(f"Cache hit for {cache_key}")
-                return cached
+        cached = self._lookup_cache(cache_key)
+        if cached:
+            return cached
 
         # Attempt API calls
-        sources = preferred_sources or ["fooddata", "openfoodfacts", "edamam", "nutritionix"]
+        sources = preferred_sources or _DEFAULT_SOURCES
+        fetchers = self._applicable_fetchers(sources, barcode, query, image_bytes)
+        
+        found = self._fetch_hedged(fetchers)
+        if found:
+            return self._store_result(cache_key, *found)
+        return self._empty_result(barcode, query)
+
+    def get_nutrition_batch(
+        self,
+        items: List[Dict[str, Any]],
+        preferred_sources: Optional[List[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Look up many items at once.
+        
+        Cache hits for every item are read with one DB query, then the
+        distinct misses run the usual hedged source lookups together on the
+        shared fetch executor, and fresh results are written back in one
+        transaction.
         
-        for source in sources:
-            result = None
+        Args:
+            items: Dicts with optional "barcode", "query" and "image_bytes" keys
+            preferred_sources: Source names in priority order (applies to every item)
+            
+        Returns:
+            One payload per item, in input order (empty payload where nothing matched)
+        """
+        keys = [self._cache_key(item.get("barcode"), item.get("query")) for item in items]
+        results: List[Optional[Dict[str, Any]]] = [None] * len(items)
+        
+        if CACHE_ENABLED:
+            db_keys = []
+            for i, key in enumerate(keys):
+                if key:
+                    results[i] = _mem_cache_get(key)
+                    if results[i] is None:
+                        db_keys.append(key)
+            if db_keys:
+                cached = get_db_manager().get_cached_nutrition_batch(list(dict.fromkeys(db_keys)))
+                for key, payload in cached.items():
+                    _mem_cache_put(key, payload)
+                for i, key in enumerate(keys):
+                    if results[i] is None and key in cached:
+                        results[i] = copy.deepcopy(cached[key])
+            for result in results:
+                if result is not None:
+                    result["is_cached"] = True
+                    result["cached"] = True  # Backward compatibility
+        
+        # Items sharing a cache key are fetched once
+        misses: Dict[Any, List[int]] = {}
+        for i, key in enumerate(keys):
+            if results[i] is None:
+                misses.setdefault(key or ("uncached", i), []).append(i)
+        
+        sources = preferred_sources or _DEFAULT_SOURCES
+        fresh: List[Tuple[str, Dict[str, Any]]] = []
+        if misses:
+            timestamp = datetime.utcnow().isoformat()
+            lookups = []
+            for positions in misses.values():
+                item = items[positions[0]]
+                lookups.append(self._applicable_fetchers(
+                    sources, item.get("barcode"), item.get("query"), item.get("image_bytes")
+                ))
+            for (key, positions), found in zip(misses.items(), self._fetch_hedged_many(lookups), strict=True):
+                if not found:
+                    item = items[positions[0]]
+                    for i in positions:
+                        results[i] = self._empty_result(item.get("barcode"), item.get("query"), timestamp)
+                    continue
+                result = found[1]
+                result["is_cached"] = False
+                if isinstance(key, str):
+                    fresh.append((key, result))
+                results[positions[0]] = result
+                for i in positions[1:]:
+                    results[i] = copy.deepcopy(result)
+        
+        if fresh and CACHE_ENABLED:
+            get_db_manager().save_nutrition_cache_batch(fresh)
+            for key, result in fresh:
+                _mem_cache_put(key, result)
+            logger.info(f"Cached {len(fresh)} batch results")
+        return results
+
+    async def get_nutrition_async(
+        self,
+        barcode: Optional[str] = None,
+        query: Optional[str] = None,
+        preferred_sources: Optional[List[str]] = None,
+        image_bytes: Optional[bytes] = None,
+    ) -> Dict[str, Any]:
+        """
+        Async variant of ``get_nutrition`` for callers already on an event loop.
+        
+        Sources share one pooled aiohttp session per loop and are tried in
+        priority order with the same hedging rules as ``_fetch_hedged``.
+        
+        Args:
+            barcode: Product barcode
+            query: Free-text food name
+            preferred_sources: Source names in priority order
+            image_bytes: Image for the Edamam Vision source
+            
+        Returns:
+            Normalized nutrition payload, or an empty payload if nothing matched
+        """
+        if not AIOHTTP_AVAILABLE:
+            raise RuntimeError("aiohttp is required for get_nutrition_async")
+        
+        cache_key = self._cache_key(barcode, query)
+        # Cache reads and writes may hit SQLite, so keep them off the event loop
+        cached = await asyncio.to_thread(self._lookup_cache, cache_key)
+        if cached:
+            return cached
+        
+        session = await _aiohttp_session()
+        sources = preferred_sources or _DEFAULT_SOURCES
+        fetchers = [
+            (source, getattr(self, f"fetch_from_{source}_async"), arg)
+            for source, arg in self._applicable_sources(sources, barcode, query, image_bytes)
+        ]
+        if not fetchers:
+            return self._empty_result(barcode, query)
+        
+        async def run(source, fetch, arg):
             try:
-                if source == "openfoodfacts" and barcode:
-                    result = self.fetch_from_openfoodfacts(barcode)
-                elif source == "fooddata" and query:
-                    result = self.fetch_from_fooddata(query)
-                elif source == "edamam" and query:
-                    result = self.fetch_from_edamam(query)
-                elif source == "edamam_vision" and image_bytes:
-                    result = self.fetch_from_edamam_vision(image_bytes)
-                elif source == "nutritionix" and query:
-                    result = self.fetch_from_nutritionix(query)
-                    
-                if result:
-                    result["is_cached"] = False
-                    if cache_key and CACHE_ENABLED:
-                        db.save_nutrition_cache(cache_key, result)
-                        logger.info(f"Cached result for {cache_key} from {source}")
-                    return result
-                    
+                return await fetch(session, arg)
             except Exception as e:
                 logger.error(f"Error fetching from {source}: {str(e)}")
-                continue
+                return None
         
-        # No results found
+        queue = list(fetchers)
+        running: Dict[asyncio.Task, str] = {}
+        
+        def launch() -> None:
+            source, fetch, arg = queue.pop(0)
+            running[asyncio.create_task(run(source, fetch, arg))] = source
+        
+        try:
+            while queue or running:
+                if not running:
+                    launch()
+                done, _ = await asyncio.wait(
+                    running,
+                    timeout=NUTRITION_HEDGE_DELAY_SECONDS if queue and NUTRITION_HEDGE_DELAY_SECONDS > 0 else None,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                if not done:
+                    # Preferred source is slow: hedge with the next one
+                    launch()
+                    continue
+                for task in done:
+                    source = running.pop(task)
+                    result = task.result()
+                    if result:
+                        return await asyncio.to_thread(self._store_result, cache_key, source, result)
+            return self._empty_result(barcode, query)
+        finally:
+            for task in running:
+                task.cancel()
+
+    def _lookup_cache(self, cache_key: Optional[str]) -> Optional[Dict[str, Any]]:
+        """Return the cached payload for a key (flagged as cached), or None."""
+        if not (CACHE_ENABLED and cache_key):
+            return None
+        cached = _mem_cache_get(cache_key)
+        if cached is None:
+            cached = get_db_manager().get_cached_nutrition(cache_key)
+            if cached:
+                _mem_cache_put(cache_key, cached)
+        if cached:
+            cached["is_cached"] = True
+            cached["cached"] = True  # Backward compatibility
+            logger.info(f"Cache hit for {cache_key}")
+        return cached
+
+    def _store_result(self, cache_key: Optional[str], source: str, result: Dict[str, Any]) -> Dict[str, Any]:
+        """Mark a fresh API result and write it through to the cache."""
+        result["is_cached"] = False
+        if cache_key and CACHE_ENABLED:
+            get_db_manager().save_nutrition_cache(cache_key, result)
+            _mem_cache_put(cache_key, result)
+            logger.info(f"Cached result for {cache_key} from {source}")
+        return result
+
+    def _empty_result(
+        self,
+        barcode: Optional[str],
+        query: Optional[str],
+        timestamp: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Payload returned when no source produced data."""
         logger.warning(f"No nutrition data found for barcode={barcode} query={query}")
         return {
             "source": None,
             "confidence": 0.0,
             "is_cached": False,
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": timestamp or datetime.utcnow().isoformat(),
             "raw": None
         }
+
+
+# Global singleton
+_nutrition_api: Optional[NutritionAPI] = None
+
+
+def get_nutrition_api() -> NutritionAPI:
+    """Get or create the shared nutrition client (one session and connection pool per process)."""
+    global _nutrition_api
+    if _nutrition_api is None:
+        _nutrition_api = NutritionAPI()
+    return _nutrition_api
@@ -4,18 +4,194 @@ Handles OAuth 2.0 flows for social authentication.
 """
 
 import jwt
+import logging
+import re
 import time
-import json
+import threading
 import requests
+from cryptography.hazmat.primitives import serialization
+from functools import lru_cache
+from requests.adapters import HTTPAdapter
 from typing import Dict, Any, Optional, Tuple
 from datetime import datetime, timedelta
-from urllib.parse import urlencode
+from urllib.parse import quote_plus, urlencode
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 from app_config.settings import (
     GOOGLE_CLIENT_ID, GOOGLE_CLIENT_SECRET, GOOGLE_REDIRECT_URI,
-    APPLE_CLIENT_ID, APPLE_TEAM_ID, APPLE_KEY_ID, APPLE_PRIVATE_KEY, APPLE_REDIRECT_URI
+    APPLE_CLIENT_ID, APPLE_TEAM_ID, APPLE_KEY_ID, APPLE_PRIVATE_KEY, APPLE_REDIRECT_URI,
+    WARM_HTTP_POOLS,
 )
 
+logger = logging.getLogger(__name__)
+
+
+def _json_body(response: requests.Response) -> Any:
+    """Decode a JSON response body with orjson, falling back to ``response.json()``."""
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.loads(response.content)
+        except orjson.JSONDecodeError:
+            pass  # let requests raise its usual error (or cope with a non-UTF-8 body)
+    return response.json()
+
+
+def _create_session() -> requests.Session:
+    """Pooled session so token, JWKS and userinfo calls reuse TLS connections."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=10, pool_maxsize=20)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+# Shared by all providers (no retries: authorization codes are single-use)
+_SESSION = _create_session()
+
+GOOGLE_JWKS_URL = "https://www.googleapis.com/oauth2/v3/certs"
+APPLE_JWKS_URL = "https://appleid.apple.com/auth/keys"
+
+# Used when the JWKS response has no Cache-Control max-age
+_DEFAULT_JWKS_MAX_AGE = 3600
+_MAX_AGE_RE = re.compile(r"max-age=(\d+)")
+
+# url -> (expires_at, etag, jwks); url -> {kid: key object}
+_JWKS_CACHE: Dict[str, Tuple[float, Optional[str], Dict[str, Any]]] = {}
+_KEY_CACHE: Dict[str, Dict[str, Any]] = {}
+_JWKS_LOCK = threading.Lock()
+
+# An unknown kid forces a JWKS refetch (key rotation) at most this often per URL
+_JWKS_FORCED_REFRESH_INTERVAL = 60
+_JWKS_FORCED_AT: Dict[str, float] = {}
+
+
+def _get_jwks(url: str, force: bool = False) -> Dict[str, Any]:
+    """
+    Fetch a provider's JWKS, cached for the response's max-age.
+    
+    Expired entries are revalidated with If-None-Match, so an unchanged key
+    set costs a 304. Whenever the key set changes, every key in it is
+    converted once and indexed by ``kid``.
+    
+    Args:
+        url: JWKS URL
+        force: Revalidate even if the cached copy has not expired
+    """
+    now = time.time()
+    with _JWKS_LOCK:
+        cached = _JWKS_CACHE.get(url)
+    if cached and now < cached[0] and not force:
+        return cached[2]
+    
+    headers = {"If-None-Match": cached[1]} if cached and cached[1] else {}
+    response = _SESSION.get(url, headers=headers, timeout=5)
+    
+    if cached and response.status_code == 304:
+        jwks = cached[2]
+    else:
+        response.raise_for_status()
+        jwks = _json_body(response)
+    
+    match = _MAX_AGE_RE.search(response.headers.get("Cache-Control", ""))
+    max_age = int(match.group(1)) if match else _DEFAULT_JWKS_MAX_AGE
+    etag = response.headers.get("ETag") or (cached[1] if cached else None)
+    
+    keys = _index_jwks(jwks) if cached is None or jwks != cached[2] else None
+    with _JWKS_LOCK:
+        if keys is not None:
+            _KEY_CACHE[url] = keys
+        _JWKS_CACHE[url] = (now + max_age, etag, jwks)
+    return jwks
+
+
+def _index_jwks(jwks: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert every RSA key in a JWKS into a ``{kid: key}`` map."""
+    keys = {}
+    for jwk in jwks.get("keys", []):
+        try:
+            keys[jwk["kid"]] = jwt.algorithms.RSAAlgorithm.from_jwk(jwk)
+        except (KeyError, jwt.InvalidKeyError) as e:
+            logger.warning("Skipping unusable JWKS key: %s", e)
+    return keys
+
+
+# ID token decoder with its validation options merged once, shared by both providers
+_ID_TOKEN_ALGORITHMS = ["RS256"]
+_ID_TOKEN_DECODER = jwt.PyJWT(options={"require": ["exp", "iat", "aud", "iss"]})
+
+# Apple client_secret JWTs: (team_id, key_id, client_id, private_key) -> (jwt, exp)
+_APPLE_SECRET_LIFETIME = 86400 * 180  # 6 months, Apple's maximum
+_APPLE_SECRET_REFRESH_MARGIN = 3600
+_APPLE_SECRET_CACHE: Dict[Tuple[str, str, str, str], Tuple[str, int]] = {}
+
+
+@lru_cache(maxsize=4)
+def _load_private_key(pem: str) -> Any:
+    """Parse a PEM private key once; ``jwt.encode`` accepts the key object directly."""
+    return serialization.load_pem_private_key(pem.encode(), password=None)
+
+
+# JWKS URLs whose provider has already been warmed up in this process
+_WARMED: set = set()
+
+
+def _warm_provider(jwks_url: str, token_endpoint: str) -> None:
+    """
+    Prefetch a provider's JWKS and open a connection to its token host.
+    
+    Runs once per provider per process, in a background thread, so the
+    first sign-in skips DNS, the TLS handshake and the key download.
+    """
+    if not WARM_HTTP_POOLS:
+        return
+    with _JWKS_LOCK:
+        if jwks_url in _WARMED:
+            return
+        _WARMED.add(jwks_url)
+    
+    def warm() -> None:
+        try:
+            _get_jwks(jwks_url)
+            _SESSION.head(token_endpoint, timeout=5)
+        except Exception as e:
+            logger.debug("OAuth warm-up for %s failed: %s", jwks_url, e)
+    
+    threading.Thread(target=warm, daemon=True, name="oauth-warmup").start()
+
+
+@lru_cache(maxsize=8)
+def _encode_static_params(params: Tuple[Tuple[str, str], ...]) -> str:
+    """urlencode the fixed part of an authorization URL once per configuration."""
+    return urlencode(params)
+
+
+def _get_signing_key(url: str, kid: str) -> Optional[Any]:
+    """
+    Public key for ``kid`` from the provider's current JWKS (None if absent).
+    
+    An unknown ``kid`` usually means the provider rotated its keys, so the
+    JWKS is refetched ahead of its max-age, at most once per
+    ``_JWKS_FORCED_REFRESH_INTERVAL`` seconds per URL.
+    """
+    _get_jwks(url)
+    key = _KEY_CACHE.get(url, {}).get(kid)
+    if key is not None:
+        return key
+    
+    now = time.time()
+    with _JWKS_LOCK:
+        if now - _JWKS_FORCED_AT.get(url, float("-inf")) < _JWKS_FORCED_REFRESH_INTERVAL:
+            return None
+        _JWKS_FORCED_AT[url] = now
+    logger.info("Unknown JWKS kid %s for %s, refreshing keys", kid, url)
+    _get_jwks(url, force=True)
+    return _KEY_CACHE.get(url, {}).get(kid)
+
 
 class OAuthProvider:
     """Base OAuth provider class."""
@@ -45,6 +221,9 @@ class GoogleOAuthProvider(OAuthProvider):
         self.client_id = GOOGLE_CLIENT_ID
         self.client_secret = GOOGLE_CLIENT_SECRET
         self.redirect_uri = GOOGLE_REDIRECT_URI
+        
+        if self.client_id:
+            _warm_provider(GOOGLE_JWKS_URL, self.TOKEN_ENDPOINT)
     
     def get_authorization_url(self, state: str = None) -> str:
         """
@@ -56,19 +235,19 @@ class GoogleOAuthProvider(OAuthProvider):
         Returns:
             Authorization URL string
         """
-        params = {
-            "client_id": self.client_id,
-            "redirect_uri": self.redirect_uri,
-            "response_type": "code",
-            "scope": " ".join(self.SCOPES),
-            "access_type": "offline",
-            "prompt": "consent",
-        }
+        query = _encode_static_params((
+            ("client_id", self.client_id),
+            ("redirect_uri", self.redirect_uri),
+            ("response_type", "code"),
+            ("scope", " ".join(self.SCOPES)),
+            ("access_type", "offline"),
+            ("prompt", "consent"),
+        ))
         
         if state:
-            params["state"] = state
+            query = f"{query}&state={quote_plus(state)}"
         
-        return f"{self.AUTHORIZATION_ENDPOINT}?{urlencode(params)}"
+        return f"{self.AUTHORIZATION_ENDPOINT}?{query}"
     
     def exchange_code_for_token(self, code: str) -> Optional[Dict[str, Any]]:
         """
@@ -89,12 +268,12 @@ class GoogleOAuthProvider(OAuthProvider):
                 "grant_type": "authorization_code",
             }
             
-            response = requests.post(self.TOKEN_ENDPOINT, data=payload, timeout=10)
+            response = _SESSION.post(self.TOKEN_ENDPOINT, data=payload, timeout=10)
             response.raise_for_status()
             
-            return response.json()
+            return _json_body(response)
         except requests.RequestException as e:
-            print(f"❌ Google token exchange error: {e}")
+            logger.error("Google token exchange error: %s", e)
             return None
     
     def verify_id_token(self, id_token: str) -> Optional[Dict[str, Any]]:
@@ -108,33 +287,21 @@ class GoogleOAuthProvider(OAuthProvider):
             Decoded token payload
         """
         try:
-            # Get Google's public keys
-            keys_response = requests.get(
-                "https://www.googleapis.com/oauth2/v3/certs",
-                timeout=5
-            )
-            keys_response.raise_for_status()
-            jwks = keys_response.json()
-            
             # Decode without verification first to get header
             unverified_header = jwt.get_unverified_header(id_token)
             
-            # Find matching key
-            key = None
-            for jwk in jwks.get("keys", []):
-                if jwk["kid"] == unverified_header["kid"]:
-                    key = jwt.algorithms.RSAAlgorithm.from_jwk(json.dumps(jwk))
-                    break
+            # Find matching key among Google's (cached) public keys
+            key = _get_signing_key(GOOGLE_JWKS_URL, unverified_header["kid"])
             
             if not key:
-                print("❌ No matching key found for ID token")
+                logger.error("No matching key found for ID token")
                 return None
             
             # Verify and decode
-            payload = jwt.decode(
+            payload = _ID_TOKEN_DECODER.decode(
                 id_token,
                 key=key,
-                algorithms=["RS256"],
+                algorithms=_ID_TOKEN_ALGORITHMS,
                 audience=self.client_id,
                 issuer="https://accounts.google.com"
             )
@@ -142,10 +309,10 @@ class GoogleOAuthProvider(OAuthProvider):
             return payload
             
         except jwt.InvalidTokenError as e:
-            print(f"❌ Invalid Google ID token: {e}")
+            logger.error("Invalid Google ID token: %s", e)
             return None
         except Exception as e:
-            print(f"❌ ID token verification error: {e}")
+            logger.error("ID token verification error: %s", e)
             return None
     
     def get_user_info(self, token_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
@@ -175,10 +342,10 @@ class GoogleOAuthProvider(OAuthProvider):
             # Fallback: use access token to fetch user info
             if "access_token" in token_data:
                 headers = {"Authorization": f"Bearer {token_data['access_token']}"}
-                response = requests.get(self.USERINFO_ENDPOINT, headers=headers, timeout=10)
+                response = _SESSION.get(self.USERINFO_ENDPOINT, headers=headers, timeout=10)
                 response.raise_for_status()
                 
-                data = response.json()
+                data = _json_body(response)
                 return {
                     "user_id": data.get("id"),
                     "email": data.get("email"),
@@ -191,7 +358,7 @@ class GoogleOAuthProvider(OAuthProvider):
             return None
             
         except Exception as e:
-            print(f"❌ Failed to get Google user info: {e}")
+            logger.error("Failed to get Google user info: %s", e)
             return None
 
 
@@ -208,23 +375,47 @@ class AppleOAuthProvider(OAuthProvider):
         self.key_id = APPLE_KEY_ID
         self.private_key = APPLE_PRIVATE_KEY
         self.redirect_uri = APPLE_REDIRECT_URI
+        
+        missing = [
+            name for name, value in (
+                ("APPLE_CLIENT_ID", self.client_id),
+                ("APPLE_TEAM_ID", self.team_id),
+                ("APPLE_KEY_ID", self.key_id),
+                ("APPLE_PRIVATE_KEY", self.private_key),
+            )
+            if not value
+        ]
+        if missing:
+            raise ValueError(f"Apple Sign In is not configured (missing {', '.join(missing)})")
+        
+        # Parsed once per key (cached), so a malformed key also fails here
+        self._signing_key = _load_private_key(self.private_key)
+        _warm_provider(APPLE_JWKS_URL, self.TOKEN_ENDPOINT)
     
     def _generate_client_secret(self) -> str:
         """
         Generate client_secret JWT for Apple.
         Apple requires a JWT signed with your private key.
+        
+        The signed secret is reused until an hour before it expires, so
+        token exchanges don't re-sign every time.
         """
         now = int(time.time())
+        cache_key = (self.team_id, self.key_id, self.client_id, self.private_key)
+        cached = _APPLE_SECRET_CACHE.get(cache_key)
+        if cached and now < cached[1] - _APPLE_SECRET_REFRESH_MARGIN:
+            return cached[0]
         
         headers = {
             "alg": "ES256",
             "kid": self.key_id,
         }
         
+        exp = now + _APPLE_SECRET_LIFETIME
         payload = {
             "iss": self.team_id,
             "iat": now,
-            "exp": now + 86400 * 180,  # 6 months
+            "exp": exp,
             "aud": "https://appleid.apple.com",
             "sub": self.client_id,
         }
@@ -232,11 +423,12 @@ class AppleOAuthProvider(OAuthProvider):
         # Sign with ES256 (ECDSA with SHA-256)
         client_secret = jwt.encode(
             payload,
-            self.private_key,
+            self._signing_key,
             algorithm="ES256",
             headers=headers
         )
         
+        _APPLE_SECRET_CACHE[cache_key] = (client_secret, exp)
         return client_secret
     
     def get_authorization_url(self, state: str = None) -> str:
@@ -249,18 +441,18 @@ class AppleOAuthProvider(OAuthProvider):
         Returns:
             Authorization URL string
         """
-        params = {
-            "client_id": self.client_id,
-            "redirect_uri": self.redirect_uri,
-            "response_type": "code",
-            "response_mode": "form_post",  # Apple recommends form_post
-            "scope": " ".join(self.SCOPES),
-        }
+        query = _encode_static_params((
+            ("client_id", self.client_id),
+            ("redirect_uri", self.redirect_uri),
+            ("response_type", "code"),
+            ("response_mode", "form_post"),  # Apple recommends form_post
+            ("scope", " ".join(self.SCOPES)),
+        ))
         
         if state:
-            params["state"] = state
+            query = f"{query}&state={quote_plus(state)}"
         
-        return f"{self.AUTHORIZATION_ENDPOINT}?{urlencode(params)}"
+        return f"{self.AUTHORIZATION_ENDPOINT}?{query}"
     
     def exchange_code_for_token(self, code: str) -> Optional[Dict[str, Any]]:
         """
@@ -283,12 +475,12 @@ class AppleOAuthProvider(OAuthProvider):
                 "grant_type": "authorization_code",
             }
             
-            response = requests.post(self.TOKEN_ENDPOINT, data=payload, timeout=10)
+            response = _SESSION.post(self.TOKEN_ENDPOINT, data=payload, timeout=10)
             response.raise_for_status()
             
-            return response.json()
+            return _json_body(response)
         except requests.RequestException as e:
-            print(f"❌ Apple token exchange error: {e}")
+            logger.error("Apple token exchange error: %s", e)
             return None
     
     def verify_id_token(self, id_token: str) -> Optional[Dict[str, Any]]:
@@ -302,33 +494,21 @@ class AppleOAuthProvider(OAuthProvider):
             Decoded token payload
         """
         try:
-            # Get Apple's public keys
-            keys_response = requests.get(
-                "https://appleid.apple.com/auth/keys",
-                timeout=5
-            )
-            keys_response.raise_for_status()
-            jwks = keys_response.json()
-            
             # Decode without verification first to get header
             unverified_header = jwt.get_unverified_header(id_token)
             
-            # Find matching key
-            key = None
-            for jwk in jwks.get("keys", []):
-                if jwk["kid"] == unverified_header["kid"]:
-                    key = jwt.algorithms.RSAAlgorithm.from_jwk(json.dumps(jwk))
-                    break
+            # Find matching key among Apple's (cached) public keys
+            key = _get_signing_key(APPLE_JWKS_URL, unverified_header["kid"])
             
             if not key:
-                print("❌ No matching key found for Apple ID token")
+                logger.error("No matching key found for Apple ID token")
                 return None
             
             # Verify and decode
-            payload = jwt.decode(
+            payload = _ID_TOKEN_DECODER.decode(
                 id_token,
                 key=key,
-                algorithms=["RS256"],
+                algorithms=_ID_TOKEN_ALGORITHMS,
                 audience=self.client_id,
                 issuer="https://appleid.apple.com"
             )
@@ -336,10 +516,10 @@ class AppleOAuthProvider(OAuthProvider):
             return payload
             
         except jwt.InvalidTokenError as e:
-            print(f"❌ Invalid Apple ID token: {e}")
+            logger.error("Invalid Apple ID token: %s", e)
             return None
         except Exception as e:
-            print(f"❌ Apple ID token verification error: {e}")
+            logger.error("Apple ID token verification error: %s", e)
             return None
     
     def get_user_info(self, token_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
@@ -357,7 +537,7 @@ class AppleOAuthProvider(OAuthProvider):
         """
         try:
             if "id_token" not in token_data:
-                print("❌ No ID token in Apple response")
+                logger.error("No ID token in Apple response")
                 return None
             
             user_info = self.verify_id_token(token_data["id_token"])
@@ -379,7 +559,7 @@ class AppleOAuthProvider(OAuthProvider):
             return result
             
         except Exception as e:
-            print(f"❌ Failed to get Apple user info: {e}")
+            logger.error("Failed to get Apple user info: %s", e)
             return None
 
 
@@ -402,11 +582,11 @@ def get_oauth_provider(provider_name: str) -> Optional[OAuthProvider]:
     
     provider_class = providers.get(provider_name.lower())
     if not provider_class:
-        print(f"❌ Unknown OAuth provider: {provider_name}")
+        logger.error("Unknown OAuth provider: %s", provider_name)
         return None
     
     try:
         return provider_class()
     except Exception as e:
-        print(f"❌ Failed to initialize {provider_name} provider: {e}")
+        logger.warning("Failed to initialize %s provider: %s", provider_name, e)
         return None
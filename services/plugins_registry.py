@@ -5,14 +5,29 @@ Manages plugin registration, discovery, and routing of messages to appropriate
 plugins based on platform and message content.
 """
 
+import hashlib
+import importlib
+import inspect
+import json
 import logging
-from typing import List, Optional, Dict, Any
+from pathlib import Path
+from typing import List, Optional, Dict, Any, ValuesView
 from plugins._base import Plugin
 
 logger = logging.getLogger(__name__)
 
-# Global plugin registry
-_plugins: List[Plugin] = []
+# Built-in plugin packages (plugins/<package>/plugin.py)
+PLUGINS_DIR = Path(__file__).resolve().parent.parent / "plugins"
+
+# Discovery results, keyed by a hash of the plugin sources
+DISCOVERY_CACHE_DIR = Path.home() / ".cache" / "socialops"
+
+# Global plugin registry: name -> plugin (registration order), platform -> plugins
+_by_name: Dict[str, Plugin] = {}
+_by_platform: Dict[str, List[Plugin]] = {}
+
+# Discovered but not yet imported plugins: name -> cached discovery entry
+_pending: Dict[str, Dict[str, Any]] = {}
 
 
 def register_plugin(plugin: Plugin) -> None:
@@ -22,19 +37,20 @@ def register_plugin(plugin: Plugin) -> None:
     Args:
         plugin: Plugin instance implementing the Plugin interface
     """
-    global _plugins
-    
     if not isinstance(plugin, Plugin):
         raise TypeError(f"Plugin must implement Plugin interface, got {type(plugin)}")
     
     # Check for duplicate names
-    for existing in _plugins:
-        if existing.name == plugin.name:
-            logger.warning(f"Plugin '{plugin.name}' already registered, replacing")
-            _plugins.remove(existing)
-            break
+    existing = _by_name.pop(plugin.name, None)
+    if existing is not None:
+        logger.warning(f"Plugin '{plugin.name}' already registered, replacing")
+        for platform_plugins in _by_platform.values():
+            if existing in platform_plugins:
+                platform_plugins.remove(existing)
     
-    _plugins.append(plugin)
+    _by_name[plugin.name] = plugin
+    for platform in plugin.supported_platforms:
+        _by_platform.setdefault(platform.lower(), []).append(plugin)
     logger.info(f"Registered plugin: {plugin.name} (platforms: {plugin.supported_platforms})")
 
 
@@ -45,7 +61,22 @@ def list_plugins() -> List[Plugin]:
     Returns:
         List of registered plugin instances
     """
-    return _plugins.copy()
+    return list(iter_plugins())
+
+
+def iter_plugins() -> ValuesView[Plugin]:
+    """
+    Get a live, read-only view of all registered plugins (no copy).
+    
+    Do not register or clear plugins while iterating; use list_plugins()
+    for a snapshot.
+    
+    Returns:
+        View of registered plugin instances, in registration order
+    """
+    for name in list(_pending):
+        _load_pending(name)
+    return _by_name.values()
 
 
 def get_plugin(name: str) -> Optional[Plugin]:
@@ -58,10 +89,9 @@ def get_plugin(name: str) -> Optional[Plugin]:
     Returns:
         Plugin instance or None if not found
     """
-    for plugin in _plugins:
-        if plugin.name == name:
-            return plugin
-    return None
+    if name in _pending:
+        _load_pending(name)
+    return _by_name.get(name)
 
 
 def route_to_plugin(platform: str, text: str, lang: str) -> Optional[Plugin]:
@@ -83,9 +113,12 @@ def route_to_plugin(platform: str, text: str, lang: str) -> Optional[Plugin]:
         Best matching plugin or None if no match
     """
     platform_lower = platform.lower()
+    if _pending:
+        for name in [n for n, entry in _pending.items() if platform_lower in entry["platforms"]]:
+            _load_pending(name)
     
-    # Find plugins that support this platform
-    candidates = [p for p in _plugins if platform_lower in p.supported_platforms]
+    # Plugins that support this platform, in registration order
+    candidates = _by_platform.get(platform_lower)
     
     if not candidates:
         logger.warning(f"No plugin found for platform: {platform}")
@@ -101,6 +134,97 @@ def route_to_plugin(platform: str, text: str, lang: str) -> Optional[Plugin]:
 
 def clear_plugins() -> None:
     """Clear all registered plugins (useful for testing)."""
-    global _plugins
-    _plugins = []
+    _by_name.clear()
+    _by_platform.clear()
+    _pending.clear()
     logger.info("Cleared all plugins")
+
+
+def discover_and_register(plugin_dir: Path = PLUGINS_DIR) -> List[str]:
+    """
+    Discover plugin packages (``<plugin_dir>/<package>/plugin.py``) and register them.
+    
+    Discovery results are cached on disk, keyed by the names and mtimes of
+    the plugin sources; a discovery in which any plugin failed to import or
+    instantiate is not cached, and older cache files are removed when a new
+    one is written. On a cache hit nothing is imported up front: each
+    plugin is imported and instantiated the first time it is routed to or
+    looked up.
+    
+    Args:
+        plugin_dir: Directory containing plugin packages
+        
+    Returns:
+        Names of the discovered plugins
+    """
+    sources = sorted(plugin_dir.glob("*/*.py"))
+    digest = hashlib.blake2b(digest_size=16)
+    for source in sources:
+        digest.update(str(source.relative_to(plugin_dir)).encode())
+        digest.update(str(source.stat().st_mtime_ns).encode())
+    cache_file = DISCOVERY_CACHE_DIR / f"plugins-{digest.hexdigest()}.json"
+    
+    try:
+        entries = json.loads(cache_file.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        entries = None
+    
+    if entries is not None:
+        for entry in entries:
+            entry["platforms"] = set(entry["platforms"])
+            if entry["name"] not in _by_name:
+                _pending[entry["name"]] = entry
+        logger.info(f"Loaded {len(entries)} plugin(s) from discovery cache")
+        return [entry["name"] for entry in entries]
+    
+    entries = []
+    failed = False
+    for module_file in sorted(plugin_dir.glob("*/plugin.py")):
+        module_name = f"{plugin_dir.name}.{module_file.parent.name}.plugin"
+        try:
+            module = importlib.import_module(module_name)
+        except Exception as e:
+            logger.error(f"Failed to import plugin module {module_name}: {e}")
+            failed = True
+            continue
+        for _, cls in inspect.getmembers(module, inspect.isclass):
+            if not issubclass(cls, Plugin) or cls.__module__ != module_name or inspect.isabstract(cls):
+                continue
+            try:
+                plugin = cls()
+                register_plugin(plugin)
+            except Exception as e:
+                logger.error(f"Failed to load plugin {module_name}.{cls.__name__}: {e}")
+                failed = True
+                continue
+            entries.append({
+                "name": plugin.name,
+                "module": module_name,
+                "class": cls.__name__,
+                "platforms": sorted(p.lower() for p in plugin.supported_platforms),
+            })
+    
+    # A failure may be transient (e.g. a dependency installed later), so only
+    # complete discoveries are cached
+    if not failed:
+        try:
+            DISCOVERY_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            for stale in DISCOVERY_CACHE_DIR.glob("plugins-*.json"):
+                if stale != cache_file:
+                    stale.unlink(missing_ok=True)
+            cache_file.write_text(json.dumps(entries), encoding="utf-8")
+        except OSError as e:
+            logger.warning(f"Could not write plugin discovery cache: {e}")
+    return [entry["name"] for entry in entries]
+
+
+def _load_pending(name: str) -> None:
+    """Import, instantiate and register a plugin known only from the discovery cache."""
+    entry = _pending.pop(name, None)
+    if entry is None:
+        return
+    try:
+        cls = getattr(importlib.import_module(entry["module"]), entry["class"])
+        register_plugin(cls())
+    except Exception as e:
+        logger.error(f"Failed to load cached plugin '{name}': {e}")
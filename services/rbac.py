@@ -4,9 +4,9 @@ Manages user roles and permissions for secure access control.
 """
 
 import logging
-from enum import Enum
+from enum import Enum, IntFlag
 from typing import List, Optional, Callable
-from functools import wraps
+from functools import cache, wraps
 import streamlit as st
 
 logger = logging.getLogger(__name__)
@@ -20,75 +20,104 @@ class UserRole(Enum):
     MODERATOR = "moderator"  # Can manage content but not users
 
 
-class Permission(Enum):
-    """Permission definitions."""
+class Permission(IntFlag):
+    """Permission definitions (one bit each, so a role's permissions are one mask)."""
     # User management
-    CREATE_USER = "create_user"
-    VIEW_USER = "view_user"
-    UPDATE_USER = "update_user"
-    DELETE_USER = "delete_user"
+    CREATE_USER = 1 << 0
+    VIEW_USER = 1 << 1
+    UPDATE_USER = 1 << 2
+    DELETE_USER = 1 << 3
     
     # Food analysis
-    ANALYZE_FOOD = "analyze_food"
-    VIEW_ANALYSIS = "view_analysis"
-    DELETE_ANALYSIS = "delete_analysis"
-    EXPORT_ANALYSIS = "export_analysis"
+    ANALYZE_FOOD = 1 << 4
+    VIEW_ANALYSIS = 1 << 5
+    DELETE_ANALYSIS = 1 << 6
+    EXPORT_ANALYSIS = 1 << 7
     
     # Medical vault
-    UPLOAD_MEDICAL_FILE = "upload_medical_file"
-    VIEW_MEDICAL_FILE = "view_medical_file"
-    DELETE_MEDICAL_FILE = "delete_medical_file"
+    UPLOAD_MEDICAL_FILE = 1 << 8
+    VIEW_MEDICAL_FILE = 1 << 9
+    DELETE_MEDICAL_FILE = 1 << 10
     
     # System management
-    VIEW_SYSTEM_LOGS = "view_system_logs"
-    MANAGE_SETTINGS = "manage_settings"
-    VIEW_ANALYTICS = "view_analytics"
+    VIEW_SYSTEM_LOGS = 1 << 11
+    MANAGE_SETTINGS = 1 << 12
+    VIEW_ANALYTICS = 1 << 13
 
 
+_NO_PERMISSIONS = Permission(0)
+
 # Role-Permission mapping
 ROLE_PERMISSIONS = {
-    UserRole.ADMIN: [
+    UserRole.ADMIN: (
         # All permissions
-        Permission.CREATE_USER,
-        Permission.VIEW_USER,
-        Permission.UPDATE_USER,
-        Permission.DELETE_USER,
-        Permission.ANALYZE_FOOD,
-        Permission.VIEW_ANALYSIS,
-        Permission.DELETE_ANALYSIS,
-        Permission.EXPORT_ANALYSIS,
-        Permission.UPLOAD_MEDICAL_FILE,
-        Permission.VIEW_MEDICAL_FILE,
-        Permission.DELETE_MEDICAL_FILE,
-        Permission.VIEW_SYSTEM_LOGS,
-        Permission.MANAGE_SETTINGS,
-        Permission.VIEW_ANALYTICS,
-    ],
+        Permission.CREATE_USER
+        | Permission.VIEW_USER
+        | Permission.UPDATE_USER
+        | Permission.DELETE_USER
+        | Permission.ANALYZE_FOOD
+        | Permission.VIEW_ANALYSIS
+        | Permission.DELETE_ANALYSIS
+        | Permission.EXPORT_ANALYSIS
+        | Permission.UPLOAD_MEDICAL_FILE
+        | Permission.VIEW_MEDICAL_FILE
+        | Permission.DELETE_MEDICAL_FILE
+        | Permission.VIEW_SYSTEM_LOGS
+        | Permission.MANAGE_SETTINGS
+        | Permission.VIEW_ANALYTICS
+    ),
     
-    UserRole.MODERATOR: [
-        Permission.VIEW_USER,
-        Permission.ANALYZE_FOOD,
-        Permission.VIEW_ANALYSIS,
-        Permission.DELETE_ANALYSIS,
-        Permission.EXPORT_ANALYSIS,
-        Permission.UPLOAD_MEDICAL_FILE,
-        Permission.VIEW_MEDICAL_FILE,
-        Permission.DELETE_MEDICAL_FILE,
-        Permission.VIEW_ANALYTICS,
-    ],
+    UserRole.MODERATOR: (
+        Permission.VIEW_USER
+        | Permission.ANALYZE_FOOD
+        | Permission.VIEW_ANALYSIS
+        | Permission.DELETE_ANALYSIS
+        | Permission.EXPORT_ANALYSIS
+        | Permission.UPLOAD_MEDICAL_FILE
+        | Permission.VIEW_MEDICAL_FILE
+        | Permission.DELETE_MEDICAL_FILE
+        | Permission.VIEW_ANALYTICS
+    ),
     
-    UserRole.USER: [
-        Permission.ANALYZE_FOOD,
-        Permission.VIEW_ANALYSIS,
-        Permission.EXPORT_ANALYSIS,
-        Permission.UPLOAD_MEDICAL_FILE,
-        Permission.VIEW_MEDICAL_FILE,
-        Permission.DELETE_MEDICAL_FILE,
-    ],
+    UserRole.USER: (
+        Permission.ANALYZE_FOOD
+        | Permission.VIEW_ANALYSIS
+        | Permission.EXPORT_ANALYSIS
+        | Permission.UPLOAD_MEDICAL_FILE
+        | Permission.VIEW_MEDICAL_FILE
+        | Permission.DELETE_MEDICAL_FILE
+    ),
     
-    UserRole.GUEST: [
-        Permission.VIEW_ANALYSIS,  # Read-only
-    ]
+    UserRole.GUEST: (
+        Permission.VIEW_ANALYSIS  # Read-only
+    ),
+}
+
+# UI features, in display order, and the permission each one needs
+FEATURE_PERMISSIONS = (
+    (Permission.ANALYZE_FOOD, "Food Analysis"),
+    (Permission.VIEW_ANALYSIS, "Analysis History"),
+    (Permission.UPLOAD_MEDICAL_FILE, "Medical Vault"),
+    (Permission.VIEW_ANALYTICS, "Health Dashboard"),
+    (Permission.MANAGE_SETTINGS, "System Settings"),
+)
+
+# Resolved once at import: both are read on every Streamlit rerun
+_FEATURES_BY_ROLE = {
+    role: tuple(feature for permission, feature in FEATURE_PERMISSIONS if permission in permissions)
+    for role, permissions in ROLE_PERMISSIONS.items()
+}
+
+_BADGE_COLORS = {
+    UserRole.ADMIN: "🔴",
+    UserRole.MODERATOR: "🟡",
+    UserRole.USER: "🟢",
+    UserRole.GUEST: "⚪"
+}
+
+_BADGE_MARKDOWN = {
+    role: f"{_BADGE_COLORS.get(role, '⚫')} **Role:** {role.value.capitalize()}"
+    for role in UserRole
 }
 
 
@@ -110,8 +139,7 @@ class RBACService:
         Returns:
             True if role has permission, False otherwise
         """
-        permissions = ROLE_PERMISSIONS.get(role, [])
-        return permission in permissions
+        return ROLE_PERMISSIONS.get(role, _NO_PERMISSIONS) & permission == permission
     
     def check_permission(
         self,
@@ -139,9 +167,9 @@ class RBACService:
         has_perm = self.has_permission(role, permission)
         
         if not has_perm and raise_error:
-            self.logger.warning(f"Permission denied: {username} attempted {permission.value}")
+            self.logger.warning(f"Permission denied: {username} attempted {permission.name.lower()}")
             raise PermissionError(
-                f"User '{username}' does not have permission: {permission.value}"
+                f"User '{username}' does not have permission: {permission.name.lower()}"
             )
         
         return has_perm
@@ -156,13 +184,12 @@ class RBACService:
         Returns:
             User's role
         """
-        # Check session state first
-        if 'user_role' in st.session_state:
-            role_str = st.session_state.user_role
-            try:
-                return UserRole(role_str)
-            except ValueError:
-                self.logger.error(f"Invalid role in session: {role_str}")
+        # Check session state first (stored as the enum member itself)
+        role = st.session_state.get('user_role')
+        if isinstance(role, UserRole):
+            return role
+        if role is not None:
+            self.logger.error(f"Invalid role in session: {role}")
         
         # Default to USER role if not found
         return UserRole.USER
@@ -175,7 +202,7 @@ class RBACService:
             username: Username
             role: Role to set
         """
-        st.session_state.user_role = role.value
+        st.session_state.user_role = role
         self.logger.info(f"Set role for {username}: {role.value}")
     
     def get_available_features(self, role: UserRole) -> List[str]:
@@ -188,33 +215,13 @@ class RBACService:
         Returns:
             List of feature names
         """
-        permissions = ROLE_PERMISSIONS.get(role, [])
-        
-        features = []
-        if Permission.ANALYZE_FOOD in permissions:
-            features.append("Food Analysis")
-        if Permission.VIEW_ANALYSIS in permissions:
-            features.append("Analysis History")
-        if Permission.UPLOAD_MEDICAL_FILE in permissions:
-            features.append("Medical Vault")
-        if Permission.VIEW_ANALYTICS in permissions:
-            features.append("Health Dashboard")
-        if Permission.MANAGE_SETTINGS in permissions:
-            features.append("System Settings")
-        
-        return features
-
-
-# Global instance
-_rbac_service = None
+        return list(_FEATURES_BY_ROLE.get(role, ()))
 
 
+@cache
 def get_rbac_service() -> RBACService:
     """Get or create global RBAC service instance."""
-    global _rbac_service
-    if _rbac_service is None:
-        _rbac_service = RBACService()
-    return _rbac_service
+    return RBACService()
 
 
 def require_permission(permission: Permission):
@@ -239,13 +246,16 @@ def require_permission(permission: Permission):
                 st.error("⛔ Authentication required")
                 st.stop()
             
-            # Check permission
-            rbac = get_rbac_service()
-            try:
-                rbac.check_permission(username, permission, raise_error=True)
-            except PermissionError as e:
-                st.error(f"⛔ {str(e)}")
-                st.stop()
+            # Fast path: role already in session and it grants the permission
+            role = st.session_state.get('user_role')
+            if not isinstance(role, UserRole) or ROLE_PERMISSIONS.get(role, _NO_PERMISSIONS) & permission != permission:
+                # Defaulted role or denial: let the service resolve, log and explain
+                rbac = get_rbac_service()
+                try:
+                    rbac.check_permission(username, permission, raise_error=True)
+                except PermissionError as e:
+                    st.error(f"⛔ {str(e)}")
+                    st.stop()
             
             # Execute function if permission granted
             return func(*args, **kwargs)
@@ -290,12 +300,4 @@ def show_role_badge(role: UserRole):
     Args:
         role: User role to display
     """
-    badge_colors = {
-        UserRole.ADMIN: "🔴",
-        UserRole.MODERATOR: "🟡",
-        UserRole.USER: "🟢",
-        UserRole.GUEST: "⚪"
-    }
-    
-    badge = badge_colors.get(role, "⚫")
-    st.sidebar.markdown(f"{badge} **Role:** {role.value.capitalize()}")
+    st.sidebar.markdown(_BADGE_MARKDOWN[role])
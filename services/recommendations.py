@@ -4,14 +4,87 @@ Suggests healthier alternatives based on category, nutritional profile, and heal
 """
 
 import logging
-from typing import List, Dict, Any, Optional
+import re
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, Tuple
+
 import requests
-from datetime import datetime, timedelta
 
 from database.db_manager import get_db_manager
+from services.nutrition_api import create_retry_session
+from utils.helpers import extract_food_category
 
 logger = logging.getLogger(__name__)
 
+OPENFOODFACTS_SEARCH_URL = "https://world.openfoodfacts.org/cgi/search.pl"
+
+# OpenFoodFacts search results are reused within the same 6-hour window
+_OFF_CACHE_TTL_SECONDS = 6 * 3600
+
+# The only product fields read when ranking alternatives
+_OFF_FIELDS = ('product_name', 'brands', 'nutriscore_grade', 'nova_group')
+
+# Keep-alive pool so repeated searches skip the TCP/TLS handshake
+_OFF_SESSION = create_retry_session(
+    max_retries=2, backoff_factor=0.2, pool_connections=10, pool_maxsize=10
+)
+
+# Concurrent lookups per batch (matches the session's pool size)
+_BATCH_MAX_WORKERS = 10
+
+# Nutri-Score mapping (a=best, e=worst)
+_NUTRISCORE_BASE = {'a': 95, 'b': 80, 'c': 65, 'd': 45, 'e': 25}
+_NUTRISCORE_DEFAULT = 50
+
+# NOVA group penalty (1=unprocessed, 4=ultra-processed)
+_NOVA_PENALTY = {1: 0, 2: -5, 3: -15, 4: -25}
+
+# (grade, NOVA group) -> clamped score for every known combination
+_HEALTH_SCORE_TABLE = {
+    (grade, nova): max(0, min(100, base + penalty))
+    for grade, base in _NUTRISCORE_BASE.items()
+    for nova, penalty in _NOVA_PENALTY.items()
+}
+
+
+@lru_cache(maxsize=512)
+def _fetch_off_products(search_category: str, ttl_bucket: int) -> Tuple[Dict[str, Any], ...]:
+    """
+    Search OpenFoodFacts for a category (memoized per 6-hour window).
+    
+    Args:
+        search_category: Search terms
+        ttl_bucket: time.time() // _OFF_CACHE_TTL_SECONDS; a new bucket forces a refetch
+        
+    Returns:
+        Product dicts trimmed to _OFF_FIELDS.
+        
+    Raises:
+        requests.RequestException: On request errors and any non-200 response
+            (e.g. throttling), so only real search results are cached.
+    """
+    params = {
+        'search_terms': search_category,
+        'search_simple': 1,
+        'action': 'process',
+        'json': 1,
+        'page_size': 20,
+        'fields': ','.join(_OFF_FIELDS)
+    }
+    response = _OFF_SESSION.get(OPENFOODFACTS_SEARCH_URL, params=params, timeout=5)
+    if response.status_code != 200:
+        raise requests.HTTPError(
+            f"OpenFoodFacts search returned HTTP {response.status_code}", response=response
+        )
+    return tuple(
+        {field: product[field] for field in _OFF_FIELDS if field in product}
+        for product in response.json().get('products', [])
+    )
+
 
 class HealthRecommendationsService:
     """Recommend healthier product alternatives."""
@@ -20,8 +93,16 @@ class HealthRecommendationsService:
         """Initialize recommendations service."""
         self.logger = logging.getLogger(__name__)
         self.db_manager = get_db_manager()
-        self.cache = {}  # Cache for API results
-        self.cache_ttl = timedelta(hours=6)
+        # Per-thread read connection (batch lookups run on worker threads)
+        self._local = threading.local()
+    
+    def _get_connection(self) -> sqlite3.Connection:
+        """Return this thread's cached connection to the analysis database."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_manager.db_path)
+            self._local.conn = conn
+        return conn
     
     def get_healthier_alternatives(
         self,
@@ -68,6 +149,32 @@ class HealthRecommendationsService:
         # Limit results
         return alternatives[:limit]
     
+    def get_healthier_alternatives_batch(
+        self,
+        items: List[Dict[str, Any]]
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Find healthier alternatives for many products at once.
+        
+        Each item is looked up concurrently, so the OpenFoodFacts searches
+        overlap instead of running one after another.
+        
+        Args:
+            items: Keyword arguments for get_healthier_alternatives, one dict per product
+            
+        Returns:
+            One list of alternatives per item, in input order
+        """
+        if not items:
+            return []
+        
+        with ThreadPoolExecutor(
+            max_workers=min(len(items), _BATCH_MAX_WORKERS),
+            thread_name_prefix="recommendations-batch",
+        ) as pool:
+            futures = [pool.submit(self.get_healthier_alternatives, **item) for item in items]
+            return [future.result() for future in futures]
+    
     def _get_local_alternatives(
         self,
         product_name: str,
@@ -86,22 +193,21 @@ class HealthRecommendationsService:
             List of alternative products from local database
         """
         try:
-            conn = self.db_manager._get_connection()
-            cursor = conn.cursor()
+            cursor = self._get_connection().cursor()
             
             # Build query based on available filters
             query = """
-                SELECT DISTINCT product, health_score, verdict, warnings
+                SELECT DISTINCT product, health_score, verdict
                 FROM food_analysis
                 WHERE health_score > ?
                 AND product != ?
             """
             params = [current_health_score, product_name]
             
-            # Add category filter if available (search in product name)
+            # Add category filter if available (indexed with health_score)
             if category:
-                query += " AND LOWER(product) LIKE ?"
-                params.append(f"%{category.lower()}%")
+                query += " AND category = ?"
+                params.append(category.lower())
             
             query += " ORDER BY health_score DESC LIMIT 10"
             
@@ -144,37 +250,23 @@ class HealthRecommendationsService:
         Returns:
             List of alternative products from OpenFoodFacts
         """
-        # Check cache first
-        cache_key = f"{product_name}_{category}_{current_health_score}"
-        if cache_key in self.cache:
-            cached_data, cached_time = self.cache[cache_key]
-            if datetime.now() - cached_time < self.cache_ttl:
-                self.logger.info(f"Using cached alternatives for {product_name}")
-                return cached_data
-        
         alternatives = []
         
         try:
             # Extract category from product name if not provided
             search_category = category or self._extract_category(product_name)
             
-            # Search OpenFoodFacts
-            search_url = "https://world.openfoodfacts.org/cgi/search.pl"
-            params = {
-                'search_terms': search_category,
-                'search_simple': 1,
-                'action': 'process',
-                'json': 1,
-                'page_size': 20
-            }
-            
-            response = requests.get(search_url, params=params, timeout=5)
+            # Search OpenFoodFacts (shared per category for up to 6 hours)
+            products = _fetch_off_products(
+                search_category, int(time.time() // _OFF_CACHE_TTL_SECONDS)
+            )
             
-            if response.status_code == 200:
-                data = response.json()
-                products = data.get('products', [])
-                
+            if products:
                 for product in products:
+                    # Only the first `limit` qualifying products are returned
+                    if len(alternatives) >= limit:
+                        break
+                    
                     # Skip if same product
                     if product.get('product_name', '').lower() == product_name.lower():
                         continue
@@ -197,15 +289,13 @@ class HealthRecommendationsService:
                             'reason': self._generate_recommendation_reason(
                                 nutriscore, 
                                 nova_group,
-                                current_health_score
+                                current_health_score,
+                                estimated_score
                             )
                         })
                 
                 self.logger.info(f"Found {len(alternatives)} API alternatives for {product_name}")
             
-            # Cache results
-            self.cache[cache_key] = (alternatives[:limit], datetime.now())
-            
             return alternatives[:limit]
             
         except Exception as e:
@@ -222,28 +312,7 @@ class HealthRecommendationsService:
         Returns:
             Extracted category
         """
-        # Common food categories
-        categories = {
-            'chips': ['chips', 'crisps', 'snack'],
-            'chocolate': ['chocolate', 'cocoa'],
-            'biscuit': ['biscuit', 'cookie', 'cracker'],
-            'cereal': ['cereal', 'granola', 'muesli'],
-            'yogurt': ['yogurt', 'yoghurt'],
-            'juice': ['juice', 'drink', 'beverage'],
-            'bread': ['bread', 'toast'],
-            'cheese': ['cheese'],
-            'milk': ['milk', 'dairy'],
-        }
-        
-        product_lower = product_name.lower()
-        
-        for category, keywords in categories.items():
-            for keyword in keywords:
-                if keyword in product_lower:
-                    return category
-        
-        # Default: use first word of product name
-        return product_name.split()[0] if product_name else 'food'
+        return extract_food_category(product_name)
     
     def _estimate_health_score(self, nutriscore: str, nova_group: int) -> int:
         """
@@ -256,39 +325,22 @@ class HealthRecommendationsService:
         Returns:
             Estimated health score (0-100)
         """
-        # Nutri-Score mapping (a=best, e=worst)
-        nutriscore_map = {
-            'a': 95,
-            'b': 80,
-            'c': 65,
-            'd': 45,
-            'e': 25
-        }
-        
-        # NOVA group penalty (1=unprocessed, 4=ultra-processed)
-        nova_penalty = {
-            1: 0,
-            2: -5,
-            3: -15,
-            4: -25
-        }
+        grade = nutriscore.lower()
+        score = _HEALTH_SCORE_TABLE.get((grade, nova_group))
+        if score is not None:
+            return score
         
-        # Calculate base score from Nutri-Score
-        base_score = nutriscore_map.get(nutriscore.lower(), 50)
-        
-        # Apply NOVA penalty
-        penalty = nova_penalty.get(nova_group, 0)
-        
-        # Final score (clamped to 0-100)
-        final_score = max(0, min(100, base_score + penalty))
-        
-        return final_score
+        # Unknown grade or NOVA group
+        base_score = _NUTRISCORE_BASE.get(grade, _NUTRISCORE_DEFAULT)
+        penalty = _NOVA_PENALTY.get(nova_group, 0)
+        return max(0, min(100, base_score + penalty))
     
     def _generate_recommendation_reason(
         self,
         nutriscore: str,
         nova_group: int,
-        current_score: int
+        current_score: int,
+        estimated_score: int
     ) -> str:
         """
         Generate human-readable recommendation reason.
@@ -297,6 +349,7 @@ class HealthRecommendationsService:
             nutriscore: Nutri-Score grade
             nova_group: NOVA classification
             current_score: Current product's health score
+            estimated_score: Alternative's score from _estimate_health_score
             
         Returns:
             Recommendation reason text
@@ -318,9 +371,8 @@ class HealthRecommendationsService:
             reasons.append("Moderately processed")
         
         # Score difference
-        estimated = self._estimate_health_score(nutriscore, nova_group)
-        if estimated > current_score:
-            diff = estimated - current_score
+        if estimated_score > current_score:
+            diff = estimated_score - current_score
             reasons.append(f"+{diff} health points")
         
         return " • ".join(reasons) if reasons else "Better nutritional profile"
@@ -358,19 +410,18 @@ class HealthRecommendationsService:
         filtered_alternatives = []
         
         user_allergies = user_profile.get('allergies', [])
-        user_conditions = user_profile.get('health_conditions', [])
+        user_conditions = set(user_profile.get('health_conditions', []))
+        
+        # One pass over each product name for all allergies
+        allergy_pattern = re.compile(
+            "|".join(re.escape(allergy.lower()) for allergy in user_allergies)
+        ) if user_allergies else None
         
         for alt in alternatives:
             # Skip if conflicts with user allergies
             product_lower = alt['product'].lower()
             
-            has_conflict = False
-            for allergy in user_allergies:
-                if allergy.lower() in product_lower:
-                    has_conflict = True
-                    break
-            
-            if has_conflict:
+            if allergy_pattern and allergy_pattern.search(product_lower):
                 continue
             
             # Add personalization note
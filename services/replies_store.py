@@ -4,17 +4,21 @@ Replies Store - Saved reply templates for SocialOps Agent.
 Manages a library of reusable reply templates.
 """
 
-import sqlite3
 import json
 import logging
 from typing import List, Dict, Any, Optional
 from datetime import datetime
 from pathlib import Path
 
-from services.db import get_db_path
+from services.db import get_connection, get_db_path
 
 logger = logging.getLogger(__name__)
 
+_INSERT_REPLY_SQL = """
+    INSERT INTO replies (created_at, updated_at, scope, plugin_name, lang, title, body, tags)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
 
 class RepliesStore:
     """
@@ -38,7 +42,7 @@ class RepliesStore:
     
     def init_db(self) -> None:
         """Initialize replies table if it doesn't exist."""
-        conn = sqlite3.connect(self.db_path)
+        conn = get_connection(self.db_path)
         cursor = conn.cursor()
         
         cursor.execute("""
@@ -67,7 +71,6 @@ class RepliesStore:
         """)
         
         conn.commit()
-        conn.close()
         logger.info("Replies table initialized")
     
     def create_reply(
@@ -93,24 +96,43 @@ class RepliesStore:
         Returns:
             Reply ID
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
         now = datetime.utcnow().isoformat()
-        tags_json = json.dumps(tags) if tags else None
-        
-        cursor.execute("""
-            INSERT INTO replies (created_at, updated_at, scope, plugin_name, lang, title, body, tags)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        """, (now, now, scope, plugin_name, lang, title, body, tags_json))
+        with get_connection(self.db_path) as conn:
+            cursor = conn.execute(
+                _INSERT_REPLY_SQL,
+                self._reply_row(now, title, body, lang, scope, plugin_name, tags)
+            )
         
         reply_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
         
         logger.info(f"Created reply #{reply_id}: {title}")
         return reply_id
     
+    @staticmethod
+    def _reply_row(
+        now: str,
+        title: str,
+        body: str,
+        lang: str,
+        scope: str,
+        plugin_name: Optional[str],
+        tags: Optional[List[str]]
+    ) -> tuple:
+        """Build the parameter tuple for _INSERT_REPLY_SQL."""
+        tags_json = json.dumps(tags) if tags else None
+        return (now, now, scope, plugin_name, lang, title, body, tags_json)
+    
+    def _bulk_insert(self, rows: List[tuple]) -> None:
+        """
+        Insert many reply rows in one transaction (a single commit).
+        
+        Args:
+            rows: Parameter tuples built by _reply_row
+        """
+        with get_connection(self.db_path) as conn:  # commits on success, rolls back on error
+            conn.execute("BEGIN IMMEDIATE")
+            conn.executemany(_INSERT_REPLY_SQL, rows)
+    
     def list_replies(
         self,
         scope: Optional[str] = None,
@@ -128,9 +150,7 @@ class RepliesStore:
         Returns:
             List of reply dictionaries
         """
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
+        cursor = get_connection(self.db_path).cursor()
         
         query = "SELECT * FROM replies WHERE 1=1"
         params = []
@@ -151,7 +171,6 @@ class RepliesStore:
         
         cursor.execute(query, params)
         rows = cursor.fetchall()
-        conn.close()
         
         replies = []
         for row in rows:
@@ -178,13 +197,10 @@ class RepliesStore:
         Returns:
             Reply dictionary or None
         """
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
+        cursor = get_connection(self.db_path).cursor()
         
         cursor.execute("SELECT * FROM replies WHERE id = ?", (reply_id,))
         row = cursor.fetchone()
-        conn.close()
         
         if not row:
             return None
@@ -216,34 +232,32 @@ class RepliesStore:
             body: New body (optional)
             tags: New tags list (optional)
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = get_connection(self.db_path)
         cursor = conn.cursor()
         
         # Get current reply
         cursor.execute("SELECT * FROM replies WHERE id = ?", (reply_id,))
         current = cursor.fetchone()
         if not current:
-            conn.close()
             logger.warning(f"Reply {reply_id} not found")
             return
         
         now = datetime.utcnow().isoformat()
         
-        if title is not None:
-            cursor.execute("UPDATE replies SET title = ?, updated_at = ? WHERE id = ?", 
-                         (title, now, reply_id))
-        
-        if body is not None:
-            cursor.execute("UPDATE replies SET body = ?, updated_at = ? WHERE id = ?", 
-                         (body, now, reply_id))
-        
-        if tags is not None:
-            tags_json = json.dumps(tags)
-            cursor.execute("UPDATE replies SET tags = ?, updated_at = ? WHERE id = ?", 
-                         (tags_json, now, reply_id))
+        with conn:
+            if title is not None:
+                cursor.execute("UPDATE replies SET title = ?, updated_at = ? WHERE id = ?", 
+                             (title, now, reply_id))
+            
+            if body is not None:
+                cursor.execute("UPDATE replies SET body = ?, updated_at = ? WHERE id = ?", 
+                             (body, now, reply_id))
+            
+            if tags is not None:
+                tags_json = json.dumps(tags)
+                cursor.execute("UPDATE replies SET tags = ?, updated_at = ? WHERE id = ?", 
+                             (tags_json, now, reply_id))
         
-        conn.commit()
-        conn.close()
         logger.info(f"Updated reply #{reply_id}")
     
     def delete_reply(self, reply_id: int) -> None:
@@ -253,13 +267,9 @@ class RepliesStore:
         Args:
             reply_id: Reply ID
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute("DELETE FROM replies WHERE id = ?", (reply_id,))
+        with get_connection(self.db_path) as conn:
+            conn.execute("DELETE FROM replies WHERE id = ?", (reply_id,))
         
-        conn.commit()
-        conn.close()
         logger.info(f"Deleted reply #{reply_id}")
     
     def seed_defaults(self) -> int:
@@ -340,16 +350,21 @@ class RepliesStore:
             },
         ]
         
-        count = 0
-        for default in defaults:
-            self.create_reply(
-                title=default["title"],
-                body=default["body"],
-                lang=default["lang"],
-                scope="core",
-                tags=default.get("tags", [])
+        now = datetime.utcnow().isoformat()
+        rows = [
+            self._reply_row(
+                now,
+                default["title"],
+                default["body"],
+                default["lang"],
+                "core",
+                None,
+                default.get("tags", [])
             )
-            count += 1
+            for default in defaults
+        ]
+        self._bulk_insert(rows)
+        count = len(rows)
         
         logger.info(f"Seeded {count} default replies")
         return count
@@ -4,10 +4,9 @@ Search Service - Unified search across threads, leads, and replies.
 Provides LIKE-based search on sqlite tables.
 """
 
-import sqlite3
 import logging
 from typing import List, Dict, Optional
-from services.db import get_db_path
+from services.db import get_connection
 
 logger = logging.getLogger(__name__)
 
@@ -27,10 +26,7 @@ def search_threads(query: str, limit: int = 50) -> List[Dict]:
         return []
     
     try:
-        db_path = get_db_path()
-        conn = sqlite3.connect(db_path)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
+        cursor = get_connection().cursor()
         
         search_term = f"%{query}%"
         
@@ -64,7 +60,6 @@ def search_threads(query: str, limit: int = 50) -> List[Dict]:
                 'type': 'thread'
             })
         
-        conn.close()
         return results
     
     except Exception as e:
@@ -87,10 +82,7 @@ def search_leads(query: str, limit: int = 50) -> List[Dict]:
         return []
     
     try:
-        db_path = get_db_path()
-        conn = sqlite3.connect(db_path)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
+        cursor = get_connection().cursor()
         
         search_term = f"%{query}%"
         
@@ -117,7 +109,6 @@ def search_leads(query: str, limit: int = 50) -> List[Dict]:
                 'type': 'lead'
             })
         
-        conn.close()
         return results
     
     except Exception as e:
@@ -140,10 +131,7 @@ def search_replies(query: str, limit: int = 50) -> List[Dict]:
         return []
     
     try:
-        db_path = get_db_path()
-        conn = sqlite3.connect(db_path)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
+        cursor = get_connection().cursor()
         
         search_term = f"%{query}%"
         
@@ -168,7 +156,6 @@ def search_replies(query: str, limit: int = 50) -> List[Dict]:
                 'type': 'reply'
             })
         
-        conn.close()
         return results
     
     except Exception as e:
@@ -12,10 +12,21 @@ from services.engine import (
     _build_provider_order,
     _analyze_with_gemini,
     _analyze_with_openai,
-    _mock_analysis
+    _mock_analysis,
+    _gemini_model,
+    _openai_client,
+    _IMG_CACHE,
 )
 
 
+@pytest.fixture(autouse=True)
+def clear_image_cache():
+    """Keep cached provider results from leaking between tests."""
+    _IMG_CACHE.clear()
+    yield
+    _IMG_CACHE.clear()
+
+
 class TestProviderOrdering:
     """Test provider fallback ordering logic."""
     
@@ -42,7 +53,7 @@ class TestProviderOrdering:
         with patch('services.engine.GEMINI_API_KEY', ''):
             with patch('services.engine.OPENAI_API_KEY', ''):
                 order = _build_provider_order('gemini')
-                assert order == ['mock']
+                assert order == ('mock',)
 
 
 class TestMockAnalysis:
@@ -108,6 +119,93 @@ class TestImageAnalysis:
                 assert 'product' in result
 
 
+    @pytest.mark.asyncio
+    async def test_analyze_image_hedges_slow_provider(self, sample_image_bytes):
+        """Test that a slow preferred provider is hedged with the fallback."""
+        async def slow_gemini(image_bytes):
+            await asyncio.sleep(5)
+            return {'product': 'Gemini'}
+        
+        async def fast_openai(image_bytes):
+            return {'product': 'OpenAI'}
+        
+        with patch('services.engine.GEMINI_API_KEY', 'test-key'):
+            with patch('services.engine.OPENAI_API_KEY', 'test-key-2'):
+                with patch('services.engine.AI_HEDGE_DELAY_SECONDS', 0.05):
+                    with patch('services.engine._analyze_with_gemini', slow_gemini):
+                        with patch('services.engine._analyze_with_openai', fast_openai):
+                            result = await asyncio.wait_for(
+                                analyze_image(sample_image_bytes, 'gemini'), timeout=1.0
+                            )
+                            
+                            assert result['product'] == 'OpenAI'
+    
+    @pytest.mark.asyncio
+    async def test_analyze_image_does_not_hedge_by_default(self, sample_image_bytes):
+        """Test that with hedging disabled a slow provider is not raced by a paid fallback."""
+        async def slow_gemini(image_bytes):
+            await asyncio.sleep(0.2)
+            return {'product': 'Gemini'}
+        
+        openai_mock = AsyncMock(return_value={'product': 'OpenAI'})
+        
+        with patch('services.engine.GEMINI_API_KEY', 'test-key'):
+            with patch('services.engine.OPENAI_API_KEY', 'test-key-2'):
+                with patch('services.engine.AI_HEDGE_DELAY_SECONDS', 0):
+                    with patch('services.engine._analyze_with_gemini', slow_gemini):
+                        with patch('services.engine._analyze_with_openai', openai_mock):
+                            result = await analyze_image(sample_image_bytes, 'gemini')
+                            
+                            assert result['product'] == 'Gemini'
+                            assert openai_mock.await_count == 0
+
+
+    @pytest.mark.asyncio
+    async def test_analyze_image_caches_provider_result(self, sample_image_bytes):
+        """Test that repeated uploads of the same image skip the provider."""
+        gemini = AsyncMock(return_value={'product': 'Gemini'})
+        
+        with patch('services.engine.GEMINI_API_KEY', 'test-key'):
+            with patch('services.engine._analyze_with_gemini', gemini):
+                first = await analyze_image(sample_image_bytes, 'gemini')
+                second = await analyze_image(sample_image_bytes, 'gemini')
+                
+                assert first == second == {'product': 'Gemini'}
+                assert gemini.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_analyze_image_cache_returns_private_copies(self, sample_image_bytes):
+        """Test that mutating a returned result does not leak into later cache hits."""
+        gemini = AsyncMock(return_value={'product': 'Gemini', 'warnings': ['High sugar']})
+        
+        with patch('services.engine.GEMINI_API_KEY', 'test-key'):
+            with patch('services.engine._analyze_with_gemini', gemini):
+                first = await analyze_image(sample_image_bytes, 'gemini')
+                first['warnings'].append('Conflict for user A')
+                first['barcode_info'] = {'barcode': '123'}
+                
+                second = await analyze_image(sample_image_bytes, 'gemini')
+                second['warnings'].append('Conflict for user B')
+                
+                third = await analyze_image(sample_image_bytes, 'gemini')
+                
+                assert third == {'product': 'Gemini', 'warnings': ['High sugar']}
+                assert gemini.await_count == 1
+    
+    @pytest.mark.asyncio
+    async def test_analyze_image_cache_is_keyed_by_provider(self, sample_image_bytes):
+        """Test that a different preferred provider is not served another provider's result."""
+        gemini = AsyncMock(return_value={'product': 'Gemini'})
+        openai_mock = AsyncMock(return_value={'product': 'OpenAI'})
+        
+        with patch('services.engine.GEMINI_API_KEY', 'test-key'):
+            with patch('services.engine.OPENAI_API_KEY', 'test-key-2'):
+                with patch('services.engine._analyze_with_gemini', gemini):
+                    with patch('services.engine._analyze_with_openai', openai_mock):
+                        assert (await analyze_image(sample_image_bytes, 'gemini'))['product'] == 'Gemini'
+                        assert (await analyze_image(sample_image_bytes, 'openai'))['product'] == 'OpenAI'
+
+
 class TestGeminiIntegration:
     """Test Gemini API integration."""
     
@@ -125,7 +223,8 @@ class TestGeminiIntegration:
         mock_response.text = '{"product": "Test", "health_score": 80}'
         
         mock_model = Mock()
-        mock_model.generate_content = Mock(return_value=mock_response)
+        mock_model.generate_content_async = AsyncMock(return_value=mock_response)
+        _gemini_model.cache_clear()
         
         with patch('services.engine.GEMINI_API_KEY', 'test-key'):
             with patch('google.generativeai.configure'):
@@ -156,14 +255,37 @@ class TestOpenAIIntegration:
         mock_response.choices = [mock_choice]
         
         mock_client = Mock()
-        mock_client.chat.completions.create = Mock(return_value=mock_response)
+        mock_client.chat.completions.create = AsyncMock(return_value=mock_response)
+        _openai_client.cache_clear()
         
         with patch('services.engine.OPENAI_API_KEY', 'test-key'):
-            with patch('openai.OpenAI', return_value=mock_client):
+            with patch('openai.AsyncOpenAI', return_value=mock_client):
                 result = await _analyze_with_openai(sample_image_bytes)
                 
                 assert 'product' in result
                 assert 'health_score' in result
+    
+    def test_analyze_image_sync_reuses_openai_client(self, sample_image_bytes):
+        """Test that consecutive sync scans share one OpenAI client."""
+        mock_choice = Mock()
+        mock_choice.message.content = "Product analysis: healthy snack"
+        
+        mock_response = Mock()
+        mock_response.choices = [mock_choice]
+        
+        mock_client = Mock()
+        mock_client.chat.completions.create = AsyncMock(return_value=mock_response)
+        _openai_client.cache_clear()
+        
+        with patch('services.engine.GEMINI_API_KEY', ''):
+            with patch('services.engine.OPENAI_API_KEY', 'test-key'):
+                with patch('openai.AsyncOpenAI', return_value=mock_client) as client_cls:
+                    # Different bytes so the second scan is not an image-cache hit
+                    analyze_image_sync(sample_image_bytes, 'openai')
+                    analyze_image_sync(sample_image_bytes + b'\x00', 'openai')
+                    
+                    assert client_cls.call_count == 1
+                    assert mock_client.chat.completions.create.await_count == 2
 
 
 class TestErrorHandling:
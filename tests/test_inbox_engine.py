@@ -0,0 +1,83 @@
+"""Tests for inbox message normalization and SLA helpers."""
+
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services.inbox_engine import (
+    compute_sla_status,
+    compute_sla_status_many,
+    normalize_imported_message,
+    normalize_imported_messages,
+)
+
+
+def test_normalize_imported_messages_matches_single():
+    """Test the batch normalizer agrees with normalize_imported_message for each message."""
+    msgs = [
+        {
+            'platform': 'Instagram',
+            'sender_name': 'Sara Ali',
+            'sender_id': 'ig_1',
+            'thread_id': 't1',
+            'text': 'Hi',
+            'timestamp': '2024-01-15T10:30:00',
+        },
+        {'platform': 'WhatsApp', 'sender_name': 'Omar K', 'text': 'Price?', 'timestamp': '2024-01-15T10:30:00Z'},
+        {'sender_name': 'No Platform', 'timestamp': '2024-01-15 10:30'},
+        {'platform': 'facebook', 'timestamp': '2024-01-15T10:30:00+02:00', 'extra': 1},
+        {'platform': 'facebook', 'sender_id': 'fb_9', 'text': 'Hello'},
+        {'timestamp': 'garbage'},
+    ]
+    
+    batch = normalize_imported_messages(msgs)
+    single = [normalize_imported_message(msg) for msg in msgs]
+    
+    assert len(batch) == len(single)
+    for many, one, msg in zip(batch, single, msgs, strict=True):
+        if msg.get('timestamp') and msg['timestamp'] != 'garbage':
+            assert many == one
+        else:
+            # Generated "now" timestamps differ between the two calls
+            assert {k: v for k, v in many.items() if k != 'timestamp_iso'} == \
+                {k: v for k, v in one.items() if k != 'timestamp_iso'}
+        assert many['raw'] is msg
+
+
+def test_normalize_imported_messages_empty():
+    """Test an empty batch returns an empty list."""
+    assert normalize_imported_messages([]) == []
+
+
+def test_compute_sla_status_many_matches_single():
+    """Test the batch SLA computation agrees with compute_sla_status for each input."""
+    now = datetime.now()
+    timestamps = [
+        (now - timedelta(hours=1)).isoformat(),
+        (now - timedelta(hours=10)).isoformat(),
+        (now - timedelta(hours=48)).isoformat(),
+        (now - timedelta(hours=30)).isoformat() + 'Z',
+        'not-a-timestamp',
+        '',
+    ]
+    
+    batch = compute_sla_status_many(timestamps, now=now)
+    single = [compute_sla_status(ts) for ts in timestamps]
+    
+    assert len(batch) == len(single)
+    for many, one in zip(batch, single, strict=True):
+        assert many['status'] == one['status']
+        assert many['color'] == one['color']
+        assert many['emoji'] == one['emoji']
+        assert many['hours_since'] == pytest.approx(one['hours_since'], abs=0.01)
+    assert [r['status'] for r in batch] == ['ok', 'warning', 'urgent', 'urgent', 'unknown', 'unknown']
+
+
+def test_compute_sla_status_many_empty():
+    """Test an empty batch returns an empty list."""
+    assert compute_sla_status_many([]) == []
@@ -55,6 +55,209 @@ def test_cache_key_generation():
     assert key3 is None
 
 
+def _offline_api(monkeypatch):
+    """NutritionAPI with caching and connection warm-up disabled."""
+    import services.nutrition_api as nutrition_api
+    
+    monkeypatch.setattr(nutrition_api, "CACHE_ENABLED", False)
+    monkeypatch.setattr(nutrition_api, "WARM_HTTP_POOLS", False)
+    return nutrition_api.NutritionAPI()
+
+
+def test_batch_results_in_input_order(monkeypatch):
+    """Test batch results line up with their items even when fetches finish out of order."""
+    import time
+    
+    api = _offline_api(monkeypatch)
+    
+    def fake_openfoodfacts(barcode):
+        time.sleep(0.05 if barcode == "111" else 0.0)
+        return {"source": "openfoodfacts", "barcode": barcode}
+    
+    monkeypatch.setattr(api, "fetch_from_openfoodfacts", fake_openfoodfacts)
+    
+    results = api.get_nutrition_batch(
+        [{"barcode": "111"}, {"barcode": "222"}, {"barcode": "333"}],
+        preferred_sources=["openfoodfacts"],
+    )
+    
+    assert [r["barcode"] for r in results] == ["111", "222", "333"]
+    assert all(r["is_cached"] is False for r in results)
+
+
+def test_batch_fetches_shared_key_once(monkeypatch):
+    """Test items with the same cache key are fetched once and get separate copies."""
+    api = _offline_api(monkeypatch)
+    calls = []
+    
+    def fake_fooddata(query):
+        calls.append(query)
+        return {"source": "fooddata", "query": query, "warnings": []}
+    
+    monkeypatch.setattr(api, "fetch_from_fooddata", fake_fooddata)
+    
+    results = api.get_nutrition_batch(
+        [{"query": "Apple"}, {"query": "apple "}, {"query": "pear"}],
+        preferred_sources=["fooddata"],
+    )
+    
+    assert sorted(calls) == ["Apple", "pear"]
+    assert results[0] == results[1]
+    assert results[0] is not results[1]
+    results[0]["warnings"].append("changed")
+    assert results[1]["warnings"] == []
+
+
+def test_batch_item_without_key_gets_empty_result(monkeypatch):
+    """Test an item with neither barcode nor query gets the empty payload."""
+    api = _offline_api(monkeypatch)
+    monkeypatch.setattr(api, "fetch_from_fooddata", lambda query: {"source": "fooddata"})
+    
+    results = api.get_nutrition_batch([{}, {"query": "apple"}], preferred_sources=["fooddata"])
+    
+    assert results[0]["source"] is None
+    assert results[0]["raw"] is None
+    assert results[1]["source"] == "fooddata"
+
+
+def test_batch_deadline_ignores_time_queued(monkeypatch):
+    """Test items queued behind a busy executor still get their full fetch timeout."""
+    import time
+    from concurrent.futures import ThreadPoolExecutor
+    import services.nutrition_api as nutrition_api
+    
+    api = _offline_api(monkeypatch)
+    executor = ThreadPoolExecutor(max_workers=2)
+    monkeypatch.setattr(nutrition_api, "_FETCH_EXECUTOR", executor)
+    monkeypatch.setattr(nutrition_api, "_FETCH_TIMEOUT_SECONDS", 0.2)
+    
+    def fake_fooddata(query):
+        time.sleep(0.1)
+        return {"source": "fooddata", "query": query}
+    
+    monkeypatch.setattr(api, "fetch_from_fooddata", fake_fooddata)
+    monkeypatch.setattr(api, "fetch_from_edamam", fake_fooddata)
+    
+    items = [{"query": f"food{i}"} for i in range(8)]
+    results = api.get_nutrition_batch(items, preferred_sources=["fooddata", "edamam"])
+    executor.shutdown()
+    
+    assert [r["query"] for r in results] == [item["query"] for item in items]
+
+
+def test_db_cache_batch_round_trip(tmp_path):
+    """Test batch cache writes are read back, expired rows are skipped and large key sets are chunked."""
+    import sqlite3
+    from datetime import datetime, timedelta
+    from app_config.settings import CACHE_TTL_SECONDS
+    from database.db_manager import DBManager, _SQL_IN_CHUNK
+    
+    db = DBManager.__new__(DBManager)
+    db.db_path = str(tmp_path / "cache.db")
+    db._init_sqlite()
+    
+    entries = [(f"query::item{i}", {"source": "fooddata", "n": i}) for i in range(_SQL_IN_CHUNK + 5)]
+    db.save_nutrition_cache_batch(entries)
+    
+    stale = (datetime.utcnow() - timedelta(seconds=CACHE_TTL_SECONDS + 60)).isoformat()
+    conn = sqlite3.connect(db.db_path)
+    conn.execute("UPDATE nutrition_cache SET created_at = ? WHERE cache_key = ?", (stale, "query::item0"))
+    conn.commit()
+    conn.close()
+    
+    keys = [key for key, _ in entries] + ["query::missing"]
+    found = db.get_cached_nutrition_batch(keys)
+    
+    assert len(found) == len(entries) - 1
+    assert "query::item0" not in found
+    assert found[f"query::item{_SQL_IN_CHUNK + 4}"] == {"source": "fooddata", "n": _SQL_IN_CHUNK + 4}
+    assert db.get_cached_nutrition_batch([]) == {}
+
+
+def test_hedged_fetch_prefers_source_within_head_start(monkeypatch):
+    """Test the preferred source wins when it answers inside the head-start window."""
+    import time
+    import services.nutrition_api as nutrition_api
+    
+    api = _offline_api(monkeypatch)
+    monkeypatch.setattr(nutrition_api, "NUTRITION_HEDGE_DELAY_SECONDS", 0.5)
+    
+    def slowish_openfoodfacts(barcode):
+        time.sleep(0.05)
+        return {"source": "openfoodfacts"}
+    
+    monkeypatch.setattr(api, "fetch_from_openfoodfacts", slowish_openfoodfacts)
+    monkeypatch.setattr(api, "fetch_from_fooddata", lambda query: {"source": "fooddata"})
+    
+    result = api.get_nutrition(
+        barcode="123", query="apple", preferred_sources=["openfoodfacts", "fooddata"]
+    )
+    
+    assert result["source"] == "openfoodfacts"
+
+
+def test_hedged_fetch_takes_lower_rank_after_head_start(monkeypatch):
+    """Test a lower-ranked result is returned once the head-start window has passed."""
+    import time
+    import services.nutrition_api as nutrition_api
+    
+    api = _offline_api(monkeypatch)
+    monkeypatch.setattr(nutrition_api, "NUTRITION_HEDGE_DELAY_SECONDS", 0.05)
+    
+    def slow_openfoodfacts(barcode):
+        time.sleep(1.0)
+        return {"source": "openfoodfacts"}
+    
+    monkeypatch.setattr(api, "fetch_from_openfoodfacts", slow_openfoodfacts)
+    monkeypatch.setattr(api, "fetch_from_fooddata", lambda query: {"source": "fooddata"})
+    
+    start = time.monotonic()
+    result = api.get_nutrition(
+        barcode="123", query="apple", preferred_sources=["openfoodfacts", "fooddata"]
+    )
+    
+    assert result["source"] == "fooddata"
+    assert time.monotonic() - start < 0.5
+
+
+def test_hedged_fetch_skips_lower_rank_after_fast_hit(monkeypatch):
+    """Test a fast preferred hit means lower-ranked sources are never called."""
+    import services.nutrition_api as nutrition_api
+    
+    api = _offline_api(monkeypatch)
+    calls = []
+    
+    def fake_fetch(source):
+        def fetch(arg):
+            calls.append(source)
+            return {"source": source}
+        return fetch
+    
+    for source in ("openfoodfacts", "fooddata", "edamam"):
+        monkeypatch.setattr(api, f"fetch_from_{source}", fake_fetch(source))
+    
+    for delay in (0.0, 0.5):
+        calls.clear()
+        monkeypatch.setattr(nutrition_api, "NUTRITION_HEDGE_DELAY_SECONDS", delay)
+        result = api.get_nutrition(
+            barcode="123", query="apple", preferred_sources=["openfoodfacts", "fooddata", "edamam"]
+        )
+        assert result["source"] == "openfoodfacts"
+        assert calls == ["openfoodfacts"]
+
+
+def test_fetch_falls_through_to_next_source_when_empty(monkeypatch):
+    """Test the next source is tried when the preferred one finds nothing."""
+    api = _offline_api(monkeypatch)
+    monkeypatch.setattr(api, "fetch_from_openfoodfacts", lambda barcode: None)
+    monkeypatch.setattr(api, "fetch_from_fooddata", lambda query: {"source": "fooddata"})
+    
+    result = api.get_nutrition(
+        barcode="123", query="apple", preferred_sources=["openfoodfacts", "fooddata"]
+    )
+    
+    assert result["source"] == "fooddata"
+
 if __name__ == "__main__":
     # Run tests manually
     print("Running nutrition API cache tests...")
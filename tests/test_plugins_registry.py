@@ -0,0 +1,90 @@
+"""Test plugin discovery and its on-disk cache."""
+
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+_PLUGIN_SOURCE = '''
+from plugins._base import Plugin
+
+
+class {cls}(Plugin):
+    def __init__(self):
+        {init}
+
+    @property
+    def name(self):
+        return "{name}"
+
+    @property
+    def supported_platforms(self):
+        return {{"instagram"}}
+
+    def classify(self, text, lang):
+        return "other"
+
+    def extract(self, text, lang):
+        return {{}}
+
+    def suggest_reply(self, intent, lang, context):
+        return ""
+'''
+
+
+def _write_plugin(plugin_dir, package, init="pass"):
+    """Write a minimal plugin package under plugin_dir."""
+    (plugin_dir / package).mkdir(parents=True)
+    (plugin_dir / package / "__init__.py").write_text("")
+    (plugin_dir / package / "plugin.py").write_text(
+        _PLUGIN_SOURCE.format(cls=package.title() + "Plugin", name=package, init=init)
+    )
+
+
+def _isolated_registry(monkeypatch, tmp_path, package_dir):
+    """Plugin registry with an empty state and a discovery cache under tmp_path."""
+    import services.plugins_registry as registry
+    
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.setattr(registry, "DISCOVERY_CACHE_DIR", tmp_path / "cache")
+    registry.clear_plugins()
+    plugin_dir = tmp_path / package_dir
+    plugin_dir.mkdir()
+    (plugin_dir / "__init__.py").write_text("")
+    return registry, plugin_dir
+
+
+def test_failed_plugin_is_not_cached(monkeypatch, tmp_path):
+    """Test a plugin whose constructor raises doesn't block the others or get cached."""
+    registry, plugin_dir = _isolated_registry(monkeypatch, tmp_path, "failplugins")
+    _write_plugin(plugin_dir, "broken", init="raise RuntimeError('boom')")
+    _write_plugin(plugin_dir, "working")
+    
+    try:
+        assert registry.discover_and_register(plugin_dir) == ["working"]
+        assert registry.get_plugin("working") is not None
+        assert not list((tmp_path / "cache").glob("plugins-*.json"))
+    finally:
+        registry.clear_plugins()
+
+
+def test_discovery_cache_replaces_stale_files(monkeypatch, tmp_path):
+    """Test writing a discovery cache removes the ones for older plugin sources."""
+    registry, plugin_dir = _isolated_registry(monkeypatch, tmp_path, "cacheplugins")
+    cache_dir = tmp_path / "cache"
+    cache_dir.mkdir()
+    (cache_dir / "plugins-stale.json").write_text("[]")
+    _write_plugin(plugin_dir, "first")
+    
+    try:
+        assert registry.discover_and_register(plugin_dir) == ["first"]
+        cache_files = list(cache_dir.glob("plugins-*.json"))
+        assert len(cache_files) == 1
+        assert cache_files[0].name != "plugins-stale.json"
+        
+        registry.clear_plugins()
+        assert registry.discover_and_register(plugin_dir) == ["first"]
+        assert registry.get_plugin("first") is not None
+    finally:
+        registry.clear_plugins()
@@ -39,7 +39,7 @@ from services.barcode_scanner import get_barcode_scanner
 from services.engine import analyze_image_sync
 from services.health_sync import get_health_sync_service
 from services.live_vision import get_live_vision_service
-from services.nutrition_api import NutritionAPI, get_pre_confidence
+from services.nutrition_api import NutritionAPI, get_nutrition_api, get_pre_confidence
 from services.recommendations import get_recommendations_service
 from ui_components.branding import render_brand_watermark
 from ui_components.camera_helpers import (
@@ -617,10 +617,8 @@ def _inject_camera_css() -> None:
 
 
 def _get_nutrition_client() -> NutritionAPI:
-    """Singleton nutrition client stored in session state."""
-    if "nutrition_client" not in st.session_state:
-        st.session_state.nutrition_client = NutritionAPI()
-    return st.session_state.nutrition_client
+    """Process-wide nutrition client, so every session shares one connection pool."""
+    return get_nutrition_api()
 
 
 def _get_preferred_sources(region: Optional[str] = None) -> List[str]:
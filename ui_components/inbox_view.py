@@ -15,7 +15,7 @@ import logging
 from datetime import datetime, timedelta
 from typing import Optional
 
-from services.inbox_store import get_inbox_store
+from services.inbox_store import get_inbox_store, split_json_array
 from services.crm_store import CRMStore
 from services.inbox_engine import get_lang
 from services.plugins_registry import route_to_plugin
@@ -137,18 +137,15 @@ def render_json_import():
         if uploaded_file:
             try:
                 content = uploaded_file.read().decode('utf-8')
-                messages = json.loads(content)
-                
-                if not isinstance(messages, list):
-                    st.error("JSON must be an array of messages")
-                    return
+                # Keep each message's original JSON so the import stores it as-is
+                messages, raw_payloads = split_json_array(content)
                 
                 st.info(f"📦 Found {len(messages)} messages")
                 
                 if st.button("Import Messages", type="primary", use_container_width=True):
                     with st.spinner("Importing..."):
                         store = get_inbox_store()
-                        result = store.import_from_json(messages)
+                        result = store.import_from_json(messages, raw_payloads=raw_payloads)
                         
                         if result['imported'] > 0:
                             st.success(f"✅ Imported {result['imported']} messages into {result['threads_created']} threads!")
@@ -166,6 +163,8 @@ def render_json_import():
                 
             except json.JSONDecodeError as e:
                 st.error(f"Invalid JSON: {e}")
+            except ValueError as e:
+                st.error(str(e))
             except Exception as e:
                 st.error(f"Error: {e}")
 
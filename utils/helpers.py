@@ -247,3 +247,38 @@ def format_time_delta(seconds: int) -> str:
         return f"{seconds // 60}min"
     else:
         return f"{seconds // 3600}h"
+
+
+# Food category -> name keywords, checked in order
+FOOD_CATEGORIES = {
+    'chips': ['chips', 'crisps', 'snack'],
+    'chocolate': ['chocolate', 'cocoa'],
+    'biscuit': ['biscuit', 'cookie', 'cracker'],
+    'cereal': ['cereal', 'granola', 'muesli'],
+    'yogurt': ['yogurt', 'yoghurt'],
+    'juice': ['juice', 'drink', 'beverage'],
+    'bread': ['bread', 'toast'],
+    'cheese': ['cheese'],
+    'milk': ['milk', 'dairy'],
+}
+
+
+def extract_food_category(product_name: str) -> str:
+    """
+    Extract a product category from its name.
+    
+    Args:
+        product_name: Product name
+        
+    Returns:
+        Matching FOOD_CATEGORIES key, else the first word of the name ('food' if empty)
+    """
+    product_lower = product_name.lower()
+    
+    for category, keywords in FOOD_CATEGORIES.items():
+        for keyword in keywords:
+            if keyword in product_lower:
+                return category
+    
+    # Default: use first word of product name
+    return product_name.split()[0] if product_name.split() else 'food'